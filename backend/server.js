@@ -229,10 +229,14 @@ app.get('/api/metrics/latest', async (req, res) => {
 app.get('/api/metrics/history', async (req, res) => {
   try {
     const hours = parseInt(req.query.hours) || 168; // 7 dias por padrão
+    // Busca incremental: apenas registros mais novos que `since` (ISO 8601)
+    const since = req.query.since && !isNaN(Date.parse(req.query.since))
+      ? new Date(req.query.since).toISOString()
+      : null;
     const projectKey = req.query.project || SONARCLOUD_CONFIG.defaultProject;
     const sonarProjectKey = SONARCLOUD_CONFIG.projects[projectKey];
 
-    const history = await sonarcloudModel.getMetricsHistory(sonarProjectKey, hours);
+    const history = await sonarcloudModel.getMetricsHistory(sonarProjectKey, hours, since);
     res.json(history);
   } catch (error) {
     res.status(500).json({
@@ -355,9 +359,31 @@ app.get('/api/sonarcloud/new-code-issues', async (req, res) => {
     const projectKey = req.query.project || SONARCLOUD_CONFIG.defaultProject;
     const sonarProjectKey = SONARCLOUD_CONFIG.projects[projectKey];
 
+    const issueTypes = ['BUG', 'VULNERABILITY', 'CODE_SMELL'];
+    const severities = ['BLOCKER', 'CRITICAL', 'MAJOR', 'MINOR'];
+    const options = {
+      page: Math.max(parseInt(req.query.page) || 1, 1),
+      // SonarCloud aceita no máximo 500 itens por página
+      pageSize: Math.min(Math.max(parseInt(req.query.pageSize) || 100, 1), 500)
+    };
+    if (issueTypes.includes(req.query.type)) {
+      options.types = req.query.type;
+    }
+    if (req.query.severity) {
+      const selected = req.query.severity.split(',').filter(s => severities.includes(s));
+      if (selected.length > 0) {
+        options.severities = selected.join(',');
+      }
+    }
+    if (req.query.files) {
+      // Caminhos dos arquivos (separados por vírgula) cujas issues serão listadas
+      options.files = req.query.files.split(',').filter(f => f).slice(0, 100);
+    }
+
     const issues = await sonarcloudDetails.getNewCodeIssues(
       sonarProjectKey,
-      SONARCLOUD_CONFIG.token
+      SONARCLOUD_CONFIG.token,
+      options
     );
 
     res.json(issues);
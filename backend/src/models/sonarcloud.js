@@ -104,17 +104,26 @@ const getLatestMetrics = async (projectKey) => {
 
 /**
  * Busca histórico de métricas
+ * Se `since` for informado, retorna apenas registros mais novos que ele
  */
-const getMetricsHistory = async (projectKey, hours = 168) => {
+const getMetricsHistory = async (projectKey, hours = 168, since = null) => {
+  const values = [projectKey, hours];
+  let sinceFilter = '';
+  if (since) {
+    values.push(since);
+    sinceFilter = 'AND timestamp > $3';
+  }
+
   const query = `
     SELECT * FROM sonarcloud_metrics
     WHERE project_key = $1
       AND timestamp >= NOW() - INTERVAL '1 hour' * $2
+      ${sinceFilter}
     ORDER BY timestamp DESC
   `;
 
   try {
-    const result = await queryWithRetry(query, [projectKey, hours]);
+    const result = await queryWithRetry(query, values);
     return result.rows.map(formatMetricsResponse);
   } catch (err) {
     console.error('❌ Erro ao buscar histórico de métricas:', err);
@@ -5,14 +5,57 @@ const axios = require('axios');
 
 const SONARCLOUD_BASE_URL = 'https://sonarcloud.io/api';
 
+// Limite de itens por página e de resultados paginados da API do SonarCloud
+const MAX_PAGE_SIZE = 500;
+const MAX_RESULTS = 10000;
+
+/**
+ * Busca todas as páginas de measures/component_tree (até maxComponents)
+ */
+async function fetchComponentTree(projectKey, token, params, maxComponents = MAX_RESULTS) {
+  const components = [];
+  let page = 1;
+
+  while (components.length < maxComponents) {
+    const response = await axios.get(`${SONARCLOUD_BASE_URL}/measures/component_tree`, {
+      headers: {
+        'Authorization': `Bearer ${token}`
+      },
+      params: {
+        component: projectKey,
+        ...params,
+        ps: MAX_PAGE_SIZE,
+        p: page
+      }
+    });
+
+    const batch = response.data.components || [];
+    components.push(...batch);
+
+    const total = response.data.paging ? response.data.paging.total : components.length;
+    if (batch.length < MAX_PAGE_SIZE || components.length >= total) {
+      break;
+    }
+    page += 1;
+  }
+
+  return components.slice(0, maxComponents);
+}
+
 /**
  * Busca issues (bugs, vulnerabilities, code smells) em código novo
+ *
+ * Paginado: retorna apenas a página pedida, junto com `paging` (total de issues
+ * que atendem aos filtros) e `facets` (contagem por tipo e severidade).
+ * Com `files` (caminhos), busca apenas as issues desses arquivos.
  */
 async function getNewCodeIssues(projectKey, token, options = {}) {
   const {
     types = 'BUG,VULNERABILITY,CODE_SMELL',
     severities = 'BLOCKER,CRITICAL,MAJOR,MINOR',
-    pageSize = 100
+    pageSize = 100,
+    page = 1,
+    files = []
   } = options;
 
   try {
@@ -21,16 +64,28 @@ async function getNewCodeIssues(projectKey, token, options = {}) {
         'Authorization': `Bearer ${token}`
       },
       params: {
-        componentKeys: projectKey,
+        componentKeys: files.length > 0 ? files.map(file => `${projectKey}:${file}`).join(',') : projectKey,
         resolved: false,
         inNewCodePeriod: true,
         types,
         severities,
-        ps: pageSize
+        ps: pageSize,
+        p: page,
+        facets: 'types,severities'
       }
     });
 
     const issues = response.data.issues || [];
+    const paging = response.data.paging || { pageIndex: page, pageSize, total: issues.length };
+
+    // Contagens por tipo/severidade (sem precisar baixar todas as páginas)
+    const facets = {};
+    (response.data.facets || []).forEach(facet => {
+      facets[facet.property] = {};
+      facet.values.forEach(({ val, count }) => {
+        facets[facet.property][val] = count;
+      });
+    });
 
     // Agrupar por tipo e severidade
     const grouped = {
@@ -76,6 +131,12 @@ async function getNewCodeIssues(projectKey, token, options = {}) {
       totalBugs: grouped.bugs.length,
       totalVulnerabilities: grouped.vulnerabilities.length,
       totalCodeSmells: grouped.codeSmells.length,
+      paging: {
+        pageIndex: paging.pageIndex,
+        pageSize: paging.pageSize,
+        total: paging.total
+      },
+      facets,
       issues: grouped
     };
 
@@ -90,25 +151,18 @@ async function getNewCodeIssues(projectKey, token, options = {}) {
  */
 async function getComplexityByComponent(projectKey, token, options = {}) {
   const {
-    metrics = 'complexity,cognitive_complexity,ncloc',
-    pageSize = 100,
-    strategy = 'leaves' // 'leaves' = arquivos, 'children' = diretórios
+    metrics = 'complexity,cognitive_complexity,ncloc,violations',
+    strategy = 'leaves', // 'leaves' = arquivos, 'children' = diretórios
+    maxComponents = MAX_RESULTS
   } = options;
 
   try {
-    const response = await axios.get(`${SONARCLOUD_BASE_URL}/measures/component_tree`, {
-      headers: {
-        'Authorization': `Bearer ${token}`
-      },
-      params: {
-        component: projectKey,
-        metricKeys: metrics,
-        strategy,
-        ps: pageSize
-      }
-    });
-
-    const components = response.data.components || [];
+    const components = await fetchComponentTree(
+      projectKey,
+      token,
+      { metricKeys: metrics, strategy },
+      maxComponents
+    );
 
     // Processar e ordenar por complexidade
     const complexityData = components.map(component => {
@@ -124,6 +178,7 @@ async function getComplexityByComponent(projectKey, token, options = {}) {
         complexity: measures.complexity || 0,
         cognitiveComplexity: measures.cognitive_complexity || 0,
         linesOfCode: measures.ncloc || 0,
+        issues: measures.violations || 0,
         // Complexidade por linha de código (indicador de qualidade)
         complexityDensity: measures.ncloc > 0
           ? Math.round((measures.complexity / measures.ncloc) * 100) / 100
@@ -207,23 +262,16 @@ async function getSecurityHotspots(projectKey, token, options = {}) {
  */
 async function getCoverageByComponent(projectKey, token, options = {}) {
   const {
-    pageSize = 100
+    maxComponents = MAX_RESULTS
   } = options;
 
   try {
-    const response = await axios.get(`${SONARCLOUD_BASE_URL}/measures/component_tree`, {
-      headers: {
-        'Authorization': `Bearer ${token}`
-      },
-      params: {
-        component: projectKey,
-        metricKeys: 'coverage,line_coverage,uncovered_lines,lines_to_cover',
-        strategy: 'leaves',
-        ps: pageSize
-      }
-    });
-
-    const components = response.data.components || [];
+    const components = await fetchComponentTree(
+      projectKey,
+      token,
+      { metricKeys: 'coverage,line_coverage,uncovered_lines,lines_to_cover', strategy: 'leaves' },
+      maxComponents
+    );
 
     const coverageData = components.map(component => {
       const measures = {};
@@ -0,0 +1,276 @@
+# frontend/analytics.py
+# Análise de tendências do histórico de métricas: médias móveis, inclinações,
+# pontos de mudança (CUSUM) e anomalias (z-score), atualizadas de forma incremental
+#
+# Cada HistoryStore mantém um TrendAnalytics alinhado às suas linhas. Para cada
+# campo são guardadas somas prefixadas (contagem, x, x², t, t², t·x), então as
+# estatísticas de qualquer janela saem em O(log n) (busca binária nos
+# timestamps) e cada refresh custa O(k) nos k snapshots novos.
+import numpy as np
+
+# Campos analisados (colunas numéricas do HistoryStore)
+ANALYTICS_FIELDS = [
+    'bugs', 'vulnerabilities', 'codeSmells', 'debtRatio', 'coverage',
+    'duplication', 'complexity', 'technicalDebtMinutes',
+]
+FIELD_LABELS = {
+    'bugs': 'Bugs',
+    'vulnerabilities': 'Vulnerabilidades',
+    'codeSmells': 'Code Smells',
+    'debtRatio': 'Taxa de Dívida',
+    'coverage': 'Cobertura',
+    'duplication': 'Duplicação',
+    'complexity': 'Complexidade',
+    'technicalDebtMinutes': 'Dívida Técnica',
+}
+# Campos em que aumentar é bom (nos demais, aumento é regressão)
+HIGHER_IS_BETTER = {'coverage'}
+
+# Pontos anteriores usados como referência do z-score e do CUSUM
+BASELINE_POINTS = 48
+MIN_BASELINE_POINTS = 8
+# Linhas anteriores consultadas para montar a referência (limita o custo com lacunas de NaN)
+BASELINE_TAIL_ROWS = 4 * BASELINE_POINTS
+# |z| a partir do qual um ponto é anomalia
+Z_THRESHOLD = 3.0
+# CUSUM em unidades de desvio padrão: folga k e limiar h
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 5.0
+# Desvio padrão mínimo, relativo à média (séries em degrau têm desvio zero)
+STD_FLOOR_RATIO = 0.02
+
+NS_PER_DAY = 86400 * 10**9
+_SUMS = ('n', 'x', 'xx', 't', 'tt', 'tx')
+
+
+class _Prefix:
+    """Soma prefixada exclusiva (P[0] = 0) com descarte do início em O(1) amortizado."""
+
+    def __init__(self):
+        self.data = np.zeros(64, dtype=np.float64)
+        self.start = 0
+        self.size = 1
+
+    def extend(self, values):
+        if not len(values):
+            return
+        needed = self.size + len(values)
+        if needed > len(self.data):
+            live = self.size - self.start
+            grown = np.empty(max(2 * live + len(values), 64), dtype=np.float64)
+            grown[:live] = self.data[self.start:self.size]
+            self.data, self.start, self.size = grown, 0, live
+            needed = self.size + len(values)
+        self.data[self.size:needed] = self.data[self.size - 1] + np.cumsum(values)
+        self.size = needed
+
+    def drop_head(self, count):
+        self.start += count
+
+    def view(self):
+        return self.data[self.start:self.size]
+
+
+def _cusum(increments, state, threshold):
+    """Recursão de Lindley S_t = max(0, S_{t-1} + inc_t), zerada a cada alarme.
+
+    Retorna (índices dos alarmes, estado final). Cada trecho sem alarme é
+    calculado de forma vetorizada: S_t = C_t - min(0, min_{j<=t} C_j).
+    """
+    alarms = []
+    start = 0
+    while start < len(increments):
+        cumulative = state + np.cumsum(increments[start:])
+        level = cumulative - np.minimum(np.minimum.accumulate(cumulative), 0.0)
+        over = np.flatnonzero(level > threshold)
+        if not len(over):
+            return alarms, float(level[-1])
+        alarms.append(start + int(over[0]))
+        start += int(over[0]) + 1
+        state = 0.0
+    return alarms, state
+
+
+class TrendAnalytics:
+    """Estatísticas incrementais das colunas de um HistoryStore.
+
+    `extend` recebe as linhas recém-anexadas e `drop_head` acompanha o descarte
+    do início do buffer; as consultas recebem as colunas atuais do store.
+    """
+
+    def __init__(self, fields=ANALYTICS_FIELDS):
+        self.fields = list(fields)
+        self.reset()
+
+    def reset(self):
+        self.origin = None
+        self.reference = {}
+        self.sums = {field: {name: _Prefix() for name in _SUMS} for field in self.fields}
+        self.cusum = {field: (0.0, 0.0) for field in self.fields}
+        self.anomalies = []       # (timestamp ns, campo, valor, z)
+        self.change_points = []   # (timestamp ns, campo, direção +1/-1, valor)
+        self.rows = 0             # linhas incorporadas desde o reset (numeração dos episódios)
+        self._last_event = {}
+
+    # ------------------------------------------
+    # Atualização
+    # ------------------------------------------
+
+    def extend(self, timestamps, columns):
+        """Incorpora as linhas novas (`timestamps` e `columns[campo]` do mesmo tamanho)."""
+        if not len(timestamps):
+            return
+        if self.origin is None:
+            self.origin = int(timestamps[0])
+        t = (np.asarray(timestamps, dtype=np.int64) - self.origin) / NS_PER_DAY
+
+        for field in self.fields:
+            values = np.asarray(columns[field], dtype=np.float64)
+            valid = ~np.isnan(values)
+            if field not in self.reference and valid.any():
+                # Valores centrados no primeiro ponto evitam cancelamento em x² para séries grandes
+                self.reference[field] = float(values[valid][0])
+            x = np.where(valid, values - self.reference.get(field, 0.0), 0.0)
+            tv = np.where(valid, t, 0.0)
+
+            sums = self.sums[field]
+            mean, std = self._baseline(field, valid, x)
+            for name, increment in zip(_SUMS, (valid.astype(np.float64), x, x * x, tv, tv * tv, tv * x)):
+                sums[name].extend(increment)
+
+            z = np.where(valid & ~np.isnan(mean), (x - mean) / std, np.nan)
+            self._detect(field, timestamps, values, z)
+        self.rows += len(timestamps)
+
+    def _baseline(self, field, valid, x):
+        """Média e desvio dos BASELINE_POINTS válidos anteriores a cada linha nova.
+
+        Só o final dos prefixos já armazenados é usado, então o custo depende
+        apenas das linhas novas e não do tamanho do histórico.
+        """
+        sums = self.sums[field]
+        tail = min(len(sums['n'].view()), BASELINE_TAIL_ROWS + 1)
+        n_prev, x_prev, xx_prev = (sums[name].view()[-tail:] for name in ('n', 'x', 'xx'))
+
+        # Prefixos das linhas novas continuando os já armazenados
+        n_all = np.concatenate([n_prev, n_prev[-1] + np.cumsum(valid)])
+        x_all = np.concatenate([x_prev, x_prev[-1] + np.cumsum(x)])
+        xx_all = np.concatenate([xx_prev, xx_prev[-1] + np.cumsum(x * x)])
+
+        end = tail - 1 + np.arange(len(x))          # prefixo exclusivo de cada linha nova
+        begin = np.searchsorted(n_all, n_all[end] - BASELINE_POINTS, side='left')
+        count = n_all[end] - n_all[begin]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = (x_all[end] - x_all[begin]) / count
+            variance = np.maximum((xx_all[end] - xx_all[begin]) / count - mean * mean, 0.0)
+        mean = np.where(count >= MIN_BASELINE_POINTS, mean, np.nan)
+        floor = STD_FLOOR_RATIO * np.abs(mean + self.reference.get(field, 0.0)) + 1e-9
+        return mean, np.maximum(np.sqrt(variance), floor)
+
+    def _detect(self, field, timestamps, values, z):
+        """Registra anomalias e pontos de mudança das linhas novas.
+
+        Um desvio persistente (ex.: degrau em bugs) continua fora da referência
+        por alguns pontos; eventos do mesmo tipo e direção a menos de
+        BASELINE_POINTS linhas do anterior são considerados o mesmo episódio.
+        """
+        first_row = self.rows
+        signs = np.sign(np.nan_to_num(z))
+        for i in np.flatnonzero(np.abs(np.nan_to_num(z)) >= Z_THRESHOLD):
+            if self._new_episode(('anomaly', field, signs[i]), first_row + i):
+                self.anomalies.append((int(timestamps[i]), field, float(values[i]), float(z[i])))
+
+        increments = np.nan_to_num(z)
+        known = ~np.isnan(z)
+        up_state, down_state = self.cusum[field]
+        up, up_state = _cusum(np.where(known, increments - CUSUM_SLACK, 0.0), up_state, CUSUM_THRESHOLD)
+        down, down_state = _cusum(np.where(known, -increments - CUSUM_SLACK, 0.0), down_state, CUSUM_THRESHOLD)
+        self.cusum[field] = (up_state, down_state)
+        for i, direction in sorted([(i, 1) for i in up] + [(i, -1) for i in down]):
+            if self._new_episode(('change', field, direction), first_row + i):
+                self.change_points.append((int(timestamps[i]), field, direction, float(values[i])))
+
+    def _new_episode(self, key, row):
+        previous = self._last_event.get(key)
+        self._last_event[key] = row
+        return previous is None or row - previous > BASELINE_POINTS
+
+    def drop_head(self, count, first_timestamp):
+        """Acompanha o descarte das `count` primeiras linhas do store."""
+        for sums in self.sums.values():
+            for prefix in sums.values():
+                prefix.drop_head(count)
+        self.anomalies = [a for a in self.anomalies if a[0] >= first_timestamp]
+        self.change_points = [c for c in self.change_points if c[0] >= first_timestamp]
+
+    # ------------------------------------------
+    # Consultas
+    # ------------------------------------------
+
+    def window(self, field, timestamps, start_ns, end_ns=None):
+        """Contagem, média, desvio e inclinação (por dia) de `field` entre dois instantes."""
+        lo = int(np.searchsorted(timestamps, start_ns, side='left'))
+        hi = len(timestamps) if end_ns is None else int(np.searchsorted(timestamps, end_ns, side='right'))
+        sums = {name: prefix.view() for name, prefix in self.sums[field].items()}
+        n, sx, sxx, st, stt, stx = (sums[name][hi] - sums[name][lo] for name in _SUMS)
+        if n <= 0:
+            return {'count': 0, 'mean': None, 'std': None, 'slope': None}
+
+        mean = sx / n
+        std = float(np.sqrt(max(sxx / n - mean * mean, 0.0)))
+        denominator = n * stt - st * st
+        slope = (n * stx - st * sx) / denominator if n > 1 and denominator > 1e-12 else 0.0
+        return {'count': int(n), 'mean': float(mean) + self.reference.get(field, 0.0), 'std': std, 'slope': float(slope)}
+
+    def rolling_mean(self, field, timestamps, hours):
+        """Média móvel de `field` nas `hours` anteriores a cada ponto (vetorizada)."""
+        ends = np.arange(1, len(timestamps) + 1)
+        starts = np.searchsorted(timestamps, timestamps - int(hours * 3600 * 10**9), side='left')
+        n = self.sums[field]['n'].view()
+        x = self.sums[field]['x'].view()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (x[ends] - x[starts]) / (n[ends] - n[starts]) + self.reference.get(field, 0.0)
+
+    def change(self, field, timestamps, values, start_ns):
+        """Último valor válido e a variação em relação ao primeiro valor válido desde `start_ns`."""
+        lo = int(np.searchsorted(timestamps, start_ns, side='left'))
+        window = values[lo:]
+        valid = np.flatnonzero(~np.isnan(window))
+        if not len(valid):
+            return None, None, None
+        first, last = float(window[valid[0]]), float(window[valid[-1]])
+        pct = (last - first) / abs(first) * 100 if first else (0.0 if last == first else None)
+        return last, last - first, pct
+
+    def summary(self, timestamps, columns, hours, now_ns):
+        """Resumo por campo das últimas `hours`: valor, variação, inclinação, anomalias e mudanças."""
+        start_ns = now_ns - int(hours * 3600 * 10**9)
+        rows = []
+        for field in self.fields:
+            last, delta, pct = self.change(field, timestamps, columns[field], start_ns)
+            stats = self.window(field, timestamps, start_ns)
+            points = [c for c in self.change_points if c[1] == field and c[0] >= start_ns]
+            worse = -1 if field in HIGHER_IS_BETTER else 1
+            rows.append({
+                'field': field,
+                'label': FIELD_LABELS.get(field, field),
+                'last': last,
+                'delta': delta,
+                'pct': pct,
+                'slopePerDay': stats['slope'],
+                'anomalies': sum(1 for a in self.anomalies if a[1] == field and a[0] >= start_ns),
+                'changePoints': len(points),
+                'regressions': sum(1 for c in points if c[2] == worse),
+                'regressed': bool(delta is not None and delta * worse > 0),
+            })
+        return rows
+
+    def events(self, field, start_ns):
+        """Anomalias e pontos de mudança de `field` desde `start_ns`, em ordem cronológica."""
+        worse = -1 if field in HIGHER_IS_BETTER else 1
+        events = [(ts, 'anomalia', value) for ts, name, value, _ in self.anomalies if name == field and ts >= start_ns]
+        events += [
+            (ts, 'regressão' if direction == worse else 'melhora', value)
+            for ts, name, direction, value in self.change_points if name == field and ts >= start_ns
+        ]
+        return sorted(events)
@@ -0,0 +1,469 @@
+# frontend/api_client.py
+# Cliente HTTP compartilhado por todos os fetchers de utils.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import ingest
+import instrumentation
+
+API_URL = os.getenv("BACKEND_API_URL", "https://recebe-dados-sonarcloud.onrender.com/api")
+
+# Configurações do pool de conexões, timeouts e retries (sobrescrevíveis por variáveis de ambiente)
+POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "10"))
+CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("BACKEND_READ_TIMEOUT", "20"))
+MAX_RETRIES = int(os.getenv("BACKEND_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.getenv("BACKEND_BACKOFF_FACTOR", "0.5"))
+ETAG_CACHE_SIZE = int(os.getenv("BACKEND_ETAG_CACHE_SIZE", "256"))
+
+# Modo replay (desenvolvimento, profiling e testes de carga offline):
+#   BACKEND_REPLAY=fixtures -> responde em processo com JSONs gravados (BACKEND_REPLAY_DIR)
+#                              ou com as fixtures do stub_backend
+#   BACKEND_REPLAY=stub     -> sobe o stub_backend como servidor HTTP local e usa o cliente normal
+REPLAY_MODE = os.getenv("BACKEND_REPLAY", "").strip().lower()
+REPLAY_DIR = os.getenv("BACKEND_REPLAY_DIR", "")
+REPLAY_LATENCY_MS = float(os.getenv("BACKEND_REPLAY_LATENCY_MS", "0"))
+REPLAY_SCALE = float(os.getenv("BACKEND_REPLAY_SCALE", "1"))
+REPLAY_PROJECTS = int(os.getenv("BACKEND_REPLAY_PROJECTS", "1"))
+# Grava as respostas reais do backend neste diretório (para replay posterior)
+RECORD_DIR = os.getenv("BACKEND_RECORD_DIR", "")
+# Diretório de um snapshot exportado (snapshots.py): as páginas leem dele em vez do backend
+SNAPSHOT_PATH = os.getenv("SONARVIEW_SNAPSHOT", "")
+
+# Códigos transitórios comuns no Render (cold start / deploy em andamento)
+RETRY_STATUS = (429, 502, 503, 504)
+
+# Proteção do backend: taxa por endpoint (token bucket; 0 = sem limite), rajada,
+# requisições simultâneas no processo e espera máxima por uma vaga
+RATE_LIMIT = float(os.getenv("BACKEND_RATE_LIMIT", "10"))
+RATE_BURST = int(os.getenv("BACKEND_RATE_BURST", "20"))
+MAX_IN_FLIGHT = int(os.getenv("BACKEND_MAX_IN_FLIGHT", "8"))
+QUEUE_TIMEOUT = float(os.getenv("BACKEND_QUEUE_TIMEOUT", "30"))
+# Circuit breaker: falhas seguidas que abrem o circuito e tempo até a próxima tentativa
+CIRCUIT_FAILURES = int(os.getenv("BACKEND_CIRCUIT_FAILURES", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("BACKEND_CIRCUIT_RESET_SECONDS", "30"))
+
+_session = None
+_session_lock = threading.Lock()
+
+# Respostas anteriores indexadas por (url, params) para requisições condicionais
+_etag_cache = OrderedDict()
+_etag_lock = threading.Lock()
+
+_stub = None
+_stub_url = None
+_stub_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """O backend falhou seguidamente e as requisições estão suspensas até a próxima tentativa."""
+
+
+class ThrottledError(requests.exceptions.RequestException):
+    """Não houve vaga (taxa do endpoint ou limite de simultâneas) dentro de BACKEND_QUEUE_TIMEOUT."""
+
+
+class TokenBucket:
+    """Limite de `rate` requisições por segundo, com rajadas de até `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline):
+        """Consome um token, esperando até `deadline` (time.monotonic); False se não houver a tempo."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Suspende as requisições depois de `failures` falhas seguidas do backend.
+
+    Aberto, falha imediatamente por `reset_seconds`; depois deixa passar uma
+    única requisição de teste (meio aberto), que fecha o circuito se der certo
+    ou o reabre se falhar. Respostas 4xx contam como sucesso (o backend respondeu).
+    """
+
+    def __init__(self, failures, reset_seconds):
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.consecutive = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state_locked(time.time())
+
+    def _state_locked(self, now):
+        if self.opened_at is None:
+            return 'closed'
+        return 'open' if now < self.opened_at + self.reset_seconds or self._probing else 'half_open'
+
+    def allow(self):
+        """True se a requisição pode seguir (circuito fechado ou esta é a tentativa de teste)."""
+        with self._lock:
+            state = self._state_locked(time.time())
+            if state == 'half_open':
+                self._probing = True
+            return state != 'open'
+
+    def record(self, ok):
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.consecutive = 0
+                self.opened_at = None
+                return
+            self.consecutive += 1
+            if self.opened_at is not None or self.consecutive >= self.failures:
+                self.opened_at = time.time()
+
+    def cancel(self):
+        """Libera a tentativa de teste que não chegou a consultar o backend."""
+        with self._lock:
+            self._probing = False
+
+    def retry_at(self):
+        with self._lock:
+            return self.opened_at + self.reset_seconds if self.opened_at is not None else None
+
+
+class _InFlight:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_circuit = CircuitBreaker(CIRCUIT_FAILURES, CIRCUIT_RESET_SECONDS)
+_slots = threading.BoundedSemaphore(max(1, MAX_IN_FLIGHT))
+_buckets = {}
+_in_flight = {}
+_governor_lock = threading.Lock()
+_stats = {'inFlight': 0, 'deduplicated': 0, 'throttled': 0, 'rejected': 0}
+
+
+def _build_session():
+    """Cria a sessão HTTP com pool persistente e retry com backoff."""
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        status=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate'
+    })
+    return session
+
+
+def get_session():
+    """Retorna a sessão HTTP compartilhada, criando-a na primeira chamada."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _etag_key(url, params, stream=None):
+    # O formato do payload guardado depende dos alvos de streaming
+    targets = tuple(sorted((path, tuple(sorted((fields or {}).items()))) for path, fields in (stream or {}).items()))
+    return url, tuple(sorted((params or {}).items())), targets
+
+
+def _get_stub():
+    """Cria o stub do backend na primeira chamada (e o servidor HTTP no modo 'stub')."""
+    global _stub, _stub_url
+    if _stub is None:
+        with _stub_lock:
+            if _stub is None:
+                from stub_backend import StubBackend
+                stub = StubBackend(scale=REPLAY_SCALE, latency_ms=REPLAY_LATENCY_MS, projects=REPLAY_PROJECTS)
+                if REPLAY_MODE == 'stub':
+                    _stub_url = stub.serve()
+                _stub = stub
+    return _stub
+
+
+def get_snapshot():
+    """SnapshotBackend de SONARVIEW_SNAPSHOT, ou None fora do modo de importação."""
+    if not SNAPSHOT_PATH:
+        return None
+    from snapshots import load_snapshot
+    return load_snapshot(SNAPSHOT_PATH)
+
+
+def reference_now():
+    """Instante de referência das janelas de tempo: a data do snapshot ou o horário atual."""
+    snapshot = get_snapshot()
+    return snapshot.now() if snapshot else datetime.now(timezone.utc)
+
+
+def _handled(backend, path, params, label):
+    status, payload = backend.handle(path, params)
+    if status >= 400:
+        raise requests.HTTPError(f"{status} {label}: {path}")
+    return payload
+
+
+def fixture_name(path, params=None):
+    """Nome do arquivo de uma resposta gravada (ex.: metrics_history-1a2b3c4d.json)."""
+    name = path.strip('/').replace('/', '_').replace('-', '_') or 'root'
+    if params:
+        query = json.dumps(sorted((k, str(v)) for k, v in params.items() if v is not None))
+        name = f"{name}-{hashlib.blake2b(query.encode(), digest_size=4).hexdigest()}"
+    return f"{name}.json"
+
+
+def _replay_get(path, params):
+    """Responde em processo: JSON gravado se existir, senão as fixtures do stub."""
+    if REPLAY_DIR:
+        recorded = os.path.join(REPLAY_DIR, fixture_name(path, params))
+        if os.path.exists(recorded):
+            with open(recorded, encoding='utf-8') as f:
+                return json.load(f)
+
+    return _handled(_get_stub(), path, params, 'replay')
+
+
+def _record(path, params, payload):
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    target = os.path.join(RECORD_DIR, fixture_name(path, params))
+    with open(f"{target}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(f"{target}.tmp", target)
+
+
+def _counted(chunks, counter):
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+def backend_status():
+    """Estado da proteção do backend: circuito, próxima tentativa e contadores do processo."""
+    with _governor_lock:
+        stats = dict(_stats)
+    return {'circuit': _circuit.state, 'retryAt': _circuit.retry_at(), 'failures': _circuit.consecutive, **stats}
+
+
+def _bucket(path):
+    with _governor_lock:
+        bucket = _buckets.get(path)
+        if bucket is None:
+            bucket = _buckets[path] = TokenBucket(RATE_LIMIT, RATE_BURST)
+        return bucket
+
+
+def _count(name, delta=1):
+    with _governor_lock:
+        _stats[name] += delta
+        in_flight = _stats['inFlight']
+    instrumentation.record_backend_guard(in_flight, _circuit.state)
+
+
+def _guarded(path, key, fetch):
+    """Executa `fetch()` sob o circuit breaker, o limite por endpoint e o de simultâneas.
+
+    Requisições idênticas (mesma chave) feitas enquanto uma está em andamento
+    esperam por ela e recebem o mesmo payload (ou a mesma exceção).
+    """
+    if not _circuit.allow():
+        _count('rejected')
+        instrumentation.record_upstream(path, 'circuit_open', 0.0)
+        raise CircuitOpenError(f"Backend indisponível (circuito aberto): {path}")
+
+    with _governor_lock:
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[key] = _InFlight()
+    if not leader:
+        _count('deduplicated')
+        start = time.perf_counter()
+        flight.event.wait()
+        instrumentation.record_upstream(path, 'deduplicated', time.perf_counter() - start)
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    ok = None  # resultado para o circuit breaker (None = o backend não chegou a ser consultado)
+    try:
+        deadline = time.monotonic() + QUEUE_TIMEOUT
+        if RATE_LIMIT > 0 and not _bucket(path).acquire(deadline):
+            raise ThrottledError(f"Limite de taxa do endpoint excedido: {path}")
+        if not _slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise ThrottledError(f"Limite de requisições simultâneas excedido: {path}")
+        _count('inFlight')
+        try:
+            flight.value = fetch()
+        finally:
+            _slots.release()
+            _count('inFlight', -1)
+        ok = True
+        return flight.value
+    except ThrottledError as exc:
+        _count('throttled')
+        instrumentation.record_upstream(path, 'throttled', 0.0)
+        flight.error = exc
+        raise
+    except requests.exceptions.HTTPError as exc:
+        # 4xx: o backend está de pé; só 5xx (já depois dos retries) contam como falha
+        ok = exc.response is not None and exc.response.status_code < 500
+        flight.error = exc
+        raise
+    except requests.exceptions.RequestException as exc:
+        ok = False
+        flight.error = exc
+        raise
+    except Exception as exc:
+        flight.error = exc
+        raise
+    finally:
+        if ok is None:
+            _circuit.cancel()
+        else:
+            _circuit.record(ok)
+        with _governor_lock:
+            _in_flight.pop(key, None)
+        flight.event.set()
+
+
+def api_get(path, params=None, stream=None):
+    """Executa um GET no backend e retorna o JSON decodificado.
+
+    Usa ETag/If-None-Match quando o backend fornece o cabeçalho: em um 304 o
+    último payload recebido é reaproveitado sem novo download. Erros de rede e
+    de status são propagados como requests.exceptions.RequestException.
+
+    Com `stream` (caminho da lista -> {campo: tipo}, ver ingest.py) a resposta
+    é lida em streaming e essas listas chegam como ingest.Columns, só com os
+    campos pedidos; payloads de replay e snapshot são convertidos da mesma forma.
+
+    As requisições HTTP passam por `_guarded`: chamadas idênticas simultâneas
+    compartilham uma resposta, há limite de taxa por endpoint e de requisições
+    simultâneas, e com o backend fora do ar o circuit breaker falha na hora
+    com CircuitOpenError (os fetchers seguem servindo o valor em cache).
+    """
+    if SNAPSHOT_PATH:
+        start = time.perf_counter()
+        payload = _handled(get_snapshot(), path, params, 'snapshot')
+        instrumentation.record_upstream(path, 'snapshot', time.perf_counter() - start)
+        return ingest.columnar(payload, stream) if stream else payload
+
+    if REPLAY_MODE == 'fixtures':
+        start = time.perf_counter()
+        payload = _replay_get(path, params)
+        instrumentation.record_upstream(path, 'replay', time.perf_counter() - start)
+        return ingest.columnar(payload, stream) if stream else payload
+
+    base_url = API_URL
+    if REPLAY_MODE == 'stub':
+        _get_stub()
+        base_url = _stub_url
+    url = f"{base_url}{path}"
+    key = _etag_key(url, params, stream)
+    return _guarded(path, key, lambda: _http_get(path, url, key, params, stream))
+
+
+def _http_get(path, url, key, params, stream):
+    headers = {}
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+    if cached:
+        headers['If-None-Match'] = cached[0]
+
+    start = time.perf_counter()
+    try:
+        response = get_session().get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+            stream=bool(stream)
+        )
+    except requests.exceptions.RequestException:
+        instrumentation.record_upstream(path, 'error', time.perf_counter() - start)
+        raise
+    latency = time.perf_counter() - start
+
+    if response.status_code == 304 and cached:
+        response.close()
+        instrumentation.record_upstream(path, 304, latency)
+        with _etag_lock:
+            _etag_cache.move_to_end(key)
+        return cached[1]
+
+    if not response.ok:
+        instrumentation.record_upstream(path, response.status_code, latency, len(response.content))
+    response.raise_for_status()
+    parse_start = time.perf_counter()
+    if stream:
+        # Download e decodificação acontecem juntos: o tempo de parse inclui a transferência
+        size = [0]
+        try:
+            payload = ingest.parse_stream(_counted(response.iter_content(ingest.CHUNK_SIZE), size), stream)
+        except ingest.StreamError as e:
+            instrumentation.record_upstream(path, 'error', latency, size[0])
+            raise requests.exceptions.InvalidJSONError(f"JSON inválido em {path}: {e}", response=response) from e
+        finally:
+            response.close()
+        size = size[0]
+    else:
+        payload = response.json()
+        size = len(response.content)
+    instrumentation.record_upstream(
+        path, response.status_code, latency, size, time.perf_counter() - parse_start
+    )
+
+    if RECORD_DIR:
+        _record(path, params, ingest.to_jsonable(payload))
+
+    etag = response.headers.get('ETag')
+    if etag:
+        with _etag_lock:
+            _etag_cache[key] = (etag, payload)
+            _etag_cache.move_to_end(key)
+            while len(_etag_cache) > ETAG_CACHE_SIZE:
+                _etag_cache.popitem(last=False)
+    return payload
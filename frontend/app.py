@@ -1,6 +1,14 @@
 import streamlit as st
-import plotly.graph_objects as go
+from figures import radar_figure, quality_score_figure
+from instrumentation import start_page
+from ratings import QUALITY_DIMENSIONS
 from utils import display_sidebar, get_latest_metrics, render_no_data, format_rating, get_rating_color, minutes_to_days, format_coverage, is_numeric_value, prepare_radar_data
+from utils import RADAR_DIMENSIONS, get_score_history, get_scores_at
+
+# Períodos disponíveis para a evolução dos scores (em horas)
+SCORE_PERIODS = {'7 dias': 168, '30 dias': 720, '90 dias': 2160, '1 ano': 8760}
+# Quantidade máxima de pontos enviados ao navegador no gráfico de scores
+SCORE_MAX_POINTS = 500
 
 # ==========================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -54,6 +62,7 @@ st.markdown("""
 def main():
     # Sidebar
     project_id = display_sidebar()
+    trace = start_page('app')
     
     # Header
     st.markdown("""
@@ -68,164 +77,160 @@ def main():
         return
     
     # Carregar dados
-    data = get_latest_metrics(project_id)
+    with trace.section('Carregamento de dados'):
+        data = get_latest_metrics(project_id)
     
     if not data:
         render_no_data()
         return
     
     # Seção de Limiar de Qualidade
-    st.header("🚦 Limiar de Qualidade", divider='rainbow')
-
-    qg_status = "Aprovado" if data.get('overallRating') == 'A' else "Reprovado"
-    qg_color = "green" if qg_status == "Aprovado" else "red"
-
-    st.markdown(f"### Status Geral: <span style='color:{qg_color};'>{qg_status}</span>", unsafe_allow_html=True)
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="Manutenibilidade",
-            value=format_rating(data.get('maintainability', {}).get('rating')),
-            help=f"Baseado na Taxa de Dívida Técnica de {data.get('maintainability', {}).get('debtRatio', 0)}%"
-        )
-    
-    with col2:
-        st.metric(
-            label="Confiabilidade",
-            value=format_rating(data.get('reliability', {}).get('rating')),
-            help=f"{data.get('reliability', {}).get('bugs', 0)} bugs encontrados."
-        )
-    
-    with col3:
-        st.metric(
-            label="Segurança",
-            value=format_rating(data.get('security', {}).get('rating')),
-            help=f"{data.get('security', {}).get('vulnerabilities', 0)} vulnerabilidades encontradas."
-        )
-    
-    with col4:
-        coverage_value = data.get('coverage', {}).get('overall', '*')
-        new_coverage = data.get('coverage', {}).get('new', '*')
-
-        # Formatar valores de cobertura
-        coverage_display = format_coverage(coverage_value) if is_numeric_value(coverage_value) else '*'
-        delta_display = f"{new_coverage}% em código novo" if is_numeric_value(new_coverage) else None
-
-        st.metric(
-            label="Cobertura de Testes",
-            value=coverage_display,
-            delta=delta_display,
-            help="Porcentagem de código coberto por testes automatizados"
-        )
+    with trace.section('Limiar de Qualidade'):
+        st.header("🚦 Limiar de Qualidade", divider='rainbow')
 
-    # Seção de Gráfico de Radar
-    st.header("📊 Dimensões de Qualidade", divider='rainbow')
-
-    radar_data = prepare_radar_data(data)
-
-    if radar_data:
-        col_radar, col_legend = st.columns([2, 1])
-
-        with col_radar:
-            # Criar gráfico de radar
-            fig_radar = go.Figure()
-
-            fig_radar.add_trace(go.Scatterpolar(
-                r=radar_data['scores'],
-                theta=radar_data['dimensions'],
-                fill='toself',
-                name='Score Atual',
-                line=dict(color='#2575FC', width=2),
-                fillcolor='rgba(37, 117, 252, 0.3)'
-            ))
-
-            # Adicionar linha de referência (ideal = 100)
-            fig_radar.add_trace(go.Scatterpolar(
-                r=[100, 100, 100, 100, 100],
-                theta=radar_data['dimensions'],
-                fill='toself',
-                name='Meta Ideal',
-                line=dict(color='#10B981', width=1, dash='dash'),
-                fillcolor='rgba(16, 185, 129, 0.1)'
-            ))
-
-            fig_radar.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100],
-                        tickmode='linear',
-                        tick0=0,
-                        dtick=25,
-                        showticklabels=True,
-                        ticks='outside'
-                    )
-                ),
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=-0.2,
-                    xanchor="center",
-                    x=0.5
-                ),
-                height=500,
-                title=dict(
-                    text="Análise de Qualidade do Software",
-                    font=dict(size=18)
-                )
+        qg_status = "Aprovado" if data.get('overallRating') == 'A' else "Reprovado"
+        qg_color = "green" if qg_status == "Aprovado" else "red"
+
+        st.markdown(f"### Status Geral: <span style='color:{qg_color};'>{qg_status}</span>", unsafe_allow_html=True)
+    
+        col1, col2, col3, col4 = st.columns(4)
+    
+        with col1:
+            st.metric(
+                label="Manutenibilidade",
+                value=format_rating(data.get('maintainability', {}).get('rating')),
+                help=f"Baseado na Taxa de Dívida Técnica de {data.get('maintainability', {}).get('debtRatio', 0)}%"
+            )
+    
+        with col2:
+            st.metric(
+                label="Confiabilidade",
+                value=format_rating(data.get('reliability', {}).get('rating')),
+                help=f"{data.get('reliability', {}).get('bugs', 0)} bugs encontrados."
+            )
+    
+        with col3:
+            st.metric(
+                label="Segurança",
+                value=format_rating(data.get('security', {}).get('rating')),
+                help=f"{data.get('security', {}).get('vulnerabilities', 0)} vulnerabilidades encontradas."
+            )
+    
+        with col4:
+            coverage_value = data.get('coverage', {}).get('overall', '*')
+            new_coverage = data.get('coverage', {}).get('new', '*')
+
+            # Formatar valores de cobertura
+            coverage_display = format_coverage(coverage_value) if is_numeric_value(coverage_value) else '*'
+            delta_display = f"{new_coverage}% em código novo" if is_numeric_value(new_coverage) else None
+
+            st.metric(
+                label="Cobertura de Testes",
+                value=coverage_display,
+                delta=delta_display,
+                help="Porcentagem de código coberto por testes automatizados"
             )
 
-            st.plotly_chart(fig_radar, use_container_width=True)
+    # Seção de Gráfico de Radar
+    with trace.section('Dimensões de Qualidade'):
+        st.header("📊 Dimensões de Qualidade", divider='rainbow')
+
+        radar_data = prepare_radar_data(data)
+
+        if radar_data:
+            col_radar, col_legend = st.columns([2, 1])
+
+            with col_radar:
+                fig_radar = radar_figure(radar_data['dimensions'], radar_data['scores'])
+                st.plotly_chart(fig_radar, use_container_width=True)
+
+            with col_legend:
+                st.subheader("Detalhes das Dimensões")
+
+                # Confiabilidade
+                st.markdown(f"**🔧 Confiabilidade**")
+                st.markdown(f"Score: `{radar_data['scores'][0]:.0f}/100`")
+                st.caption("Baseado em bugs e rating de confiabilidade")
 
-        with col_legend:
-            st.subheader("Detalhes das Dimensões")
+                # Segurança
+                st.markdown(f"**🔒 Segurança**")
+                st.markdown(f"Score: `{radar_data['scores'][1]:.0f}/100`")
+                st.caption("Baseado em vulnerabilidades e rating de segurança")
 
-            # Confiabilidade
-            st.markdown(f"**🔧 Confiabilidade**")
-            st.markdown(f"Score: `{radar_data['scores'][0]:.0f}/100`")
-            st.caption("Baseado em bugs e rating de confiabilidade")
+                # Manutenibilidade
+                st.markdown(f"**🔨 Manutenibilidade**")
+                st.markdown(f"Score: `{radar_data['scores'][2]:.0f}/100`")
+                st.caption("Baseado em code smells e dívida técnica")
 
-            # Segurança
-            st.markdown(f"**🔒 Segurança**")
-            st.markdown(f"Score: `{radar_data['scores'][1]:.0f}/100`")
-            st.caption("Baseado em vulnerabilidades e rating de segurança")
+                # Cobertura de Testes
+                st.markdown(f"**🧪 Cobertura de Testes**")
+                st.markdown(f"Score: `{radar_data['scores'][3]:.0f}/100`")
+                st.caption("Porcentagem de código coberto por testes")
 
-            # Manutenibilidade
-            st.markdown(f"**🔨 Manutenibilidade**")
-            st.markdown(f"Score: `{radar_data['scores'][2]:.0f}/100`")
-            st.caption("Baseado em code smells e dívida técnica")
+                # Qualidade do Código
+                st.markdown(f"**✨ Qualidade do Código**")
+                st.markdown(f"Score: `{radar_data['scores'][4]:.0f}/100`")
+                st.caption("Baseado em duplicação de código (invertido)")
+        else:
+            st.info("Dados insuficientes para gerar o gráfico de radar.")
 
-            # Cobertura de Testes
-            st.markdown(f"**🧪 Cobertura de Testes**")
-            st.markdown(f"Score: `{radar_data['scores'][3]:.0f}/100`")
-            st.caption("Porcentagem de código coberto por testes")
+    # Seção de Evolução da Qualidade (scores materializados no histórico)
+    with trace.section('Evolução da Qualidade'):
+        st.header("📈 Evolução da Qualidade", divider='rainbow')
+
+        score_period = st.selectbox("Período", options=list(SCORE_PERIODS), index=1, key='score_period')
+        df_scores = get_score_history(project_id, SCORE_PERIODS[score_period])
+
+        if df_scores is not None and not df_scores.empty:
+            from history import downsample
+
+            first_day = df_scores['timestamp'].iloc[0].date()
+            last_day = df_scores['timestamp'].iloc[-1].date()
+            col_chart, col_past = st.columns([2, 1])
+
+            with col_past:
+                selected_day = st.date_input(
+                    "Radar na data", value=last_day, min_value=first_day, max_value=last_day, key='radar_date'
+                )
+                # Último snapshot até o fim do dia escolhido
+                past = get_scores_at(project_id, f"{selected_day}T23:59:59.999999Z")
+                if past:
+                    past_time, past_scores = past
+                    st.plotly_chart(
+                        radar_figure(RADAR_DIMENSIONS, [past_scores[name] for name in QUALITY_DIMENSIONS]),
+                        use_container_width=True
+                    )
+                    st.caption(
+                        f"Snapshot de {past_time:%d/%m/%Y %H:%M} UTC · "
+                        f"índice de qualidade {past_scores['qualityIndex']:.0f}/100"
+                    )
 
-            # Qualidade do Código
-            st.markdown(f"**✨ Qualidade do Código**")
-            st.markdown(f"Score: `{radar_data['scores'][4]:.0f}/100`")
-            st.caption("Baseado em duplicação de código (invertido)")
-    else:
-        st.info("Dados insuficientes para gerar o gráfico de radar.")
+            with col_chart:
+                labels = {'qualityIndex': 'Índice de Qualidade', **dict(zip(QUALITY_DIMENSIONS, RADAR_DIMENSIONS))}
+                df_plot = downsample(df_scores, 'qualityIndex', target=SCORE_MAX_POINTS)
+                st.plotly_chart(quality_score_figure(df_plot, labels), use_container_width=True)
+        else:
+            st.info("Dados históricos insuficientes para a evolução dos scores.")
 
-    st.header("🔍 Foco no Código Novo", divider='rainbow')
+    # Seção de Código Novo
+    with trace.section('Foco no Código Novo'):
+        st.header("🔍 Foco no Código Novo", divider='rainbow')
     
-    new_code = data.get('newCode', {})
+        new_code = data.get('newCode', {})
     
-    col1, col2, col3 = st.columns(3)
+        col1, col2, col3 = st.columns(3)
     
-    with col1:
-        st.metric("Novos Bugs", value=new_code.get('bugs', 0), delta_color="inverse")
+        with col1:
+            st.metric("Novos Bugs", value=new_code.get('bugs', 0), delta_color="inverse")
     
-    with col2:
-        st.metric("Novas Vulnerabilidades", value=new_code.get('vulnerabilities', 0), delta_color="inverse")
+        with col2:
+            st.metric("Novas Vulnerabilidades", value=new_code.get('vulnerabilities', 0), delta_color="inverse")
     
-    with col3:
-        st.metric("Novos Code Smells", value=new_code.get('codeSmells', 0), delta_color="inverse")
+        with col3:
+            st.metric("Novos Code Smells", value=new_code.get('codeSmells', 0), delta_color="inverse")
     
     st.info("Use os links na barra de navegação para explorar as visões detalhadas.", icon="👈")
+    trace.finish()
 
 # ==========================================
 # EXECUÇÃO
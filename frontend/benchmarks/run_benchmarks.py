@@ -0,0 +1,420 @@
+# frontend/benchmarks/run_benchmarks.py
+"""Benchmarks da preparação de dados e da renderização das páginas do frontend.
+
+Uso (a partir de frontend/):
+
+    python benchmarks/run_benchmarks.py                 # roda tudo e compara com o baseline
+    python benchmarks/run_benchmarks.py --save          # roda e grava o resultado como novo baseline
+    python benchmarks/run_benchmarks.py -k radar -k history --no-pages
+
+Para cada benchmark são reportados o tempo de parede (mediana e mínimo),
+o pico de memória alocada (tracemalloc) e o saldo de blocos alocados.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Silencia avisos de depreciação do Streamlit durante as execuções das páginas
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, FRONTEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+import fixtures  # noqa: E402
+from stub_backend import StubBackend  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Tamanhos dos payloads sintéticos
+HISTORY_POINTS = 10000
+ISSUES = 5000
+FILES = 20000
+DIFF_FILES = 50000
+DIFF_ISSUES = 20000
+# Escala dos payloads servidos pelo stub nos benchmarks de página
+PAGE_SCALE = 5
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registra uma função que prepara os dados e retorna o callable a ser medido."""
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+# ==========================================
+# BENCHMARKS DE PREPARAÇÃO DE DADOS
+# ==========================================
+
+@benchmark('radar.prepare_radar_data x1000')
+def bench_radar():
+    from utils import prepare_radar_data
+    data = [fixtures.latest_metrics(seed) for seed in range(1000)]
+    return lambda: [prepare_radar_data(d) for d in data]
+
+
+@benchmark('ratings.scalar x10k')
+def bench_ratings_scalar():
+    from utils import format_rating, get_rating_color, rating_to_score, is_numeric_value, format_coverage
+    values = (['1.0', '2.0', 'A', 'C', 5, None, '*', 3.0, 'x', 42.5] * 1000)
+
+    def run():
+        for value in values:
+            format_rating(value)
+            get_rating_color(value)
+            rating_to_score(value)
+            is_numeric_value(value)
+            format_coverage(value)
+    return run
+
+
+@benchmark('ratings.vectorized x10k')
+def bench_ratings_vectorized():
+    import ratings
+    values = pd.Series(['1.0', '2.0', 'A', 'C', 5, None, '*', 3.0, 'x', 42.5] * 1000, dtype=object)
+
+    def run():
+        ratings.ratings_to_letters(values)
+        ratings.ratings_to_colors(values)
+        ratings.ratings_to_scores(values)
+        ratings.is_numeric_array(values)
+        ratings.format_coverage_series(values)
+    return run
+
+
+@benchmark('manager.history_frame 10k points')
+def bench_history_frame():
+    from history import HistoryStore, downsample
+    snapshots = fixtures.metrics_history(HISTORY_POINTS)
+
+    def run():
+        store = HistoryStore('bench')
+        store.loaded_hours = 24 * 365
+        store.append(snapshots)
+        df = store.to_frame()
+        downsample(df, 'technicalDebtHours', target=500)
+    return run
+
+
+@benchmark('home.score_history 10k points')
+def bench_score_history():
+    from history import HistoryStore, downsample
+    store = HistoryStore('bench')
+    store.loaded_hours = 24 * 365
+    store.append(fixtures.metrics_history(HISTORY_POINTS))
+    last = store.last_timestamp
+
+    def run():
+        df = store.score_frame()
+        downsample(df, 'qualityIndex', target=500)
+        store.scores_at(last)
+    return run
+
+
+@benchmark('developer.issues_frames 5k issues')
+def bench_issue_frames():
+    issues = fixtures.new_code_issues(ISSUES)['issues']
+    columns = ['severity', 'component', 'message', 'line', 'effort']
+    return lambda: [pd.DataFrame(issues[kind])[columns] for kind in ('bugs', 'vulnerabilities', 'codeSmells')]
+
+
+@benchmark('developer.complexity_frame 20k files')
+def bench_complexity_frame():
+    components = fixtures.complexity(FILES)['components']
+    return lambda: pd.DataFrame(components)[['name', 'complexity', 'cognitiveComplexity', 'linesOfCode']]
+
+
+@benchmark('developer.coverage_frame 20k files')
+def bench_coverage_frame():
+    components = fixtures.coverage(FILES)['components']
+
+    def run():
+        df = pd.DataFrame(components)
+        df['coveredLines'] = df['linesToCover'] - df['uncoveredLines']
+        return df['uncoveredLines'].sum(), df['coveredLines'].sum()
+    return run
+
+
+def _chunked(raw):
+    from ingest import CHUNK_SIZE
+    return (raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE))
+
+
+@benchmark('ingest.json_loads_frames 5k issues')
+def bench_ingest_loads():
+    from utils import ISSUE_COLUMNS
+    raw = json.dumps(fixtures.new_code_issues(ISSUES)).encode()
+
+    def run():
+        issues = json.loads(raw)['issues']
+        return [pd.DataFrame.from_records(issues[kind], columns=ISSUE_COLUMNS) for kind in ('bugs', 'vulnerabilities', 'codeSmells')]
+    return run
+
+
+@benchmark('ingest.streaming_frames 5k issues')
+def bench_ingest_streaming():
+    from ingest import parse_stream
+    from utils import ISSUE_COLUMNS, ISSUES_STREAM
+    raw = json.dumps(fixtures.new_code_issues(ISSUES)).encode()
+
+    def run():
+        issues = parse_stream(_chunked(raw), ISSUES_STREAM)['issues']
+        return [issues[kind].to_frame(ISSUE_COLUMNS) for kind in ('bugs', 'vulnerabilities', 'codeSmells')]
+    return run
+
+
+@benchmark('ingest.streaming_components 20k files')
+def bench_ingest_components():
+    from ingest import parse_stream
+    from utils import COMPLEXITY_STREAM
+    raw = json.dumps(fixtures.complexity(FILES)).encode()
+    return lambda: parse_stream(_chunked(raw), COMPLEXITY_STREAM)['components'].to_frame()
+
+
+@benchmark('diff.files_diff 50k files')
+def bench_files_diff():
+    from diff import files_diff
+    from explorer import file_frame
+    from ingest import columnar
+    from utils import COMPLEXITY_STREAM, COVERAGE_STREAM
+
+    complexity = fixtures.complexity(DIFF_FILES)
+    coverage = fixtures.coverage(DIFF_FILES)
+    before = file_frame(columnar(complexity, COMPLEXITY_STREAM), columnar(coverage, COVERAGE_STREAM))
+    # Depois: 2% dos arquivos removidos, 1% novos e 5% com complexidade alterada
+    after = before.iloc[DIFF_FILES // 50:].copy()
+    after.iloc[:DIFF_FILES // 20, after.columns.get_loc('complexity')] += 1
+    added = before.iloc[:DIFF_FILES // 100].copy()
+    added['path'] = 'novo/' + added['path']
+    after = pd.concat([after, added], ignore_index=True)
+    return lambda: files_diff(before, after)
+
+
+@benchmark('diff.issues_diff 20k issues')
+def bench_issues_diff():
+    from diff import issues_diff
+    from ingest import Columns, columnar
+    from utils import DIFF_ISSUE_FIELDS, DIFF_ISSUES_STREAM, ISSUE_TYPES
+
+    def collect(payload):
+        groups = columnar(payload, DIFF_ISSUES_STREAM)['issues']
+        return Columns.concat([groups[group] for group in ISSUE_TYPES.values()], DIFF_ISSUE_FIELDS)
+
+    before = collect(fixtures.new_code_issues(DIFF_ISSUES))
+    # Depois: 10% de issues novas e 5% das existentes resolvidas
+    after = collect(fixtures.new_code_issues(DIFF_ISSUES + DIFF_ISSUES // 10))
+    after = after.take(slice(DIFF_ISSUES // 20, None))
+    return lambda: issues_diff(before, after)
+
+
+@benchmark('analytics.append 1 snapshot (1 year history)')
+def bench_analytics_append():
+    from datetime import timedelta
+    from history import HistoryStore
+    # Um ano de snapshots horários; cada execução anexa um snapshot novo
+    store = HistoryStore('bench')
+    store.loaded_hours = 24 * 365
+    store.append(fixtures.metrics_history(24 * 365, interval_minutes=60))
+    last = store.last_timestamp
+    counter = iter(range(1, 10**9))
+
+    def run():
+        step = next(counter)
+        store.append([fixtures.latest_metrics(step, timestamp=last + timedelta(minutes=step))])
+    return run
+
+
+@benchmark('analytics.trends 30 days (1 year history)')
+def bench_analytics_trends():
+    from history import HistoryStore
+    store = HistoryStore('bench')
+    store.loaded_hours = 24 * 365
+    store.append(fixtures.metrics_history(24 * 365, interval_minutes=60))
+    return lambda: store.trends(720)
+
+
+@benchmark('dora.metrics 30 days x100 (3k deployments)')
+def bench_dora_metrics():
+    from dora import DeploymentLog
+    log = DeploymentLog(fixtures.deployments(3000, 365)['deployments'])
+    return lambda: [log.metrics(days) for days in (7, 30, 90, 365) * 25]
+
+
+@benchmark('dora.series 30-day window x365 (3k deployments)')
+def bench_dora_series():
+    from dora import DeploymentLog
+    log = DeploymentLog(fixtures.deployments(3000, 365)['deployments'])
+    return lambda: log.series(30)
+
+
+def _trend_frame():
+    from history import HistoryStore, downsample
+    store = HistoryStore('bench')
+    store.loaded_hours = 24 * 365
+    store.append(fixtures.metrics_history(HISTORY_POINTS))
+    return downsample(store.to_frame(), 'technicalDebtHours', target=500)[['timestamp', 'technicalDebtHours']]
+
+
+@benchmark('figures.debt_trend 500 points (build)')
+def bench_trend_figure_build():
+    import figures
+    df_trend = _trend_frame()
+    return lambda: figures.debt_trend_figure.__wrapped__(df_trend)
+
+
+@benchmark('figures.debt_trend 500 points (cached)')
+def bench_trend_figure_cached():
+    import figures
+    df_trend = _trend_frame()
+    return lambda: figures.debt_trend_figure(df_trend)
+
+
+# ==========================================
+# BENCHMARKS DE PÁGINA (AppTest)
+# ==========================================
+
+PAGES = {
+    'page.app': 'app.py',
+    'page.managerView': 'pages/managerView.py',
+    'page.developerView': 'pages/developerView.py',
+    'page.compareView': 'pages/compareView.py',
+}
+
+
+def _page_benchmark(script, stub, cold):
+    from streamlit.testing.v1 import AppTest
+    import streamlit.delta_generator as delta_generator
+    import api_client
+    import cache
+    import history
+
+    api_client.API_URL = stub.url
+    api_client.REPLAY_MODE = ''
+    # O AppTest executa cada página como script principal, então os links para
+    # as outras páginas da sidebar não são resolvíveis aqui.
+    delta_generator.DeltaGenerator.page_link = lambda self, *args, **kwargs: None
+
+    def run():
+        if cold:
+            cache.clear_cache()
+            history._stores.clear()
+        at = AppTest.from_file(os.path.join(FRONTEND_DIR, script), default_timeout=120).run()
+        if at.exception:
+            raise RuntimeError(f"{script}: {at.exception[0].value}")
+    return run
+
+
+def register_page_benchmarks(stub):
+    for name, script in PAGES.items():
+        BENCHMARKS[f"{name} (cold)"] = lambda script=script: _page_benchmark(script, stub, cold=True)
+        BENCHMARKS[f"{name} (warm)"] = lambda script=script: _page_benchmark(script, stub, cold=False)
+
+
+# ==========================================
+# MEDIÇÃO E COMPARAÇÃO
+# ==========================================
+
+def measure(func, repeat):
+    """Executa `func` e retorna tempos (ms), pico de memória (KB) e saldo de blocos alocados."""
+    func()  # aquecimento (imports, caches de módulo)
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks_before
+
+    return {
+        'median_ms': round(statistics.median(times), 3),
+        'min_ms': round(min(times), 3),
+        'peak_kb': round(peak / 1024, 1),
+        'net_blocks': blocks,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Imprime a comparação com o baseline e retorna os nomes que regrediram."""
+    regressions = []
+    print(f"\n{'benchmark':45} {'mediana':>12} {'Δ tempo':>9} {'pico':>12} {'Δ pico':>9}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        delta_time = delta_peak = ''
+        if previous:
+            dt = (result['median_ms'] - previous['median_ms']) / max(previous['median_ms'], 1e-9)
+            dp = (result['peak_kb'] - previous['peak_kb']) / max(previous['peak_kb'], 1e-9)
+            delta_time = f"{dt:+.1%}"
+            delta_peak = f"{dp:+.1%}"
+            if dt > threshold or dp > threshold:
+                regressions.append(name)
+        print(f"{name:45} {result['median_ms']:>10.2f}ms {delta_time:>9} {result['peak_kb']:>10.1f}KB {delta_peak:>9}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', '--filter', action='append', default=[], help="roda apenas benchmarks cujo nome contém o texto")
+    parser.add_argument('--repeat', type=int, default=5, help="repetições cronometradas por benchmark")
+    parser.add_argument('--no-pages', action='store_true', help="pula os benchmarks de página (AppTest)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="arquivo JSON do baseline")
+    parser.add_argument('--save', action='store_true', help="grava os resultados como novo baseline")
+    parser.add_argument('--threshold', type=float, default=0.10, help="variação considerada regressão (0.10 = 10%%)")
+    parser.add_argument('--fail-on-regression', action='store_true', help="sai com código 1 se houver regressão")
+    args = parser.parse_args()
+
+    stub = None
+    if not args.no_pages:
+        stub = StubBackend(scale=PAGE_SCALE)
+        stub.serve()
+        register_page_benchmarks(stub)
+
+    results = {}
+    try:
+        for name, setup in BENCHMARKS.items():
+            if args.filter and not any(f in name for f in args.filter):
+                continue
+            print(f"• {name}...", flush=True)
+            results[name] = measure(setup(), args.repeat)
+    finally:
+        if stub:
+            stub.close()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('results', {})
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        merged = {**baseline, **results}
+        with open(args.baseline, 'w') as f:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': merged}, f, indent=2)
+        print(f"\nBaseline gravado em {args.baseline}")
+
+    if regressions:
+        print(f"\n⚠️  Regressões acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# frontend/benchmarks/startup_time.py
+"""Custo de importação dos módulos e páginas do frontend em um processo novo.
+
+Uso (a partir de frontend/):
+
+    python benchmarks/startup_time.py                  # módulos e páginas
+    python benchmarks/startup_time.py -k app -k utils  # apenas os alvos que contêm o texto
+    python benchmarks/startup_time.py --render         # inclui a primeira renderização (AppTest)
+
+Cada alvo é medido em um subprocesso que já importou o Streamlit (como o
+servidor faz antes de executar a página). São reportados o tempo de importação
+(mínimo entre as repetições), as bibliotecas pesadas carregadas e os pacotes
+de maior custo segundo o `python -X importtime`.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    'api_client', 'cache', 'instrumentation', 'ratings', 'history', 'utils',
+    'figures', 'explorer', 'portfolio', 'live',
+]
+PAGES = ['app.py', 'pages/managerView.py', 'pages/developerView.py', 'pages/portfolioView.py']
+
+# Bibliotecas cuja presença após a importação é reportada
+HEAVY = ['numpy', 'pandas', 'plotly.express', 'plotly.graph_objects', 'requests']
+
+# Executado no subprocesso: importa o Streamlit, marca o início e mede o alvo
+_PROBE = """
+import json, os, sys, time
+sys.path.insert(0, {frontend!r})
+os.chdir({frontend!r})
+import streamlit
+{prelude}
+sys.stderr.write('--startup-mark--\\n')
+sys.stderr.flush()
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_RENDER_PRELUDE = """
+os.environ.setdefault('BACKEND_REPLAY', 'fixtures')
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+from streamlit.testing.v1 import AppTest
+"""
+
+
+def page_imports(path):
+    """Instruções de import do nível superior de uma página."""
+    with open(os.path.join(FRONTEND_DIR, path), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return '\n'.join(ast.unparse(node) for node in nodes)
+
+
+def parse_importtime(stderr, limit=5):
+    """Pacotes de nível superior importados após a marca, ordenados pelo tempo cumulativo."""
+    lines = stderr.splitlines()
+    if '--startup-mark--' in lines:
+        lines = lines[lines.index('--startup-mark--') + 1:]
+    packages = {}
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        if '.' not in name:
+            packages[name] = max(packages.get(name, 0), int(cumulative))
+    return sorted(packages.items(), key=lambda item: -item[1])[:limit]
+
+
+def measure(code, prelude='', repeat=3):
+    """Mede `code` em subprocessos novos; retorna o melhor resultado e os pacotes mais caros."""
+    script = _PROBE.format(frontend=FRONTEND_DIR, prelude=prelude, code=code, heavy=HEAVY)
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            capture_output=True, text=True, cwd=FRONTEND_DIR
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = dict(result, top=parse_importtime(proc.stderr))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', '--filter', action='append', default=[], help="mede apenas alvos cujo nome contém o texto")
+    parser.add_argument('--repeat', type=int, default=3, help="processos por alvo (vale o mais rápido)")
+    parser.add_argument('--render', action='store_true', help="mede também a primeira execução de cada página (AppTest)")
+    parser.add_argument('--json', action='store_true', help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    targets = [(f'import {name}', f'import {name}', '') for name in MODULES]
+    targets += [(f'{page} (imports)', page_imports(page), '') for page in PAGES]
+    if args.render:
+        targets += [
+            (f'{page} (1ª renderização)', f"AppTest.from_file({page!r}, default_timeout=120).run()", _RENDER_PRELUDE)
+            for page in PAGES
+        ]
+    targets = [t for t in targets if not args.filter or any(k in t[0] for k in args.filter)]
+
+    results = {}
+    for label, code, prelude in targets:
+        results[label] = measure(code, prelude, args.repeat)
+        if not args.json:
+            result = results[label]
+            top = ', '.join(f"{name} {us / 1000:.0f}" for name, us in result['top'])
+            print(f"{label:<40} {result['seconds'] * 1000:8.1f} ms   carregou: {', '.join(result['loaded']) or '-'}")
+            print(f"{'':<40} maiores (ms): {top}")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
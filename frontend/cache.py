@@ -0,0 +1,467 @@
+# frontend/cache.py
+# Cache stale-while-revalidate para os fetchers de utils.py
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import requests
+
+import instrumentation
+import memory
+from ingest import Columns
+
+# TTLs por endpoint: (soft, hard) em segundos.
+# Até o soft TTL o valor é servido direto; entre soft e hard é servido e
+# revalidado em segundo plano; após o hard TTL a busca volta a ser síncrona.
+CACHE_TTLS = {
+    'projects': (3600, 86400),
+    'latest_metrics': (60, 1800),
+    'metrics_history': (300, 3600),
+    'dora_metrics': (300, 3600),
+    'dora_deployments': (300, 3600),
+    'new_code_issues': (300, 3600),
+    'all_new_code_issues': (300, 3600),
+    'complexity': (900, 7200),
+    'coverage': (900, 7200),
+}
+DEFAULT_TTL = (300, 3600)
+
+# Intervalo mínimo entre tentativas de revalidação após uma falha do backend
+ERROR_RETRY_SECONDS = 30
+
+# Backend de armazenamento: 'memory' (por processo) ou 'sqlite' (compartilhado entre processos)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+# Limite de memória das entradas do backend 'memory' (MB); as menos usadas são descartadas
+CACHE_MAX_MB = float(os.getenv("CACHE_MAX_MB", "256"))
+CACHE_SQLITE_PATH = os.getenv(
+    "CACHE_SQLITE_PATH",
+    os.path.join(tempfile.gettempdir(), "sonarview-cache.sqlite3")
+)
+
+# Tempo máximo que um processo pode segurar a busca de uma chave antes que outro assuma
+LEASE_SECONDS = float(os.getenv("CACHE_LEASE_SECONDS", "30"))
+LEASE_POLL_SECONDS = 0.05
+
+
+def get_ttl(endpoint):
+    """Retorna (soft, hard) de um endpoint, aceitando CACHE_TTL_<ENDPOINT>=soft,hard no ambiente."""
+    override = os.getenv(f"CACHE_TTL_{endpoint.upper()}")
+    if override:
+        try:
+            soft, hard = (float(v) for v in override.split(','))
+            return soft, max(soft, hard)
+        except ValueError:
+            pass
+    return CACHE_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+class Entry:
+    __slots__ = ('value', 'fetched_at', 'retry_at', 'size')
+
+    def __init__(self, value, fetched_at, retry_at=0.0, size=0):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.retry_at = retry_at
+        self.size = size
+
+
+# ==========================================
+# BACKENDS DE ARMAZENAMENTO
+# ==========================================
+
+class MemoryBackend:
+    """Armazena as entradas em um dicionário do processo atual, limitado a `max_bytes`.
+
+    O tamanho de cada valor é estimado ao gravar (memory.sizeof); acima do
+    limite, as entradas usadas há mais tempo são descartadas e voltam a ser
+    buscadas na próxima leitura.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, fetched_at):
+        size = memory.sizeof(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            self._entries[key] = Entry(value, fetched_at, size=size)
+            self.total_bytes += size
+            if self.max_bytes is not None:
+                self._shrink_locked(self.total_bytes - self.max_bytes, keep=key)
+
+    def _shrink_locked(self, excess, keep=None):
+        freed = 0
+        for key in list(self._entries):
+            if freed >= excess:
+                break
+            if key == keep:
+                continue
+            freed += self._entries.pop(key).size
+            self.evictions += 1
+        self.total_bytes -= freed
+        return freed
+
+    def shrink(self, nbytes):
+        with self._lock:
+            return self._shrink_locked(nbytes)
+
+    def usage(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.total_bytes, 'maxBytes': self.max_bytes, 'evictions': self.evictions}
+
+    def mark_retry(self, key, retry_at):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.retry_at = retry_at
+
+    def clear(self, endpoint=None):
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                self.total_bytes = 0
+            else:
+                for key in [k for k in self._entries if k[0] == endpoint]:
+                    self.total_bytes -= self._entries.pop(key).size
+
+    def try_acquire(self, key, owner, ttl):
+        # Dentro de um único processo a coalescência já é feita pelo SWRCache
+        return True
+
+    def release(self, key, owner):
+        pass
+
+
+class SQLiteBackend:
+    """Armazena as entradas em um arquivo SQLite compartilhado pelos processos locais.
+
+    Os valores são serializados em JSON (ingest.Columns como registros
+    marcados, reconstruídos na leitura). Cada processo mantém uma cópia
+    decodificada da última versão lida de cada chave, então leituras repetidas
+    só consultam o timestamp da entrada. As cópias ficam em um memory.LRUPool
+    ('swr_cache') limitado a `max_bytes` e sujeito ao orçamento global; uma
+    cópia descartada é decodificada de novo na próxima leitura.
+    """
+
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self._local = threading.local()
+        self._decoded = memory.LRUPool('swr_cache', max_bytes)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                retry_at REAL NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_endpoint ON entries (endpoint);
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode_key(key):
+        return json.dumps(key, default=str)
+
+    @staticmethod
+    def _encode_value(value):
+        def default(obj):
+            if isinstance(obj, Columns):
+                return obj.to_json()
+            raise TypeError(f"{type(obj).__name__} não é serializável em JSON")
+        return json.dumps(value, default=default)
+
+    @staticmethod
+    def _decode_value(text):
+        return json.loads(text, object_hook=lambda obj: Columns.from_json(obj) if '__columns__' in obj else obj)
+
+    def get(self, key):
+        skey = self._encode_key(key)
+        row = self._conn().execute(
+            "SELECT fetched_at, retry_at FROM entries WHERE key = ?", (skey,)
+        ).fetchone()
+        if row is None:
+            return None
+        fetched_at, retry_at = row
+
+        cached = self._decoded.get(skey)
+        if cached is None or cached[0] != fetched_at:
+            value_row = self._conn().execute(
+                "SELECT value, fetched_at FROM entries WHERE key = ?", (skey,)
+            ).fetchone()
+            if value_row is None:
+                return None
+            cached = self._decoded.put(skey, (value_row[1], self._decode_value(value_row[0])))
+        return Entry(cached[1], cached[0], retry_at)
+
+    def set(self, key, value, fetched_at):
+        skey = self._encode_key(key)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (key, endpoint, value, fetched_at, retry_at) VALUES (?, ?, ?, ?, 0)",
+            (skey, key[0], self._encode_value(value), fetched_at)
+        )
+        self._decoded.put(skey, (fetched_at, value))
+
+    def mark_retry(self, key, retry_at):
+        self._conn().execute(
+            "UPDATE entries SET retry_at = ? WHERE key = ?", (retry_at, self._encode_key(key))
+        )
+
+    def clear(self, endpoint=None):
+        conn = self._conn()
+        if endpoint is None:
+            conn.execute("DELETE FROM entries")
+        else:
+            conn.execute("DELETE FROM entries WHERE endpoint = ?", (endpoint,))
+        self._decoded.clear()
+
+    def try_acquire(self, key, owner, ttl):
+        """Tenta obter o direito exclusivo de buscar `key` no backend."""
+        now = time.time()
+        cursor = self._conn().execute(
+            """
+            INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE leases.expires_at < ?
+            """,
+            (self._encode_key(key), owner, now + ttl, now)
+        )
+        return cursor.rowcount > 0
+
+    def release(self, key, owner):
+        self._conn().execute(
+            "DELETE FROM leases WHERE key = ? AND owner = ?", (self._encode_key(key), owner)
+        )
+
+
+def create_backend(name=None):
+    """Cria o backend configurado em CACHE_BACKEND."""
+    name = (name or CACHE_BACKEND).lower()
+    if name == 'sqlite':
+        return SQLiteBackend(CACHE_SQLITE_PATH, int(CACHE_MAX_MB * 1024 * 1024))
+    if name == 'memory':
+        return MemoryBackend(int(CACHE_MAX_MB * 1024 * 1024))
+    raise ValueError(f"Backend de cache desconhecido: {name}")
+
+
+# ==========================================
+# CACHE STALE-WHILE-REVALIDATE
+# ==========================================
+
+class _Flight:
+    """Busca em andamento para uma chave, compartilhada pelos chamadores concorrentes."""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SWRCache:
+    """Cache com soft/hard TTL, fallback para o último valor válido e single-flight."""
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._refreshing = set()
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def get(self, endpoint, key, fetch, default=None, on_error=None):
+        """Retorna o valor de `key`, buscando com `fetch()` quando necessário.
+
+        `fetch` deve lançar requests.exceptions.RequestException em caso de
+        falha. Se a busca falhar e existir um valor anterior (mesmo expirado),
+        ele continua sendo servido; sem valor anterior, `on_error(exc)` é chamado
+        e `default` é retornado.
+        """
+        return self.lookup(endpoint, key, fetch, default, on_error)[0]
+
+    def lookup(self, endpoint, key, fetch, default=None, on_error=None):
+        """Como `get`, mas retorna (valor, resultado), com resultado 'hit', 'stale', 'miss' ou 'error'."""
+        soft, hard = get_ttl(endpoint)
+        now = time.time()
+        entry = self.backend.get(key)
+
+        if entry is not None:
+            age = now - entry.fetched_at
+            if age < soft:
+                return entry.value, 'hit'
+            if age < hard:
+                if now >= entry.retry_at:
+                    self._refresh_async(key, fetch)
+                return entry.value, 'stale'
+
+        try:
+            return self._fetch_once(key, fetch, since=now), 'miss'
+        except requests.exceptions.RequestException as exc:
+            if entry is not None:
+                return entry.value, 'error'
+            if on_error:
+                on_error(exc)
+            return default, 'error'
+
+    def _fetch_once(self, key, fetch, since):
+        """Executa `fetch()` garantindo uma única busca por chave entre threads e processos."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._fetch_with_lease(key, fetch, since)
+            return flight.value
+        except Exception as exc:
+            # Os seguidores recebem a mesma falha do líder, seja qual for
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _fetch_with_lease(self, key, fetch, since):
+        deadline = time.time() + LEASE_SECONDS
+        while not self.backend.try_acquire(key, self._owner, LEASE_SECONDS):
+            # Outro processo está buscando a mesma chave: aguarda o resultado dele
+            time.sleep(LEASE_POLL_SECONDS)
+            entry = self.backend.get(key)
+            if entry is not None and entry.fetched_at >= since:
+                return entry.value
+            if time.time() > deadline:
+                break
+
+        try:
+            value = fetch()
+            self.backend.set(key, value, time.time())
+            return value
+        finally:
+            self.backend.release(key, self._owner)
+
+    def _refresh_async(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                if not self.backend.try_acquire(key, self._owner, LEASE_SECONDS):
+                    return  # outro processo já está revalidando
+                try:
+                    self.backend.set(key, fetch(), time.time())
+                finally:
+                    self.backend.release(key, self._owner)
+            except requests.exceptions.RequestException:
+                self.backend.mark_retry(key, time.time() + ERROR_RETRY_SECONDS)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="swr-refresh", daemon=True).start()
+
+    def refresh(self, key, fetch):
+        """Busca `key` agora, ignorando os TTLs, e grava o resultado; falhas são propagadas."""
+        return self._fetch_once(key, fetch, since=time.time())
+
+    def put(self, key, value):
+        """Grava um valor já obtido por outro caminho como busca recente de `key`."""
+        self.backend.set(key, value, time.time())
+
+    def clear(self, endpoint=None):
+        """Remove todas as entradas, ou apenas as de um endpoint."""
+        self.backend.clear(endpoint)
+
+
+_cache = SWRCache(create_backend())
+if isinstance(_cache.backend, MemoryBackend):
+    # O backend SQLite registra o pool das suas cópias decodificadas ao ser criado
+    memory.register('swr_cache', _cache.backend)
+
+
+def swr_cache(endpoint, default=None, on_error=None):
+    """Decorator que aplica o cache stale-while-revalidate a um fetcher.
+
+    Os valores retornados são compartilhados entre sessões e devem ser
+    tratados como somente leitura.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def make_key(args, kwargs):
+            # Normaliza argumentos posicionais/nomeados/defaults para a mesma chave;
+            # o nome do fetcher separa funções diferentes que usam o mesmo endpoint
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (endpoint, func.__qualname__, tuple(bound.arguments.items()))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            start = time.perf_counter()
+            value, outcome = _cache.lookup(endpoint, key, lambda: func(*args, **kwargs), default, on_error)
+            instrumentation.record_fetch(endpoint, outcome, time.perf_counter() - start)
+            return value
+
+        def refresh(*args, **kwargs):
+            # Busca agora, ignorando os TTLs (ex.: polling da atualização automática)
+            start = time.perf_counter()
+            try:
+                value = _cache.refresh(make_key(args, kwargs), lambda: func(*args, **kwargs))
+            except requests.exceptions.RequestException:
+                instrumentation.record_fetch(endpoint, 'error', time.perf_counter() - start)
+                raise
+            instrumentation.record_fetch(endpoint, 'refresh', time.perf_counter() - start)
+            return value
+
+        wrapper.clear = lambda: _cache.clear(endpoint)
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
+
+
+def clear_cache(endpoint=None):
+    """Limpa o cache dos fetchers."""
+    _cache.clear(endpoint)
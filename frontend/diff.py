@@ -0,0 +1,247 @@
+# frontend/diff.py
+# Comparação entre dois pontos no tempo de um projeto
+#
+# Cada ponto (estado atual do backend, snapshot exportado ou registro do
+# histórico) fornece as métricas agregadas e, quando existem, os dados por
+# arquivo e as issues. Arquivos são casados pelo caminho e issues pela chave
+# com junções por hash (pd.Index.get_indexer/isin), sem ordenar nem comparar
+# pares. Os resultados ficam em cache por par de pontos.
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import memory
+from explorer import COMPLEXITY_FIELDS, COVERAGE_FIELDS, file_frame
+from history import NUMERIC_FIELDS, RATING_CATEGORIES, RATING_FIELDS, SCORE_FIELDS, flatten_snapshots
+
+# Colunas por arquivo comparadas
+FILE_FIELDS = COMPLEXITY_FIELDS + COVERAGE_FIELDS + ['risk']
+# Situação de cada arquivo entre os dois pontos
+FILE_STATUSES = ['adicionado', 'removido', 'alterado', 'inalterado']
+
+# Rótulos das métricas agregadas (colunas do histórico)
+METRIC_LABELS = {
+    'bugs': 'Bugs',
+    'vulnerabilities': 'Vulnerabilidades',
+    'codeSmells': 'Code Smells',
+    'debtRatio': 'Taxa de Dívida (%)',
+    'coverage': 'Cobertura (%)',
+    'duplication': 'Duplicação (%)',
+    'linesOfCode': 'Linhas de Código',
+    'complexity': 'Complexidade',
+    'technicalDebtMinutes': 'Dívida Técnica (min)',
+    'reliabilityRating': 'Confiabilidade',
+    'securityRating': 'Segurança',
+    'maintainabilityRating': 'Manutenibilidade',
+    'overallRating': 'Rating Geral',
+    'reliabilityScore': 'Score de Confiabilidade',
+    'securityScore': 'Score de Segurança',
+    'maintainabilityScore': 'Score de Manutenibilidade',
+    'coverageScore': 'Score de Cobertura',
+    'codeQualityScore': 'Score de Qualidade do Código',
+    'qualityIndex': 'Índice de Qualidade',
+}
+
+
+# ==========================================
+# PONTOS NO TEMPO
+# ==========================================
+
+class Point:
+    """Um ponto no tempo de um projeto.
+
+    `key` identifica o conteúdo (muda quando os dados do ponto mudam) e
+    `load()` retorna o PointData; só é chamado quando o diff não está em cache.
+    """
+
+    __slots__ = ('kind', 'key', 'label', 'timestamp', '_loader')
+
+    def __init__(self, kind, key, label, timestamp, loader):
+        self.kind = kind
+        self.key = key
+        self.label = label
+        self.timestamp = timestamp
+        self._loader = loader
+
+    def load(self):
+        return self._loader()
+
+
+class PointData:
+    """Dados de um ponto: métricas nas colunas do histórico, arquivos (file_frame) e issues (Columns).
+
+    `files` e `issues` são None quando o ponto só tem métricas (registros do histórico).
+    """
+
+    __slots__ = ('metrics', 'files', 'issues')
+
+    def __init__(self, metrics, files=None, issues=None):
+        self.metrics = metrics or {}
+        self.files = files
+        self.issues = issues
+
+
+def snapshot_metrics(payload):
+    """Métricas de um payload de /metrics/latest nas colunas do histórico (ratings como códigos, com os scores)."""
+    if not payload or not payload.get('timestamp'):
+        return {}
+    columns = flatten_snapshots([payload])
+    return {name: values[0].item() for name, values in columns.items() if name != 'timestamp'}
+
+
+def point_data(metrics_payload, complexity_data=None, coverage_data=None, issues=None):
+    """PointData a partir dos payloads da API (mesmo formato dos fetchers de utils.py)."""
+    files = None
+    if complexity_data is not None or coverage_data is not None:
+        files = file_frame(complexity_data, coverage_data)
+    return PointData(snapshot_metrics(metrics_payload), files, issues)
+
+
+# ==========================================
+# DIFFS
+# ==========================================
+
+def metrics_diff(before, after):
+    """(ratings, métricas) entre os dois pontos.
+
+    `ratings` tem métrica, antes, depois e mudança ('melhorou', 'piorou',
+    'igual'); `métricas` tem antes, depois, delta e delta percentual.
+    """
+    rating_rows = []
+    for name, _ in RATING_FIELDS:
+        old, new = before.get(name, 0), after.get(name, 0)
+        change = 'igual' if old == new or not old or not new else ('melhorou' if new < old else 'piorou')
+        rating_rows.append({
+            'métrica': METRIC_LABELS[name],
+            'antes': RATING_CATEGORIES[old - 1] if old else '-',
+            'depois': RATING_CATEGORIES[new - 1] if new else '-',
+            'mudança': change,
+        })
+
+    names = [name for name, _ in NUMERIC_FIELDS] + SCORE_FIELDS
+    old = np.array([before.get(name, np.nan) for name in names], dtype=np.float64)
+    new = np.array([after.get(name, np.nan) for name in names], dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent = np.where(old != 0, 100 * (new - old) / np.abs(old), np.nan)
+    metrics = pd.DataFrame({
+        'métrica': [METRIC_LABELS[name] for name in names],
+        'campo': names,
+        'antes': old,
+        'depois': new,
+        'delta': new - old,
+        'delta %': percent,
+    })
+    return pd.DataFrame(rating_rows), metrics
+
+
+def files_diff(before, after, fields=FILE_FIELDS):
+    """Junção por caminho dos arquivos dos dois pontos.
+
+    Uma linha por arquivo presente em qualquer um dos pontos, com 'status'
+    (FILE_STATUSES) e '<campo>Before', '<campo>After' e '<campo>Delta'
+    (NaN para arquivos adicionados ou removidos).
+    """
+    before_index = pd.Index(before['path'], dtype=object)
+    after_index = pd.Index(after['path'], dtype=object)
+    # Tabela hash do "antes": posição de cada arquivo do "depois" (-1 = novo)
+    matched = before_index.get_indexer(after_index)
+    removed = after_index.get_indexer(before_index) < 0
+    found = matched >= 0
+    n_removed = int(removed.sum())
+
+    data = {'path': np.concatenate([after_index.to_numpy(dtype=object), before_index.to_numpy(dtype=object)[removed]])}
+    changed = np.zeros(len(after_index), dtype=bool)
+    for field in fields:
+        old = before[field].to_numpy(dtype=np.float64)
+        new = after[field].to_numpy(dtype=np.float64)
+        old_matched = np.where(found, old[np.maximum(matched, 0)] if len(old) else np.nan, np.nan)
+        changed |= found & ~np.isclose(old_matched, new, equal_nan=True)
+        data[f'{field}Before'] = np.concatenate([old_matched, old[removed]])
+        data[f'{field}After'] = np.concatenate([new, np.full(n_removed, np.nan)])
+        data[f'{field}Delta'] = data[f'{field}After'] - data[f'{field}Before']
+
+    codes = np.concatenate([np.where(~found, 0, np.where(changed, 2, 3)), np.full(n_removed, 1)]).astype(np.int8)
+    frame = pd.DataFrame(data)
+    frame.insert(1, 'status', pd.Categorical.from_codes(codes, categories=FILE_STATUSES))
+    return frame
+
+
+def issue_keys(issues):
+    """Chave de cada issue: a `key` do SonarCloud ou, sem ela, arquivo + mensagem + ocorrência.
+
+    A ocorrência numera issues iguais no mesmo arquivo, então mudanças de
+    linha não contam como issue resolvida e reaberta.
+    """
+    keys = np.asarray(issues['key'], dtype=object).copy()
+    missing = pd.isna(keys)
+    if missing.any():
+        frame = issues.take(missing).to_frame(['component', 'message'])
+        occurrence = frame.groupby(['component', 'message'], dropna=False, sort=False).cumcount()
+        fallback = frame['component'].fillna('') + '\x1f' + frame['message'].fillna('') + '\x1f' + occurrence.astype(str)
+        keys[missing] = fallback.to_numpy(dtype=object)
+    return keys
+
+
+def issues_diff(before, after):
+    """(adicionadas, resolvidas): Columns com as issues que só existem no depois / no antes."""
+    before_keys = issue_keys(before)
+    after_keys = issue_keys(after)
+    # Índices de objetos: o isin das strings Arrow percorre os valores em Python
+    added = ~pd.Index(after_keys, dtype=object).isin(before_keys)
+    resolved = ~pd.Index(before_keys, dtype=object).isin(after_keys)
+    return after.take(added), before.take(resolved)
+
+
+class SnapshotDiff:
+    """Resultado da comparação de dois pontos (ver `diff_points`)."""
+
+    __slots__ = ('ratings', 'metrics', 'files', 'issues_added', 'issues_resolved', 'seconds')
+
+    def __init__(self, ratings, metrics, files=None, issues_added=None, issues_resolved=None):
+        self.ratings = ratings
+        self.metrics = metrics
+        self.files = files
+        self.issues_added = issues_added
+        self.issues_resolved = issues_resolved
+        self.seconds = 0.0
+
+    def file_counts(self):
+        """{status: quantidade de arquivos}; vazio sem dados por arquivo."""
+        if self.files is None:
+            return {}
+        return self.files['status'].value_counts().reindex(FILE_STATUSES, fill_value=0).to_dict()
+
+
+def diff_points(before, after):
+    """Compara dois PointData; arquivos e issues só quando os dois pontos os têm."""
+    ratings, metrics = metrics_diff(before.metrics, after.metrics)
+    files = None
+    if before.files is not None and after.files is not None:
+        files = files_diff(before.files, after.files)
+    added = resolved = None
+    if before.issues is not None and after.issues is not None:
+        added, resolved = issues_diff(before.issues, after.issues)
+    return SnapshotDiff(ratings, metrics, files, added, resolved)
+
+
+# Diffs por (projeto, ponto antes, ponto depois); descartados pelo orçamento de memória
+_diffs = memory.LRUPool('diffs')
+_diffs_lock = threading.Lock()
+
+
+def compare(project_id, before, after):
+    """Diff entre dois Points do projeto, calculado uma vez por par de chaves."""
+    key = (project_id, before.key, after.key)
+    with _diffs_lock:
+        cached = _diffs.get(key)
+    if cached is not None:
+        return cached
+
+    start = time.perf_counter()
+    result = diff_points(before.load(), after.load())
+    result.seconds = time.perf_counter() - start
+    with _diffs_lock:
+        _diffs.put(key, result)
+    return result
@@ -0,0 +1,234 @@
+# frontend/dora.py
+# Métricas DORA calculadas no frontend a partir dos deployments brutos
+#
+# Os deployments de /api/dora/deployments são buscados uma vez (cache SWR) e
+# convertidos em arrays ordenados pelo instante do deploy, com somas
+# prefixadas de contagem, falhas e lead time. Qualquer janela sai com duas
+# buscas binárias; só os percentis de lead time percorrem os deploys da janela.
+import os
+import threading
+
+import numpy as np
+
+import memory
+from api_client import reference_now
+
+# Período de deployments buscado do backend (limite das janelas disponíveis)
+DORA_HISTORY_DAYS = int(os.getenv("DORA_HISTORY_DAYS", "365"))
+# Percentis de lead time reportados
+LEAD_TIME_PERCENTILES = (50, 75, 90, 95)
+
+NS_PER_DAY = 86400 * 10**9
+NS_PER_MINUTE = 60 * 10**9
+
+
+# Classificações do backend (models/dora.js)
+
+def frequency_level(per_day):
+    if per_day >= 1:
+        return 'Elite'
+    if per_day >= 0.14:  # ~1 por semana
+        return 'High'
+    if per_day >= 0.03:  # ~1 por mês
+        return 'Medium'
+    return 'Low'
+
+
+def duration_level(minutes):
+    """Classificação de lead time e MTTR."""
+    if minutes <= 60:
+        return 'Elite'
+    if minutes <= 1440:
+        return 'High'
+    if minutes <= 10080:
+        return 'Medium'
+    return 'Low'
+
+
+def failure_rate_level(rate):
+    if rate <= 15:
+        return 'Elite'
+    if rate <= 30:
+        return 'High'
+    if rate <= 45:
+        return 'Medium'
+    return 'Low'
+
+
+def _prefix(values):
+    """Soma prefixada exclusiva (P[0] = 0)."""
+    return np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+
+
+class DeploymentLog:
+    """Deployments de um projeto em arrays ordenados, com consultas por janela.
+
+    A semântica segue o backend: lead time considera apenas deploys com
+    sucesso e o MTTR é a média dos intervalos entre falhas consecutivas da
+    janela.
+    """
+
+    def __init__(self, deployments):
+        import pandas as pd
+
+        deployments = deployments or []
+        timestamps = pd.to_datetime([d.get('deploymentTimestamp') for d in deployments], utc=True, errors='coerce')
+        timestamps = timestamps.as_unit('ns').asi8
+        known = timestamps != np.iinfo(np.int64).min  # NaT
+        order = np.argsort(timestamps[known], kind='stable')
+
+        statuses = np.array([d.get('status') for d in deployments], dtype=object)[known][order]
+        lead = pd.to_numeric(
+            pd.Series([d.get('leadTimeMinutes') for d in deployments], dtype=object), errors='coerce'
+        ).to_numpy(dtype=np.float64, na_value=np.nan)[known][order]
+
+        self.timestamps = timestamps[known][order]
+        self.failed = statuses == 'failure'
+        with_lead = (statuses == 'success') & ~np.isnan(lead)
+
+        self.failure_count = _prefix(self.failed)
+        # Lead time dos deploys com sucesso, na ordem dos deploys
+        self.lead_count = _prefix(with_lead)
+        self.lead_times = lead[with_lead]
+        self.lead_sum = _prefix(self.lead_times)
+        # Falhas: o MTTR de uma janela é (última - primeira) / (falhas - 1)
+        self.failure_times = self.timestamps[self.failed]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _bounds(self, start_ns, end_ns):
+        lo = np.searchsorted(self.timestamps, start_ns, side='left')
+        hi = np.searchsorted(self.timestamps, end_ns, side='right')
+        return lo, hi
+
+    def _window_now(self, days, end=None):
+        end_ns = _to_ns(end if end is not None else reference_now())
+        return end_ns - int(days * NS_PER_DAY), end_ns
+
+    def metrics(self, days=30, end=None):
+        """Métricas DORA dos `days` dias até `end` (padrão: agora), no formato de /api/dora/metrics."""
+        start_ns, end_ns = self._window_now(days, end)
+        lo, hi = (int(i) for i in self._bounds(start_ns, end_ns))
+        total = hi - lo
+        failures = int(self.failure_count[hi] - self.failure_count[lo])
+        leads = self.lead_times[int(self.lead_count[lo]):int(self.lead_count[hi])]
+
+        f_lo = int(np.searchsorted(self.failure_times, start_ns, side='left'))
+        f_hi = int(np.searchsorted(self.failure_times, end_ns, side='right'))
+        mttr = (self.failure_times[f_hi - 1] - self.failure_times[f_lo]) / NS_PER_MINUTE / (f_hi - f_lo - 1) if f_hi - f_lo > 1 else 0.0
+
+        per_day = round(total / days, 2) if days else 0
+        rate = round(100 * failures / total, 2) if total else 0
+        average = round(float(leads.mean()), 2) if len(leads) else 0
+        percentiles = np.percentile(leads, LEAD_TIME_PERCENTILES) if len(leads) else np.zeros(len(LEAD_TIME_PERCENTILES))
+        return {
+            'period': {
+                'days': days,
+                'firstDeployment': _isoformat(self.timestamps[lo]) if total else None,
+                'lastDeployment': _isoformat(self.timestamps[hi - 1]) if total else None,
+            },
+            'deploymentFrequency': {'total': total, 'perDay': per_day, 'description': frequency_level(per_day)},
+            'leadTime': {
+                'average': average,
+                'median': round(float(percentiles[0]), 2),
+                'percentiles': {f"p{p}": round(float(v), 2) for p, v in zip(LEAD_TIME_PERCENTILES, percentiles)},
+                'unit': 'minutes',
+                'description': duration_level(average),
+            },
+            'changeFailureRate': {
+                'rate': rate, 'failures': failures, 'total': total, 'description': failure_rate_level(rate)
+            },
+            'meanTimeToRestore': {
+                'average': round(float(mttr), 2), 'unit': 'minutes', 'description': duration_level(mttr)
+            },
+        }
+
+    def series(self, days=30, span_days=None, step_days=1, end=None, percentiles=True):
+        """Série móvel das métricas: uma linha a cada `step_days`, cada uma com a janela de `days` dias.
+
+        Contagens, taxa de falha, lead time médio e MTTR saem das somas
+        prefixadas para todos os pontos de uma vez; a mediana do lead time
+        (`percentiles=True`) é a única parte que percorre cada janela.
+        Retorna um DataFrame com as colunas timestamp, deploys, perDay,
+        changeFailureRate, leadTimeAverage, leadTimeMedian e mttr.
+        """
+        import pandas as pd
+
+        end_ns = _to_ns(end if end is not None else reference_now())
+        span_days = DORA_HISTORY_DAYS if span_days is None else span_days
+        steps = max(int(span_days // step_days), 1)
+        ends = end_ns - np.arange(steps)[::-1] * int(step_days * NS_PER_DAY)
+        starts = ends - int(days * NS_PER_DAY)
+
+        lo, hi = self._bounds(starts, ends)
+        total = hi - lo
+        failures = self.failure_count[hi] - self.failure_count[lo]
+        lead_lo, lead_hi = self.lead_count[lo].astype(np.int64), self.lead_count[hi].astype(np.int64)
+        lead_n = lead_hi - lead_lo
+        f_lo = np.searchsorted(self.failure_times, starts, side='left')
+        f_hi = np.searchsorted(self.failure_times, ends, side='right')
+        pairs = f_hi - f_lo - 1
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = np.where(total > 0, 100 * failures / total, 0.0)
+            lead_avg = np.where(lead_n > 0, (self.lead_sum[lead_hi] - self.lead_sum[lead_lo]) / lead_n, np.nan)
+            mttr = np.full(steps, np.nan)
+            if len(self.failure_times):
+                spans = self.failure_times[np.maximum(f_hi - 1, 0)] - self.failure_times[np.minimum(f_lo, len(self.failure_times) - 1)]
+                mttr = np.where(pairs > 0, spans / NS_PER_MINUTE / pairs, np.nan)
+
+        frame = {
+            'timestamp': pd.to_datetime(ends, unit='ns', utc=True),
+            'deploys': total,
+            'perDay': total / days,
+            'changeFailureRate': rate,
+            'leadTimeAverage': lead_avg,
+            'mttr': mttr,
+        }
+        if percentiles:
+            frame['leadTimeMedian'] = [
+                float(np.median(self.lead_times[a:b])) if b > a else np.nan for a, b in zip(lead_lo, lead_hi)
+            ]
+        return pd.DataFrame(frame)
+
+
+def _to_ns(moment):
+    import pandas as pd
+    return pd.Timestamp(moment).value
+
+
+def _isoformat(ns):
+    import pandas as pd
+    return pd.Timestamp(int(ns), tz='UTC').isoformat().replace('+00:00', 'Z')
+
+
+# ==========================================
+# LOG POR PROJETO
+# ==========================================
+
+# Logs por projeto; os usados há mais tempo são descartados pelo orçamento de memória
+_logs = memory.LRUPool('dora_logs')
+_logs_lock = threading.Lock()
+
+
+def _signature(payload):
+    """Identifica o conteúdo do payload sem percorrê-lo (o backend ordena do mais recente)."""
+    deployments = payload.get('deployments') or []
+    if not deployments:
+        return (0,)
+    first, last = deployments[0], deployments[-1]
+    return (len(deployments), first.get('id'), first.get('deploymentTimestamp'), last.get('id'), last.get('deploymentTimestamp'))
+
+
+def deployment_log(project_id, payload):
+    """DeploymentLog do payload de /dora/deployments, reconstruído só quando o payload muda."""
+    signature = _signature(payload or {})
+    with _logs_lock:
+        cached = _logs.get(project_id)
+        if cached and cached[0] == signature:
+            return cached[1]
+    log = DeploymentLog((payload or {}).get('deployments'))
+    with _logs_lock:
+        _logs.put(project_id, (signature, log))
+    return log
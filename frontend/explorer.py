@@ -0,0 +1,262 @@
+# frontend/explorer.py
+# Índice em memória dos dados por arquivo (complexidade, cobertura e issues)
+import bisect
+import threading
+
+import numpy as np
+import pandas as pd
+
+import memory
+from ingest import Columns
+
+# Colunas de /sonarcloud/complexity e /sonarcloud/coverage-by-file usadas no índice
+COMPLEXITY_FIELDS = ['complexity', 'cognitiveComplexity', 'linesOfCode', 'issues']
+COVERAGE_FIELDS = ['coverage', 'uncoveredLines', 'linesToCover']
+
+# Métricas por arquivo (rótulo exibido -> coluna)
+METRIC_LABELS = {
+    'Risco (complexidade × falta de cobertura)': 'risk',
+    'Complexidade Ciclomática': 'complexity',
+    'Complexidade Cognitiva': 'cognitiveComplexity',
+    'Linhas de Código': 'linesOfCode',
+    'Issues': 'issues',
+    'Linhas Não Cobertas': 'uncoveredLines',
+    'Cobertura (%)': 'coverage',
+}
+
+# Métricas que podem ser somadas nos agregados por diretório
+ADDITIVE_COLUMNS = ['risk', 'complexity', 'cognitiveComplexity', 'linesOfCode', 'issues', 'uncoveredLines', 'linesToCover']
+
+
+def risk_scores(complexity, coverage):
+    """Score de risco no estilo CRAP: c² · (1 − cobertura)³ + c.
+
+    Arquivos sem dado de cobertura (sem linhas testáveis) contam como cobertos.
+    """
+    uncovered = 1 - np.nan_to_num(coverage, nan=100.0) / 100
+    return complexity ** 2 * uncovered ** 3 + complexity
+
+
+class _Node:
+    """Diretório da trie; `start:end` é o intervalo dos seus arquivos no índice ordenado por caminho."""
+    __slots__ = ('children', 'start', 'end')
+
+    def __init__(self, start, end):
+        self.children = {}
+        self.start = start
+        self.end = end
+
+
+class HotspotIndex:
+    """Dados por arquivo ordenados por caminho, com trie de diretórios e prefix sums.
+
+    Como arquivos de um mesmo diretório são contíguos na ordem por caminho, cada
+    diretório vira um intervalo do índice: agregados saem das somas acumuladas
+    em O(1) e o top-K usa as ordens pré-calculadas de cada métrica.
+    """
+
+    def __init__(self, frame):
+        order = np.argsort(frame['path'].to_numpy(dtype=object), kind='stable')
+        frame = frame.iloc[order].reset_index(drop=True)
+
+        self.paths = frame['path'].tolist()
+        self.columns = {
+            column: frame[column].to_numpy(dtype=np.float32)
+            for column in COMPLEXITY_FIELDS + COVERAGE_FIELDS + ['risk']
+        }
+        self._prefix = {
+            column: np.concatenate(([0.0], np.cumsum(self.columns[column], dtype=np.float64)))
+            for column in ADDITIVE_COLUMNS
+        }
+        self._orders = {}
+        self._orders_lock = threading.Lock()
+
+        # Trie de diretórios
+        self.root = _Node(0, len(self.paths))
+        for i, path in enumerate(self.paths):
+            node = self.root
+            for part in path.split('/')[:-1]:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _Node(i, i + 1)
+                else:
+                    child.end = i + 1
+                node = child
+
+        # Busca por substring: todos os caminhos em uma string, com o início de cada linha
+        lowered = [path.lower() for path in self.paths]
+        self._haystack = '\n'.join(lowered)
+        self._offsets = []
+        position = 0
+        for path in lowered:
+            self._offsets.append(position)
+            position += len(path) + 1
+
+    @classmethod
+    def from_payloads(cls, complexity_data, coverage_data):
+        """Junta os componentes de complexidade e cobertura pelo caminho do arquivo."""
+        return cls(file_frame(complexity_data, coverage_data))
+
+    def __len__(self):
+        return len(self.paths)
+
+    # ------------------------------------------
+    # Diretórios
+    # ------------------------------------------
+
+    def directory(self, prefix=''):
+        """Nó da trie para um diretório ('' = raiz); None se não existir."""
+        node = self.root
+        for part in [p for p in prefix.strip('/').split('/') if p]:
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _range_sums(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.intp)
+        ends = np.asarray(ends, dtype=np.intp)
+        sums = {column: self._prefix[column][ends] - self._prefix[column][starts] for column in ADDITIVE_COLUMNS}
+        sums['files'] = ends - starts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sums['coverage'] = np.where(
+                sums['linesToCover'] > 0,
+                100 * (1 - sums['uncoveredLines'] / sums['linesToCover']),
+                np.nan
+            )
+        return sums
+
+    def rollup(self, prefix=''):
+        """Totais de um diretório (inclui subdiretórios); None se não existir."""
+        node = self.directory(prefix)
+        if node is None:
+            return None
+        sums = self._range_sums([node.start], [node.end])
+        summary = {column: float(values[0]) for column, values in sums.items()}
+        summary['files'] = int(summary['files'])
+        summary['maxComplexity'] = float(self.columns['complexity'][node.start:node.end].max()) if node.end > node.start else 0.0
+        return summary
+
+    def children(self, prefix=''):
+        """Agregados dos subdiretórios e arquivos imediatos de um diretório, por risco."""
+        node = self.directory(prefix)
+        if node is None:
+            return pd.DataFrame()
+
+        base = prefix.strip('/')
+        names, starts, ends, kinds = [], [], [], []
+        for name, child in node.children.items():
+            names.append(f"{base}/{name}/" if base else f"{name}/")
+            starts.append(child.start)
+            ends.append(child.end)
+            kinds.append('diretório')
+
+        # Arquivos diretamente no diretório: intervalo do nó fora dos intervalos dos filhos
+        direct = np.ones(node.end - node.start, dtype=bool)
+        for child in node.children.values():
+            direct[child.start - node.start:child.end - node.start] = False
+        for i in np.flatnonzero(direct) + node.start:
+            names.append(self.paths[i])
+            starts.append(i)
+            ends.append(i + 1)
+            kinds.append('arquivo')
+
+        df = pd.DataFrame({'path': names, 'kind': kinds, **self._range_sums(starts, ends)})
+        return df.sort_values('risk', ascending=False, ignore_index=True)
+
+    # ------------------------------------------
+    # Consultas por arquivo
+    # ------------------------------------------
+
+    def _order(self, column, ascending):
+        """Índices ordenados pela métrica (sem NaN), calculados uma vez por métrica."""
+        key = (column, ascending)
+        order = self._orders.get(key)
+        if order is None:
+            values = self.columns[column]
+            order = np.argsort(values if ascending else -values, kind='stable')
+            order = order[~np.isnan(values[order])]
+            with self._orders_lock:
+                self._orders[key] = order
+        return order
+
+    def top(self, column, k=10, prefix='', ascending=False):
+        """Os K arquivos com maior (ou menor) valor da métrica dentro de um diretório."""
+        node = self.directory(prefix)
+        if node is None:
+            return self.frame([])
+        order = self._order(column, ascending)
+        if node is not self.root:
+            order = order[(order >= node.start) & (order < node.end)]
+        return self.frame(order[:k])
+
+    def risk_ranking(self, k=20, prefix=''):
+        """Arquivos com maior complexidade e menor cobertura primeiro."""
+        return self.top('risk', k, prefix)
+
+    def search(self, text, limit=100):
+        """Arquivos cujo caminho contém `text` (sem diferenciar maiúsculas), em ordem de caminho."""
+        needle = text.strip().lower()
+        if not needle or '\n' in needle:
+            return self.frame([])
+
+        hits = []
+        position = self._haystack.find(needle)
+        while position != -1 and len(hits) < limit:
+            i = bisect.bisect_right(self._offsets, position) - 1
+            hits.append(i)
+            if i + 1 >= len(self._offsets):
+                break
+            position = self._haystack.find(needle, self._offsets[i + 1])
+        return self.frame(hits)
+
+    def frame(self, indices):
+        """DataFrame com os arquivos nas posições `indices`."""
+        indices = np.asarray(indices, dtype=np.intp)
+        data = {'path': [self.paths[i] for i in indices]}
+        for column, values in self.columns.items():
+            data[column] = values[indices]
+        return pd.DataFrame(data)
+
+
+def file_frame(complexity_data, coverage_data):
+    """Uma linha por arquivo (coluna 'path') com as métricas de complexidade, cobertura e o risco."""
+    complexity = _components_frame(complexity_data, COMPLEXITY_FIELDS)
+    coverage = _components_frame(coverage_data, COVERAGE_FIELDS)
+    frame = complexity.merge(coverage, on='path', how='outer')
+
+    counts = ['complexity', 'cognitiveComplexity', 'linesOfCode', 'issues', 'uncoveredLines', 'linesToCover']
+    frame[counts] = frame[counts].fillna(0)
+    frame['risk'] = risk_scores(frame['complexity'].to_numpy(np.float64), frame['coverage'].to_numpy(np.float64))
+    return frame
+
+
+def _components_frame(payload, fields):
+    components = (payload or {}).get('components') or []
+    if isinstance(components, Columns):
+        df = components.to_frame(['path', 'name', *fields])
+    else:
+        df = pd.DataFrame.from_records(components, columns=['path', 'name', *fields])
+    df['path'] = df['path'].fillna(df['name'])
+    df = df.drop(columns='name').dropna(subset=['path']).drop_duplicates('path')
+    df[fields] = df[fields].apply(pd.to_numeric, errors='coerce')
+    return df
+
+
+# Índices por projeto; os usados há mais tempo são descartados pelo orçamento de memória
+_indexes = memory.LRUPool('explorer_indexes')
+_indexes_lock = threading.Lock()
+
+
+def get_hotspot_index(project_id, complexity_data, coverage_data):
+    """Retorna o índice do projeto, reaproveitando-o enquanto os payloads forem os mesmos."""
+    with _indexes_lock:
+        cached = _indexes.get(project_id)
+    if cached and cached[0] is complexity_data and cached[1] is coverage_data:
+        return cached[2]
+
+    index = HotspotIndex.from_payloads(complexity_data, coverage_data)
+    with _indexes_lock:
+        # Os payloads pertencem ao cache SWR: conta-se apenas o índice
+        _indexes.put(project_id, (complexity_data, coverage_data, index), size=memory.sizeof(index))
+    return index
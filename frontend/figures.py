@@ -0,0 +1,420 @@
+# frontend/figures.py
+# Construção dos gráficos Plotly das páginas, com cache por conteúdo dos dados
+#
+# plotly.express (que também carrega NumPy) é importado só pelos gráficos que
+# o usam; a página inicial precisa apenas de plotly.graph_objects.
+import functools
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import instrumentation
+import memory
+
+# Memória máxima ocupada pelas figuras em cache (estimada pelas propriedades dos traces e do layout)
+FIGURE_CACHE_MAX_MB = float(os.getenv("FIGURE_CACHE_MAX_MB", "64"))
+
+
+class FigureCache:
+    """LRU de figuras prontas, indexado pelo hash do conteúdo dos argumentos.
+
+    As figuras são compartilhadas entre reruns e sessões e devem ser tratadas
+    como somente leitura (o st.plotly_chart apenas as serializa).
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, figure):
+        size = figure_bytes(figure)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (figure, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def shrink(self, nbytes):
+        """Descarta as figuras menos usadas até liberar `nbytes` (orçamento global de memória)."""
+        freed = 0
+        with self._lock:
+            while self._entries and freed < nbytes:
+                _, (_, size) = self._entries.popitem(last=False)
+                freed += size
+            self.total_bytes -= freed
+        return freed
+
+    def usage(self):
+        stats = self.stats()
+        return {'entries': stats['entries'], 'bytes': stats['bytes'], 'maxBytes': stats['maxBytes']}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'maxBytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+def figure_bytes(figure):
+    """Memória estimada de uma figura, sem serializá-la.
+
+    Mede as propriedades já validadas dos traces e do layout (`_data` e
+    `_layout`): arrays pelo tamanho dos buffers, listas longas por amostragem.
+    O `to_json()` custaria uma serialização completa a cada figura nova.
+    """
+    return memory.sizeof((figure._data, figure._layout))
+
+
+_figures = FigureCache(int(FIGURE_CACHE_MAX_MB * 1024 * 1024))
+memory.register('figures', _figures)
+
+
+def _update_digest(digest, value):
+    """Alimenta o hash com o conteúdo de `value` (DataFrames, arrays e estruturas simples)."""
+    # Sem pandas/NumPy carregados, `value` não pode ser um DataFrame ou array
+    pd = sys.modules.get('pandas')
+    np = sys.modules.get('numpy')
+    if pd is not None and isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(t) for t in value.dtypes], value.shape)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif pd is not None and isinstance(value, pd.Series):
+        digest.update(repr((value.name, str(value.dtype), len(value))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif np is not None and isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(value.tobytes() if value.dtype != object else repr(value.tolist()).encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            _update_digest(digest, item)
+            digest.update(b',')
+        digest.update(b']')
+    elif isinstance(value, dict):
+        digest.update(b'{')
+        for name in sorted(value, key=repr):
+            _update_digest(digest, name)
+            digest.update(b':')
+            _update_digest(digest, value[name])
+            digest.update(b',')
+        digest.update(b'}')
+    else:
+        digest.update(f"{type(value).__name__}:{value!r}".encode())
+
+
+def content_key(name, args, kwargs):
+    digest = hashlib.blake2b(name.encode(), digest_size=16)
+    _update_digest(digest, list(args))
+    _update_digest(digest, kwargs)
+    return digest.hexdigest()
+
+
+def cached_figure(builder):
+    """Decorator que reaproveita a figura quando os dados e parâmetros são os mesmos."""
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        key = content_key(builder.__qualname__, args, kwargs)
+        figure = _figures.get(key)
+        hit = figure is not None
+        if not hit:
+            figure = builder(*args, **kwargs)
+            _figures.set(key, figure)
+        instrumentation.record_figure(builder.__name__, hit, time.perf_counter() - start)
+        return figure
+    return wrapper
+
+
+def clear_figure_cache():
+    _figures.clear()
+
+
+def figure_cache_stats():
+    return _figures.stats()
+
+
+# ==========================================
+# GRÁFICOS
+# ==========================================
+
+# Marcadores dos eventos de tendência: (tipo, símbolo, cor)
+TREND_EVENT_MARKERS = [
+    ('regressão', 'triangle-up', '#d62728'),
+    ('melhora', 'triangle-down', '#2ca02c'),
+    ('anomalia', 'x', '#ff7f0e'),
+]
+
+@cached_figure
+def radar_figure(dimensions, scores):
+    """Radar das 5 dimensões de qualidade com a linha de referência (ideal = 100)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=scores,
+        theta=dimensions,
+        fill='toself',
+        name='Score Atual',
+        line=dict(color='#2575FC', width=2),
+        fillcolor='rgba(37, 117, 252, 0.3)'
+    ))
+
+    fig.add_trace(go.Scatterpolar(
+        r=[100] * len(dimensions),
+        theta=dimensions,
+        fill='toself',
+        name='Meta Ideal',
+        line=dict(color='#10B981', width=1, dash='dash'),
+        fillcolor='rgba(16, 185, 129, 0.1)'
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100],
+                tickmode='linear',
+                tick0=0,
+                dtick=25,
+                showticklabels=True,
+                ticks='outside'
+            )
+        ),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5
+        ),
+        height=500,
+        title=dict(
+            text="Análise de Qualidade do Software",
+            font=dict(size=18)
+        )
+    )
+    return fig
+
+
+@cached_figure
+def effort_pie_figure(debt_ratio):
+    """Pizza de esforço produtivo vs. pagamento de dívida técnica."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Pie(
+        labels=['Esforço Produtivo', 'Pagamento de Dívida'],
+        values=[100 - debt_ratio, debt_ratio],
+        hole=.4,
+        marker_colors=['#2575FC', '#FFB000'],
+        textfont=dict(size=16)
+    )])
+    fig.update_layout(
+        legend_title_text='Tipo de Esforço',
+        height=400,
+        font=dict(size=14),
+        legend=dict(font=dict(size=14))
+    )
+    return fig
+
+
+@cached_figure
+def quality_score_figure(df_scores, labels):
+    """Evolução do índice de qualidade (linha principal) e dos scores de cada dimensão.
+
+    `labels` mapeia as colunas de `df_scores` para os nomes exibidos; a
+    coluna 'qualityIndex' é destacada.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for column, label in labels.items():
+        if column not in df_scores:
+            continue
+        main = column == 'qualityIndex'
+        fig.add_trace(go.Scatter(
+            x=df_scores['timestamp'], y=df_scores[column], mode='lines', name=label,
+            line=dict(width=3 if main else 1.5, color='#2575FC' if main else None),
+            opacity=1 if main else 0.6,
+        ))
+    fig.update_layout(
+        height=400,
+        title=dict(text="Evolução dos Scores de Qualidade", font=dict(size=18)),
+        yaxis=dict(range=[0, 105], title='Score'),
+        xaxis=dict(title='Período'),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+    )
+    return fig
+
+
+@cached_figure
+def debt_trend_figure(df_trend, df_events=None):
+    """Linha da dívida técnica acumulada (em horas) ao longo do tempo.
+
+    Se `df_trend` tiver a coluna 'rollingMean', ela é desenhada como média móvel;
+    `df_events` (timestamp, technicalDebtHours, kind) marca anomalias e
+    pontos de mudança sobre a linha.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    fig = px.line(
+        df_trend,
+        x='timestamp',
+        y='technicalDebtHours',
+        title="Evolução da Dívida Técnica",
+        labels={'timestamp': 'Período', 'technicalDebtHours': 'Dívida (horas)'},
+        markers=True
+    )
+    if 'rollingMean' in df_trend:
+        fig.add_trace(go.Scatter(
+            x=df_trend['timestamp'], y=df_trend['rollingMean'], mode='lines',
+            name='Média móvel (24h)', line=dict(dash='dot', color='gray')
+        ))
+    if df_events is not None and not df_events.empty:
+        for kind, symbol, color in TREND_EVENT_MARKERS:
+            events = df_events[df_events['kind'] == kind]
+            if not events.empty:
+                fig.add_trace(go.Scatter(
+                    x=events['timestamp'], y=events['technicalDebtHours'], mode='markers', name=kind.capitalize(),
+                    marker=dict(symbol=symbol, size=13, color=color, line=dict(width=1, color='black'))
+                ))
+    fig.update_layout(
+        height=400,
+        font=dict(size=14),
+        title_font_size=18,
+        xaxis=dict(title_font_size=16, tickfont=dict(size=13)),
+        yaxis=dict(title_font_size=16, tickfont=dict(size=13))
+    )
+    return fig
+
+
+@cached_figure
+def dora_trend_figure(df_dora):
+    """Séries móveis das métricas DORA: deploys por dia, taxa de falha, lead time e MTTR (em horas)."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    panels = [
+        ('perDay', 'Deploys por dia', 1),
+        ('changeFailureRate', 'Taxa de falha (%)', 1),
+        ('leadTimeMedian', 'Lead time mediano (h)', 60),
+        ('mttr', 'MTTR (h)', 60),
+    ]
+    fig = make_subplots(rows=1, cols=len(panels), subplot_titles=[title for _, title, _ in panels])
+    for col, (column, title, divisor) in enumerate(panels, start=1):
+        if column not in df_dora:
+            continue
+        fig.add_trace(
+            go.Scatter(x=df_dora['timestamp'], y=df_dora[column] / divisor, mode='lines', name=title, connectgaps=False),
+            row=1, col=col
+        )
+    fig.update_layout(height=320, showlegend=False, font=dict(size=13), margin=dict(t=50, b=30))
+    return fig
+
+
+@cached_figure
+def complexity_bar_figure(df_complexity):
+    """Barras horizontais de complexidade ciclomática por arquivo."""
+    import plotly.express as px
+
+    fig = px.bar(
+        df_complexity,
+        x='complexity',
+        y='name',
+        orientation='h',
+        title='Complexidade por Arquivo',
+        labels={'complexity': 'Complexidade Ciclomática', 'name': 'Arquivo'},
+        color='complexity',
+        color_continuous_scale='Reds'
+    )
+    fig.update_layout(
+        height=400,
+        showlegend=False,
+        font=dict(size=14),
+        title_font_size=18,
+        xaxis=dict(title_font_size=16),
+        yaxis=dict(title_font_size=16, tickfont=dict(size=13))
+    )
+    return fig
+
+
+@cached_figure
+def coverage_bar_figure(df_coverage):
+    """Barras horizontais de linhas não cobertas por arquivo, coloridas pela cobertura."""
+    import plotly.express as px
+
+    fig = px.bar(
+        df_coverage,
+        x='uncoveredLines',
+        y='name',
+        orientation='h',
+        title='Top 10 Arquivos com Mais Linhas Não Cobertas',
+        labels={'uncoveredLines': 'Linhas Não Cobertas', 'name': 'Arquivo'},
+        color='coverage',
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(
+        height=400,
+        font=dict(size=14),
+        title_font_size=18,
+        xaxis=dict(title_font_size=16),
+        yaxis=dict(title_font_size=16, tickfont=dict(size=13))
+    )
+    return fig
+
+
+@cached_figure
+def score_heatmap_figure(scores, dimensions, names):
+    """Mapa de calor projetos × dimensões de qualidade (scores 0-100)."""
+    import plotly.express as px
+
+    fig = px.imshow(
+        scores,
+        x=dimensions,
+        y=names,
+        zmin=0,
+        zmax=100,
+        color_continuous_scale='RdYlGn',
+        aspect='auto',
+        text_auto='.0f',
+        labels={'color': 'Score'}
+    )
+    fig.update_layout(
+        height=max(300, 28 * len(names) + 120),
+        font=dict(size=14),
+        xaxis=dict(side='top')
+    )
+    return fig
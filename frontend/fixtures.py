@@ -0,0 +1,244 @@
+# frontend/fixtures.py
+# Fixtures no formato da API do backend: dados gravados (backend/data) e geradores sintéticos
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+# Dados de exemplo do backend usados como semente das fixtures
+BACKEND_DATA_DIR = os.getenv(
+    "FIXTURES_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'data')
+)
+
+SEVERITIES = ['BLOCKER', 'CRITICAL', 'MAJOR', 'MINOR']
+RATINGS = ['1.0', '2.0', '3.0', '4.0', '5.0']
+
+
+def _isoformat(value):
+    return value.isoformat().replace('+00:00', 'Z')
+
+
+# ==========================================
+# GERADORES SINTÉTICOS
+# ==========================================
+
+def _directory(rng, depth=3):
+    return '/'.join(f"pkg{rng.randint(0, 20)}" for _ in range(rng.randint(1, depth)))
+
+
+def file_paths(files, seed=0):
+    """Caminhos de arquivo compartilhados por complexity, coverage e new_code_issues."""
+    rng = random.Random(f"paths-{seed}")
+    return [f"{_directory(rng)}/file{i}.py" for i in range(files)]
+
+
+def latest_metrics(seed=0, timestamp=None):
+    """Snapshot no formato de /api/metrics/latest."""
+    rng = random.Random(seed)
+    debt = rng.randint(100, 20000)
+    return {
+        'timestamp': _isoformat(timestamp or datetime.now(timezone.utc)),
+        'projectKey': f"project_{seed}",
+        'reliability': {'bugs': rng.randint(0, 80), 'rating': rng.choice(RATINGS), 'remediationEffort': rng.randint(0, 500)},
+        'security': {'vulnerabilities': rng.randint(0, 20), 'rating': rng.choice(RATINGS), 'remediationEffort': rng.randint(0, 200)},
+        'maintainability': {
+            'codeSmells': rng.randint(0, 2000),
+            'technicalDebt': debt,
+            'debtRatio': round(rng.uniform(0, 15), 1),
+            'rating': rng.choice(RATINGS)
+        },
+        'coverage': {'overall': round(rng.uniform(0, 100), 1), 'new': round(rng.uniform(0, 100), 1)},
+        'duplication': {'density': round(rng.uniform(0, 30), 1)},
+        'size': {'linesOfCode': rng.randint(1000, 500000), 'complexity': rng.randint(100, 50000)},
+        'newCode': {'bugs': rng.randint(0, 5), 'vulnerabilities': rng.randint(0, 3), 'codeSmells': rng.randint(0, 40)},
+        'overallRating': rng.choice(RATINGS),
+        'technicalDebtMinutes': debt
+    }
+
+
+def metrics_history(points=10000, interval_minutes=10, seed=0):
+    """Histórico no formato de /api/metrics/history (mais recente primeiro)."""
+    now = datetime.now(timezone.utc)
+    return [
+        latest_metrics(seed + i, timestamp=now - timedelta(minutes=interval_minutes * i))
+        for i in range(points)
+    ]
+
+
+def dora_metrics(seed=0):
+    """Métricas agregadas no formato de /api/dora/metrics."""
+    rng = random.Random(seed)
+    total = rng.randint(0, 200)
+    failures = rng.randint(0, total)
+    return {
+        'projectKey': f"project_{seed}",
+        'deploymentFrequency': {'total': total, 'perDay': round(total / 30, 2)},
+        'leadTime': {'average': round(rng.uniform(1, 5000), 2), 'median': round(rng.uniform(1, 3000), 2), 'unit': 'minutes'},
+        'changeFailureRate': {'rate': round(100 * failures / total, 2) if total else 0, 'failures': failures, 'total': total},
+        'meanTimeToRestore': {'average': round(rng.uniform(0, 3000), 2), 'unit': 'minutes'}
+    }
+
+
+def deployments(count=500, days=90, seed=0):
+    """Deployments no formato de /api/dora/deployments (mais recente primeiro)."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        deployed = now - timedelta(minutes=rng.uniform(0, days * 1440))
+        lead = rng.randint(1, 5000)
+        rows.append({
+            'id': i,
+            'projectKey': f"project_{seed}",
+            'commitSha': f"{rng.getrandbits(40):010x}",
+            'commitTimestamp': _isoformat(deployed - timedelta(minutes=lead)),
+            'deploymentTimestamp': _isoformat(deployed),
+            'environment': 'production',
+            'status': 'failure' if rng.random() < 0.15 else 'success',
+            'branch': 'main',
+            'leadTimeMinutes': lead
+        })
+    rows.sort(key=lambda d: d['deploymentTimestamp'], reverse=True)
+    return {'count': len(rows), 'deployments': rows}
+
+
+def new_code_issues(count=5000, seed=0, files=2000):
+    """Issues no formato de /api/sonarcloud/new-code-issues."""
+    rng = random.Random(seed)
+    paths = file_paths(files, seed)
+    grouped = {'bugs': [], 'vulnerabilities': [], 'codeSmells': [], 'byFile': {}}
+    kinds = [('BUG', 'bugs', 0.1), ('VULNERABILITY', 'vulnerabilities', 0.05), ('CODE_SMELL', 'codeSmells', 0.85)]
+    for i in range(count):
+        pick = rng.random()
+        for issue_type, group, weight in kinds:
+            if pick < weight:
+                break
+            pick -= weight
+        component = rng.choice(paths)
+        issue = {
+            'key': f"issue-{i}",
+            'type': issue_type,
+            'severity': rng.choice(SEVERITIES),
+            'message': f"Refactor this function to reduce its Cognitive Complexity from {rng.randint(16, 80)} to the 15 allowed.",
+            'component': component,
+            'line': rng.randint(1, 2000),
+            'status': 'OPEN',
+            'effort': f"{rng.randint(1, 60)}min",
+            'creationDate': '2025-10-20T10:00:00+0000',
+            'tags': []
+        }
+        grouped[group].append(issue)
+        grouped['byFile'].setdefault(component, []).append(issue)
+    return {
+        'total': count,
+        'totalBugs': len(grouped['bugs']),
+        'totalVulnerabilities': len(grouped['vulnerabilities']),
+        'totalCodeSmells': len(grouped['codeSmells']),
+        'issues': grouped
+    }
+
+
+def complexity(files=20000, seed=0):
+    """Complexidade por arquivo no formato de /api/sonarcloud/complexity."""
+    rng = random.Random(seed)
+    components = []
+    for path in file_paths(files, seed):
+        loc = rng.randint(5, 3000)
+        value = rng.randint(1, max(2, loc // 4))
+        components.append({
+            'name': path.rsplit('/', 1)[-1],
+            'path': path,
+            'complexity': value,
+            'cognitiveComplexity': rng.randint(0, value * 2),
+            'linesOfCode': loc,
+            'issues': rng.randint(0, value // 10),
+            'complexityDensity': round(value / loc, 2)
+        })
+    components.sort(key=lambda c: c['complexity'], reverse=True)
+    total = sum(c['complexity'] for c in components)
+    return {
+        'components': components,
+        'stats': {
+            'totalComponents': len(components),
+            'totalComplexity': total,
+            'avgComplexity': round(total / len(components)) if components else 0,
+            'maxComplexity': components[0]['complexity'] if components else 0,
+            'hotspots': components[:10]
+        }
+    }
+
+
+def coverage(files=20000, seed=0):
+    """Cobertura por arquivo no formato de /api/sonarcloud/coverage-by-file."""
+    rng = random.Random(seed)
+    components = []
+    for path in file_paths(files, seed):
+        to_cover = rng.randint(1, 1500)
+        uncovered = rng.randint(0, to_cover)
+        value = round(100 * (to_cover - uncovered) / to_cover, 1)
+        components.append({
+            'name': path.rsplit('/', 1)[-1],
+            'path': path,
+            'coverage': value,
+            'lineCoverage': value,
+            'uncoveredLines': uncovered,
+            'linesToCover': to_cover
+        })
+    components.sort(key=lambda c: c['coverage'])
+    return {'components': components, 'worstCoverage': components[:10]}
+
+
+# ==========================================
+# FIXTURES SEMEADAS PELOS DADOS DO BACKEND
+# ==========================================
+
+def load_recorded(name):
+    """Lê um JSON de backend/data (ex.: 'metrics.json'); retorna None se não existir."""
+    path = os.path.join(BACKEND_DATA_DIR, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def seeded_history(points, interval_minutes=10):
+    """Histórico com os snapshots de metrics.json repetidos e re-datados até `now`.
+
+    Sem o arquivo, recorre ao gerador sintético. Retorna do mais recente para o
+    mais antigo, como a API.
+    """
+    recorded = load_recorded('metrics.json')
+    if not recorded:
+        return metrics_history(points, interval_minutes)
+
+    now = datetime.now(timezone.utc)
+    history = []
+    for i in range(points):
+        snapshot = dict(recorded[-1 - (i % len(recorded))])
+        snapshot['timestamp'] = _isoformat(now - timedelta(minutes=interval_minutes * i))
+        history.append(snapshot)
+    return history
+
+
+def seeded_deployments(count, days=90):
+    """Deployments de dora-metrics.json replicados ao longo de `days` dias (mais recente primeiro)."""
+    recorded = load_recorded('dora-metrics.json')
+    if not recorded:
+        return deployments(count, days)['deployments']
+
+    now = datetime.now(timezone.utc)
+    step = timedelta(minutes=days * 1440 / max(count, 1))
+    rows = []
+    for i in range(count):
+        base = recorded[i % len(recorded)]
+        deployed = now - step * i
+        lead = base.get('leadTimeMinutes') or 0
+        rows.append({
+            **base,
+            'id': i,
+            'commitSha': f"{base.get('commitSha', 'fixture')}-{i}",
+            'commitTimestamp': _isoformat(deployed - timedelta(minutes=lead)),
+            'deploymentTimestamp': _isoformat(deployed),
+        })
+    return rows
@@ -0,0 +1,377 @@
+# frontend/history.py
+# Histórico de métricas mantido em memória e atualizado de forma incremental
+import math
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+import memory
+import ratings
+from analytics import TrendAnalytics
+from api_client import api_get, reference_now
+from cache import get_ttl
+
+# Colunas numéricas extraídas de cada snapshot: (coluna, caminho no payload da API)
+NUMERIC_FIELDS = [
+    ('bugs', ('reliability', 'bugs')),
+    ('vulnerabilities', ('security', 'vulnerabilities')),
+    ('codeSmells', ('maintainability', 'codeSmells')),
+    ('debtRatio', ('maintainability', 'debtRatio')),
+    ('coverage', ('coverage', 'overall')),
+    ('duplication', ('duplication', 'density')),
+    ('linesOfCode', ('size', 'linesOfCode')),
+    ('complexity', ('size', 'complexity')),
+    ('technicalDebtMinutes', ('technicalDebtMinutes',)),
+]
+
+# Colunas de rating (A-E), armazenadas como códigos int8 (0 = sem dado)
+RATING_FIELDS = [
+    ('reliabilityRating', ('reliability', 'rating')),
+    ('securityRating', ('security', 'rating')),
+    ('maintainabilityRating', ('maintainability', 'rating')),
+    ('overallRating', ('overallRating',)),
+]
+
+RATING_CATEGORIES = ['A', 'B', 'C', 'D', 'E']
+
+# Scores do radar e índice composto, materializados por snapshot na ingestão (float32)
+SCORE_FIELDS = ratings.QUALITY_DIMENSIONS + ['qualityIndex']
+
+
+def _extract(snapshot, path):
+    value = snapshot
+    for part in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def flatten_snapshots(snapshots):
+    """Converte snapshots da API em colunas tipadas (NumPy), ordenadas por timestamp.
+
+    Retorna um dicionário com 'timestamp' (int64, ns desde epoch UTC), as
+    colunas numéricas em float32, os ratings como códigos int8 e os scores
+    de qualidade (SCORE_FIELDS) em float32.
+    """
+    timestamps = pd.to_datetime([s['timestamp'] for s in snapshots], utc=True)
+    columns = {'timestamp': timestamps.as_unit('ns').asi8}
+    for name, path in NUMERIC_FIELDS:
+        raw = pd.Series([_extract(s, path) for s in snapshots], dtype=object)
+        columns[name] = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)
+    for name, path in RATING_FIELDS:
+        columns[name] = ratings.rating_codes([_extract(s, path) for s in snapshots])
+
+    columns.update(ratings.quality_scores(
+        columns['reliabilityRating'], columns['securityRating'], columns['maintainabilityRating'],
+        columns['coverage'], columns['duplication'],
+    ))
+
+    order = np.argsort(columns['timestamp'], kind='stable')
+    return {name: values[order] for name, values in columns.items()}
+
+
+class _Column:
+    """Array NumPy com crescimento amortizado para anexar dados.
+
+    O descarte do início só avança um deslocamento; o espaço é recuperado
+    quando o array precisa crescer, então nenhum refresh copia o histórico todo.
+    """
+
+    def __init__(self, dtype):
+        self.data = np.empty(64, dtype=dtype)
+        self.start = 0
+        self.end = 0
+
+    @property
+    def size(self):
+        return self.end - self.start
+
+    def extend(self, values):
+        needed = self.end + len(values)
+        if needed > len(self.data):
+            live = self.size
+            grown = np.empty(max(live + len(values), 2 * live, 64), dtype=self.data.dtype)
+            grown[:live] = self.data[self.start:self.end]
+            self.data, self.start, self.end = grown, 0, live
+            needed = self.end + len(values)
+        self.data[self.end:needed] = values
+        self.end = needed
+
+    def drop_head(self, count):
+        self.start += count
+
+    def view(self):
+        return self.data[self.start:self.end]
+
+
+class HistoryStore:
+    """Histórico de um projeto em buffer colunar, buscando só snapshots novos.
+
+    A primeira carga busca a janela completa; as seguintes pedem ao backend
+    apenas registros com timestamp maior que o último já armazenado (parâmetro
+    `since`), com a janela `hours` reduzida ao intervalo desde esse registro
+    para que backends sem suporte a `since` também retornem pouco.
+    """
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.loaded_hours = 0
+        self.last_refresh = 0.0
+        # Incrementado a cada alteração do buffer (remedição pelo pool de memória)
+        self.version = 0
+        self._lock = threading.Lock()
+        self.analytics = TrendAnalytics()
+        self._reset()
+
+    def _reset(self):
+        self.version += 1
+        self.columns = {'timestamp': _Column(np.int64)}
+        for name, _ in NUMERIC_FIELDS:
+            self.columns[name] = _Column(np.float32)
+        for name, _ in RATING_FIELDS:
+            self.columns[name] = _Column(np.int8)
+        for name in SCORE_FIELDS:
+            self.columns[name] = _Column(np.float32)
+        self.analytics.reset()
+
+    @property
+    def last_timestamp(self):
+        """Último timestamp armazenado (datetime UTC) ou None."""
+        timestamps = self.columns['timestamp'].view()
+        if not len(timestamps):
+            return None
+        return pd.Timestamp(int(timestamps[-1]), tz='UTC').to_pydatetime()
+
+    def __len__(self):
+        return self.columns['timestamp'].size
+
+    def append(self, snapshots):
+        """Anexa snapshots mais novos que o último armazenado, em ordem cronológica."""
+        if not snapshots:
+            return 0
+        batch = flatten_snapshots(snapshots)
+
+        timestamps = batch['timestamp']
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[1:] = timestamps[1:] != timestamps[:-1]  # descarta duplicados no lote
+        stored = self.columns['timestamp'].view()
+        if len(stored):
+            keep &= timestamps > stored[-1]
+
+        self.version += 1
+        for name, column in self.columns.items():
+            column.extend(batch[name][keep])
+        self.analytics.extend(timestamps[keep], {field: batch[field][keep] for field in self.analytics.fields})
+        return int(keep.sum())
+
+    def _trim(self, hours):
+        cutoff = pd.Timestamp(reference_now()).value - int(hours * 3600 * 1e9)
+        start = int(np.searchsorted(self.columns['timestamp'].view(), cutoff, side='left'))
+        if start:
+            self.version += 1
+            for column in self.columns.values():
+                column.drop_head(start)
+            self.analytics.drop_head(start, int(self.columns['timestamp'].view()[0]) if len(self) else cutoff)
+
+    def refresh(self, hours=168):
+        """Atualiza o buffer se o intervalo de revalidação expirou ou a janela aumentou."""
+        with self._lock:
+            soft_ttl, _ = get_ttl('metrics_history')
+            needs_backfill = hours > self.loaded_hours
+            if not needs_backfill and time.time() - self.last_refresh < soft_ttl:
+                return
+
+            params = {'project': self.project_id, 'hours': hours}
+            if not needs_backfill and self.last_timestamp is not None:
+                elapsed = reference_now() - self.last_timestamp
+                params['hours'] = min(hours, math.ceil(elapsed.total_seconds() / 3600) + 1)
+                params['since'] = self.last_timestamp.isoformat().replace('+00:00', 'Z')
+
+            try:
+                snapshots = api_get("/metrics/history", params=params)
+            except requests.exceptions.RequestException:
+                return  # mantém os dados já carregados
+
+            if needs_backfill:
+                # Janela maior que a carregada: recomeça o buffer com a janela completa
+                self._reset()
+                self.loaded_hours = hours
+            self.append(snapshots or [])
+            self._trim(self.loaded_hours)
+            self.last_refresh = time.time()
+
+    def expire(self):
+        """Força a próxima chamada de `refresh` a buscar os snapshots novos."""
+        with self._lock:
+            self.last_refresh = 0.0
+
+    def trends(self, hours=168):
+        """Resumo de tendências das últimas `hours` e os eventos (anomalias/mudanças) do período.
+
+        Retorna (linhas do resumo, {campo: [(timestamp, tipo, valor)]}). Usa as
+        somas prefixadas mantidas a cada `append`, sem percorrer o histórico.
+        """
+        with self._lock:
+            timestamps = self.columns['timestamp'].view()
+            now_ns = pd.Timestamp(reference_now()).value
+            columns = {field: self.columns[field].view() for field in self.analytics.fields}
+            rows = self.analytics.summary(timestamps, columns, hours, now_ns)
+            start_ns = now_ns - int(hours * 3600 * 1e9)
+            events = {field: self.analytics.events(field, start_ns) for field in self.analytics.fields}
+        return rows, events
+
+    def row_at(self, moment, fields=None):
+        """Último snapshot até `moment`: (timestamp UTC, {coluna: valor}) ou None.
+
+        Ratings saem como códigos (0 = sem dado, 1..5 = A..E); `fields` limita as colunas.
+        """
+        with self._lock:
+            timestamps = self.columns['timestamp'].view()
+            position = int(np.searchsorted(timestamps, pd.Timestamp(moment).value, side='right')) - 1
+            if position < 0:
+                return None
+            names = [name for name in self.columns if name != 'timestamp'] if fields is None else fields
+            values = {name: self.columns[name].view()[position].item() for name in names}
+            return pd.Timestamp(int(timestamps[position]), tz='UTC').to_pydatetime(), values
+
+    def scores_at(self, moment):
+        """Scores materializados do último snapshot até `moment`: (timestamp UTC, {campo: score}) ou None."""
+        return self.row_at(moment, SCORE_FIELDS)
+
+    def score_frame(self, hours=None):
+        """DataFrame com timestamp e os scores materializados (SCORE_FIELDS), opcionalmente das últimas `hours`."""
+        with self._lock:
+            timestamps = self.columns['timestamp'].view()
+            start = 0
+            if hours is not None:
+                cutoff = pd.Timestamp(reference_now()).value - int(hours * 3600 * 1e9)
+                start = int(np.searchsorted(timestamps, cutoff, side='left'))
+            frame = {'timestamp': pd.to_datetime(timestamps[start:], unit='ns', utc=True)}
+            for name in SCORE_FIELDS:
+                frame[name] = self.columns[name].view()[start:].copy()
+        return pd.DataFrame(frame)
+
+    def to_frame(self, hours=None, rolling_hours=None):
+        """Monta um DataFrame tipado a partir das colunas, opcionalmente limitado às últimas `hours`.
+
+        Com `rolling_hours`, inclui a média móvel de cada campo analisado na
+        coluna '<campo>Rolling' (calculada pelas somas prefixadas).
+        """
+        with self._lock:
+            timestamps = self.columns['timestamp'].view()
+            start = 0
+            if hours is not None:
+                cutoff = pd.Timestamp(reference_now()).value - int(hours * 3600 * 1e9)
+                start = int(np.searchsorted(timestamps, cutoff, side='left'))
+            data = {name: column.view()[start:].copy() for name, column in self.columns.items()}
+            if rolling_hours is not None:
+                for field in self.analytics.fields:
+                    data[f'{field}Rolling'] = self.analytics.rolling_mean(field, timestamps, rolling_hours)[start:]
+
+        frame = {'timestamp': pd.to_datetime(data.pop('timestamp'), unit='ns', utc=True)}
+        for name, _ in NUMERIC_FIELDS:
+            frame[name] = data[name]
+        for name, _ in RATING_FIELDS:
+            frame[name] = pd.Categorical.from_codes(
+                data[name].astype(np.int8) - 1, categories=RATING_CATEGORIES, ordered=True
+            )
+        for name in SCORE_FIELDS:
+            frame[name] = data[name]
+        df = pd.DataFrame(frame)
+        df['technicalDebtHours'] = df['technicalDebtMinutes'] / np.float32(60)
+        if rolling_hours is not None:
+            for field in self.analytics.fields:
+                df[f'{field}Rolling'] = data[f'{field}Rolling']
+            df['technicalDebtHoursRolling'] = df['technicalDebtMinutesRolling'] / 60
+        return df
+
+
+# ==========================================
+# DOWNSAMPLING
+# ==========================================
+
+def lttb_indices(x, y, target):
+    """Índices selecionados pelo Largest-Triangle-Three-Buckets para `target` pontos."""
+    n = len(x)
+    if target >= n or target < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)
+    selected = np.empty(target, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(target - 2):
+        start, end = edges[i], edges[i + 1]
+        # Média do próximo bucket (ou o último ponto)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs(
+            (x[previous] - avg_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (avg_y - y[previous])
+        )
+        previous = start + int(np.nanargmax(areas)) if np.isfinite(areas).any() else start
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(y, target):
+    """Índices de mínimo e máximo por bucket, preservando picos com ~`target` pontos."""
+    n = len(y)
+    if target >= n or target < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    buckets = target // 2
+    size = n // buckets
+    usable = size * buckets
+    blocks = y[:usable].reshape(buckets, size)
+    filled_min = np.where(np.isnan(blocks), np.inf, blocks)
+    filled_max = np.where(np.isnan(blocks), -np.inf, blocks)
+    offsets = np.arange(buckets) * size
+    indices = np.concatenate([
+        offsets + filled_min.argmin(axis=1),
+        offsets + filled_max.argmax(axis=1),
+        np.arange(usable, n)
+    ])
+    return np.unique(indices)
+
+
+def downsample(df, y, target=500, method='lttb', x='timestamp'):
+    """Reduz o DataFrame a cerca de `target` pontos usando LTTB ou min/max por bucket."""
+    if df is None or len(df) <= target:
+        return df
+    if method == 'minmax':
+        indices = minmax_indices(df[y].to_numpy(), target)
+    else:
+        if pd.api.types.is_datetime64_any_dtype(df[x]):
+            x_values = pd.DatetimeIndex(df[x]).asi8
+        else:
+            x_values = df[x].to_numpy()
+        indices = lttb_indices(x_values, df[y].to_numpy(), target)
+    return df.iloc[indices].reset_index(drop=True)
+
+
+# Buffers por projeto; os usados há mais tempo são descartados pelo orçamento de memória
+_stores = memory.LRUPool('history', dynamic=True)
+_stores_lock = threading.Lock()
+
+
+def get_history_store(project_id):
+    """Retorna o HistoryStore do projeto, compartilhado entre sessões do processo."""
+    with _stores_lock:
+        store = _stores.get(project_id)
+        if store is None:
+            store = _stores.put(project_id, HistoryStore(project_id))
+        return store
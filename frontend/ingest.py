@@ -0,0 +1,458 @@
+# frontend/ingest.py
+# Leitura em streaming dos payloads grandes do backend direto para colunas
+#
+# Em vez de response.json() montar a lista inteira de dicts (que depois vira
+# DataFrame), as listas de registros indicadas ("alvos", ex.: 'components' ou
+# 'issues.bugs') são lidas um registro por vez e só os campos usados pelas
+# páginas são guardados, em uma coluna por campo. O restante do payload (stats,
+# paging, facets...) é decodificado normalmente. O parser padrão é incremental,
+# sobre json.JSONDecoder.raw_decode (um registro decodificado em C por vez);
+# com INGEST_PARSER=ijson e o pacote instalado, usa os eventos do ijson.
+import codecs
+import json
+import math
+import os
+from array import array
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Tamanho dos blocos lidos da resposta HTTP (bytes)
+CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_KB", "64")) * 1024
+# 'builtin' ou 'ijson'. O ijson (evento a evento em Python) é mais lento que o
+# parser padrão nos payloads do SonarCloud; compensa só com registros enormes.
+INGEST_PARSER = os.getenv("INGEST_PARSER", "builtin").strip().lower()
+
+# Tipos de campo de um alvo: números viram float64 (ausente = NaN), textos ficam em listas
+NUMBER = 'number'
+TEXT = 'text'
+
+_decoder = json.JSONDecoder()
+_empty = {}
+
+
+class StreamError(ValueError):
+    """JSON inválido ou truncado durante a leitura em streaming."""
+
+
+# ==========================================
+# COLUNAS
+# ==========================================
+
+class Columns:
+    """Registros de uma lista do payload guardados por coluna.
+
+    `fields` é um dict campo -> NUMBER/TEXT. Números ficam em arrays float64
+    (NaN para ausentes ou não numéricos) e textos em listas (None para ausentes).
+    Vazio é falso, como a lista que substitui.
+    """
+
+    __slots__ = ('fields', 'data', '_numbers', '_texts')
+
+    def __init__(self, fields, data=None):
+        self.fields = dict(fields)
+        self._numbers = self._texts = ()
+        if data is None:
+            data = {name: array('d') if kind == NUMBER else [] for name, kind in self.fields.items()}
+            # (campo, append da coluna) usados durante a leitura
+            self._numbers = [(name, data[name].append) for name, kind in self.fields.items() if kind == NUMBER]
+            self._texts = [(name, data[name].append) for name, kind in self.fields.items() if kind != NUMBER]
+        self.data = data
+
+    @classmethod
+    def from_records(cls, records, fields):
+        columns = cls(fields)
+        for record in records or []:
+            columns.append(record)
+        return columns.finish()
+
+    @classmethod
+    def concat(cls, parts, fields):
+        """Junta várias Columns (ex.: páginas de uma listagem) em uma só."""
+        import numpy as np
+
+        parts = [part for part in parts if part]
+        if not parts:
+            return cls(fields).finish()
+        data = {
+            name: np.concatenate([part.data[name] for part in parts]) if kind == NUMBER
+            else [value for part in parts for value in part.data[name]]
+            for name, kind in fields.items()
+        }
+        return cls(fields, data)
+
+    def append(self, record):
+        get = record.get if isinstance(record, dict) else _empty.get
+        for name, push in self._numbers:
+            value = get(name)
+            push(value if type(value) is float else _to_float(value))
+        for name, push in self._texts:
+            value = get(name)
+            push(value if value is None or type(value) is str else str(value))
+
+    def finish(self):
+        """Converte as colunas numéricas em arrays do numpy (ao fim da leitura)."""
+        import numpy as np
+
+        for name, kind in self.fields.items():
+            if kind == NUMBER and isinstance(self.data[name], array):
+                self.data[name] = np.frombuffer(self.data[name], dtype=np.float64).copy()
+        self._numbers = self._texts = ()
+        return self
+
+    def __len__(self):
+        return len(next(iter(self.data.values()))) if self.data else 0
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+    def take(self, selection):
+        """Novas Columns com as linhas de `selection` (slice ou máscara booleana)."""
+        import numpy as np
+
+        if isinstance(selection, slice):
+            data = {name: values[selection] for name, values in self.data.items()}
+        else:
+            mask = np.asarray(selection, dtype=bool)
+            data = {
+                name: values[mask] if self.fields[name] == NUMBER else [v for v, keep in zip(values, mask) if keep]
+                for name, values in self.data.items()
+            }
+        return Columns(self.fields, data)
+
+    def isin(self, name, values):
+        """Máscara booleana das linhas cujo campo texto `name` está em `values`."""
+        import numpy as np
+
+        wanted = set(values)
+        return np.fromiter((v in wanted for v in self.data[name]), dtype=bool, count=len(self))
+
+    def to_frame(self, columns=None):
+        """DataFrame com as `columns` pedidas (campos não lidos viram colunas vazias)."""
+        import numpy as np
+        import pandas as pd
+
+        columns = list(self.fields) if columns is None else columns
+        return pd.DataFrame({
+            name: self.data[name] if name in self.data else np.full(len(self), None, dtype=object)
+            for name in columns
+        })
+
+    def to_records(self):
+        names = list(self.fields)
+        values = [
+            [None if math.isnan(v) else _as_number(v) for v in self.data[name]] if self.fields[name] == NUMBER else self.data[name]
+            for name in names
+        ]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def to_json(self):
+        """Forma serializável em JSON (cache SQLite); `from_json` faz o caminho inverso."""
+        return {'__columns__': self.fields, 'records': self.to_records()}
+
+    @classmethod
+    def from_json(cls, value):
+        return cls.from_records(value['records'], value['__columns__'])
+
+
+def _to_float(value):
+    if isinstance(value, bool) or value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _as_number(value):
+    return int(value) if value.is_integer() else value
+
+
+def to_jsonable(payload):
+    """O payload com as Columns convertidas de volta em listas de registros."""
+    if isinstance(payload, Columns):
+        return payload.to_records()
+    if isinstance(payload, dict):
+        return {key: to_jsonable(value) for key, value in payload.items()}
+    return payload
+
+
+# ==========================================
+# ALVOS
+# ==========================================
+
+def _normalize(targets):
+    """{'a.b': {campo: tipo}} -> ({caminho (tupla): campos}, prefixos dos caminhos)."""
+    paths = {tuple(path.split('.')): None if fields is None else dict(fields) for path, fields in targets.items()}
+    prefixes = {path[:i] for path in paths for i in range(1, len(path))}
+    return paths, prefixes
+
+
+def columnar(payload, targets):
+    """Aplica os alvos a um payload já decodificado (replay, snapshot, cache em disco).
+
+    Os dicts no caminho dos alvos são copiados; o payload original não é alterado.
+    """
+    paths, _ = _normalize(targets)
+    if not isinstance(payload, dict):
+        return payload
+    result = dict(payload)
+    for path, fields in paths.items():
+        parent = result
+        for key in path[:-1]:
+            child = parent.get(key)
+            if not isinstance(child, dict):
+                parent = None
+                break
+            parent[key] = parent = dict(child)
+        if parent is None:
+            continue
+        if fields is None:
+            parent.pop(path[-1], None)
+        elif isinstance(parent.get(path[-1]), list):
+            parent[path[-1]] = Columns.from_records(parent[path[-1]], fields)
+    return result
+
+
+def parse_stream(chunks, targets):
+    """Decodifica o JSON vindo em `chunks` (bytes), lendo os alvos direto em Columns.
+
+    `targets` é um dict caminho -> {campo: NUMBER/TEXT}; com None no lugar dos
+    campos o valor do caminho é descartado sem ser montado (ex.: agrupamentos
+    que repetem as listas). Um alvo que não for uma lista no payload é
+    decodificado normalmente. Erros de sintaxe ou payload truncado levantam
+    StreamError.
+    """
+    if INGEST_PARSER == 'ijson' and ijson is not None:
+        return _parse_ijson(chunks, targets)
+    return _parse_incremental(chunks, targets)
+
+
+# ==========================================
+# PARSER COM IJSON
+# ==========================================
+
+class _ChunkFile:
+    """Objeto tipo arquivo sobre o iterador de blocos (interface esperada pelo ijson)."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def read(self, size=-1):
+        if size == 0:
+            # O ijson lê 0 bytes para descobrir se o arquivo é binário
+            return b''
+        return next(self._chunks, b'')
+
+
+def _parse_ijson(chunks, targets):
+    paths, _ = _normalize(targets)
+    # prefixo do ijson ('issues.bugs') -> colunas em construção; descartados não têm colunas
+    items = {'.'.join(path): Columns(fields) for path, fields in paths.items() if fields is not None}
+    item_prefixes = {f"{prefix}.item": prefix for prefix in items}
+    skipped = {'.'.join(path) for path, fields in paths.items() if fields is None}
+    builder = ijson.ObjectBuilder()
+    found = set()
+    columns = record = skipping = None
+    depth = 0
+
+    try:
+        for prefix, event, value in ijson.parse(_ChunkFile(chunks), use_float=True):
+            if columns is not None:
+                # Dentro de um registro de um alvo: só os campos escalares do primeiro nível
+                if event in ('start_map', 'start_array'):
+                    depth += 1
+                elif event in ('end_map', 'end_array'):
+                    depth -= 1
+                    if depth == 0:
+                        columns.append(record)
+                        columns = None
+                elif depth == 1 and event != 'map_key':
+                    record[prefix[prefix.rfind('.') + 1:]] = value
+                continue
+            if skipping is not None:
+                if prefix == skipping and event in ('end_map', 'end_array'):
+                    skipping = None
+                continue
+
+            if event == 'map_key':
+                child = f"{prefix}.{value}" if prefix else value
+                if child in skipped:
+                    continue
+            elif prefix in skipped:
+                # Valor escalar descartado, ou o início do objeto/lista descartado
+                if event in ('start_map', 'start_array'):
+                    skipping = prefix
+                continue
+            elif prefix in item_prefixes and item_prefixes[prefix] in found:
+                if event in ('start_map', 'start_array'):
+                    columns, record, depth = items[item_prefixes[prefix]], {}, 1
+                else:
+                    items[item_prefixes[prefix]].append(None)
+                continue
+            elif prefix in items and event == 'start_array':
+                found.add(prefix)
+            builder.event(event, value)
+    except ijson.JSONError as e:
+        raise StreamError(str(e)) from e
+
+    payload = getattr(builder, 'value', None)
+    if payload is None:
+        raise StreamError("payload vazio")
+    for prefix in found:
+        _replace(payload, tuple(prefix.split('.')), items[prefix].finish())
+    return payload
+
+
+def _replace(payload, path, columns):
+    parent = payload
+    for key in path[:-1]:
+        parent = parent[key]
+    parent[path[-1]] = columns
+
+
+# ==========================================
+# PARSER INCREMENTAL (SEM IJSON)
+# ==========================================
+
+class _Reader:
+    """Texto decodificado sob demanda a partir dos blocos, com cursor em `pos`."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _more(self):
+        """Lê ao menos mais um bloco, dobrando o texto pendente (evita reprocessamento quadrático)."""
+        pending = self.buffer[self.pos:]
+        target = max(2 * len(pending), 1)
+        parts = [pending]
+        size = len(pending)
+        while size < target and not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._utf8.decode(b'', final=True))
+                self.eof = True
+            else:
+                text = self._utf8.decode(chunk)
+                parts.append(text)
+                size += len(text)
+        self.buffer = ''.join(parts)
+        self.pos = 0
+
+    def peek(self):
+        """Próximo caractere que não é espaço ('' no fim do payload)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._more()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise StreamError(f"esperado {char!r} na posição {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decodifica o próximo valor JSON completo."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise StreamError(str(e)) from e
+                self._more()
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # Um número no fim do bloco pode continuar no próximo
+                self._more()
+                continue
+            self.pos = end
+            return value
+
+
+def _parse_incremental(chunks, targets):
+    paths, prefixes = _normalize(targets)
+    reader = _Reader(chunks)
+    if reader.peek() != '{':
+        return reader.value()
+    return _parse_object(reader, (), paths, prefixes)
+
+
+def _parse_object(reader, path, paths, prefixes):
+    reader.expect('{')
+    result = {}
+    if reader.peek() == '}':
+        reader.pos += 1
+        return result
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        child = path + (key,)
+        char = reader.peek()
+        if child in paths and paths[child] is None:
+            _skip(reader)
+        elif child in paths and char == '[':
+            result[key] = _parse_records(reader, Columns(paths[child]))
+        elif child in prefixes and char == '{':
+            result[key] = _parse_object(reader, child, paths, prefixes)
+        else:
+            result[key] = reader.value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == '}':
+            return result
+        if char != ',':
+            raise StreamError(f"esperado ',' ou '}}' na posição {reader.pos - 1}")
+
+
+def _parse_records(reader, columns):
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return columns.finish()
+    while True:
+        columns.append(reader.value())
+        char = reader.peek()
+        reader.pos += 1
+        if char == ']':
+            return columns.finish()
+        if char != ',':
+            raise StreamError(f"esperado ',' ou ']' na posição {reader.pos - 1}")
+
+
+def _skip(reader):
+    """Avança sobre o próximo valor decodificando um elemento (ou membro) por vez, sem guardá-los."""
+    opening = reader.peek()
+    if opening not in ('{', '['):
+        reader.value()
+        return
+    closing = '}' if opening == '{' else ']'
+    reader.pos += 1
+    if reader.peek() == closing:
+        reader.pos += 1
+        return
+    while True:
+        if opening == '{':
+            reader.value()
+            reader.expect(':')
+        reader.value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == closing:
+            return
+        if char != ',':
+            raise StreamError(f"esperado ',' ou {closing!r} na posição {reader.pos - 1}")
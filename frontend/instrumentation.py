@@ -0,0 +1,476 @@
+# frontend/instrumentation.py
+# Medições dos fetchers, do backend, dos gráficos e das seções das páginas
+#
+# Os dados agregados ficam disponíveis em formato Prometheus e JSON (servidor
+# opcional em METRICS_PORT) e, por execução da página, em um painel de debug
+# (SONARVIEW_DEBUG=1 ou ?debug=1 na URL) e em logs JSON (METRICS_LOG=1).
+import bisect
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import memory
+
+DEBUG_PANEL = os.getenv("SONARVIEW_DEBUG", "").lower() in ("1", "true", "yes")
+METRICS_LOG = os.getenv("METRICS_LOG", "").lower() in ("1", "true", "yes")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+
+# Limites dos buckets dos histogramas de tempo (segundos)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Observações recentes mantidas por série para calcular p50/p95 no JSON e no painel
+SAMPLE_WINDOW = 1000
+# Quantidade máxima de sessões com execução registrada em memória
+MAX_TRACED_SESSIONS = 1000
+# Eventos guardados por execução da página (os mais antigos são descartados)
+MAX_TRACE_EVENTS = int(os.getenv("MAX_TRACE_EVENTS", "500"))
+
+logger = logging.getLogger("sonarview.metrics")
+
+METRIC_HELP = {
+    'sonarview_fetch_total': ('counter', "Chamadas aos fetchers por resultado do cache (hit, stale, miss, error)."),
+    'sonarview_fetch_seconds': ('histogram', "Tempo das chamadas aos fetchers, incluindo espera por buscas em andamento."),
+    'sonarview_upstream_requests_total': ('counter', "Requisições ao backend por status (inclui deduplicated, throttled e circuit_open)."),
+    'sonarview_upstream_in_flight': ('gauge', "Requisições ao backend em andamento no processo."),
+    'sonarview_upstream_circuit_open': ('gauge', "1 enquanto o circuit breaker do backend está aberto ou em teste."),
+    'sonarview_upstream_seconds': ('histogram', "Latência das requisições ao backend."),
+    'sonarview_upstream_bytes_total': ('counter', "Bytes de payload recebidos do backend."),
+    'sonarview_upstream_parse_seconds': ('histogram', "Tempo de decodificação do JSON das respostas."),
+    'sonarview_figure_total': ('counter', "Gráficos servidos pelo cache de figuras (hit) ou construídos (miss)."),
+    'sonarview_figure_seconds': ('histogram', "Tempo para obter cada gráfico (hash + construção quando miss)."),
+    'sonarview_section_seconds': ('histogram', "Tempo de execução de cada seção das páginas."),
+    'sonarview_page_seconds': ('histogram', "Tempo total de execução das páginas."),
+    'sonarview_live_polls_total': ('counter', "Consultas do modo de atualização automática (unchanged, changed, error)."),
+    'sonarview_memory_bytes': ('gauge', "Memória estimada por cache do processo e somada das sessões (pool=sessions)."),
+    'sonarview_memory_budget_bytes': ('gauge', "Orçamento global de memória dos caches e sessões."),
+}
+
+
+# ==========================================
+# REGISTRO AGREGADO
+# ==========================================
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count', 'samples')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.samples.append(value)
+
+    def percentile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _key(name, labels):
+    # Valores de label sempre como texto: misturar int e str quebraria a ordenação das séries
+    return (name, tuple((label, str(value)) for label, value in labels.items()))
+
+
+class Registry:
+    """Contadores e histogramas indexados por (nome, labels)."""
+
+    def __init__(self):
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, labels, value):
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name, labels, value):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def to_prometheus(self):
+        """Exposição no formato texto do Prometheus."""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in METRIC_HELP.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind in ('counter', 'gauge'):
+                    values = self._counters if kind == 'counter' else self._gauges
+                    for (metric, labels), value in sorted(values.items()):
+                        if metric == name:
+                            lines.append(f"{name}{_labels(labels)} {value}")
+                    continue
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels, ('le', bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        """Resumo com totais e p50/p95 (em ms) das observações recentes."""
+        with self._lock:
+            counters = [
+                {'metric': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            gauges = [
+                {'metric': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._gauges.items())
+            ]
+            histograms = [
+                {
+                    'metric': name,
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'p50_ms': _ms(histogram.percentile(0.5)),
+                    'p95_ms': _ms(histogram.percentile(0.95)),
+                }
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+        return {'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+registry = Registry()
+
+
+# ==========================================
+# EXECUÇÃO DA PÁGINA
+# ==========================================
+
+class PageTrace:
+    """Eventos de uma execução (rerun) de uma página, agrupados por seção.
+
+    Depois de `finish()` novos eventos são ignorados: as reexecuções de
+    fragmentos (modo ao vivo, progresso dos relatórios) continuam nas
+    métricas agregadas, mas não são atribuídas à execução já encerrada.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.sections = []
+        self.events = deque(maxlen=MAX_TRACE_EVENTS)
+        self.dropped = 0
+        self.finished = False
+        self.total_ms = None
+        self.placeholder = None
+        self._current = None
+        self._lock = threading.Lock()
+
+    def add(self, kind, **data):
+        if self.finished:
+            return
+        with self._lock:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1
+            self.events.append({'kind': kind, 'section': self._current, **data})
+
+    @contextlib.contextmanager
+    def section(self, name):
+        """Mede o tempo de um bloco da página (normalmente o conteúdo de um st.header)."""
+        previous, self._current = self._current, name
+        start = time.perf_counter()
+        try:
+            yield self
+        except BaseException:
+            # st.stop()/rerun também encerram a execução da página
+            self._close_section(name, start, previous)
+            self.finish()
+            raise
+        self._close_section(name, start, previous)
+
+    def _close_section(self, name, start, previous):
+        elapsed = time.perf_counter() - start
+        self._current = previous
+        self.sections.append({'section': name, 'ms': _ms(elapsed)})
+        registry.observe('sonarview_section_seconds', {'page': self.page, 'section': name}, elapsed)
+
+    def stop(self):
+        """Encerra a execução da página com st.stop(), registrando-a antes."""
+        import streamlit as st
+        self.finish()
+        st.stop()
+
+    def finish(self):
+        """Registra o tempo total, grava o log JSON e atualiza o painel de debug."""
+        if self.finished:
+            return
+        self.finished = True
+        elapsed = time.perf_counter() - self.started
+        registry.observe('sonarview_page_seconds', {'page': self.page}, elapsed)
+        self.total_ms = _ms(elapsed)
+
+        if METRICS_LOG:
+            logger.info(json.dumps(self.summary(), ensure_ascii=False))
+        if self.placeholder is not None:
+            _render_panel(self)
+
+    def summary(self):
+        with self._lock:
+            events = list(self.events)
+        return {
+            'page': self.page,
+            'timestamp': time.time(),
+            'total_ms': self.total_ms if self.finished else _ms(time.perf_counter() - self.started),
+            'sections': list(self.sections),
+            'events': events,
+            'droppedEvents': self.dropped,
+        }
+
+
+# Execução em andamento por sessão do Streamlit
+_traces = OrderedDict()
+_traces_lock = threading.Lock()
+
+
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def current_trace():
+    """PageTrace da sessão atual (também nas threads do prefetch); None fora de uma página."""
+    session_id = _session_id()
+    if session_id is None:
+        return None
+    with _traces_lock:
+        return _traces.get(session_id)
+
+
+def debug_enabled():
+    if DEBUG_PANEL:
+        return True
+    import streamlit as st
+    return st.query_params.get('debug') in ('1', 'true')
+
+
+def start_page(page):
+    """Inicia o registro de uma execução da página e retorna o PageTrace."""
+    _ensure_logging()
+    _ensure_server()
+
+    memory.govern()
+    record_memory()
+
+    trace = PageTrace(page)
+    session_id = _session_id()
+    if session_id is not None:
+        with _traces_lock:
+            _traces[session_id] = trace
+            _traces.move_to_end(session_id)
+            while len(_traces) > MAX_TRACED_SESSIONS:
+                _traces.popitem(last=False)
+        if debug_enabled():
+            import streamlit as st
+            trace.placeholder = st.sidebar.empty()
+    return trace
+
+
+# ==========================================
+# PONTOS DE MEDIÇÃO
+# ==========================================
+
+def record_fetch(endpoint, outcome, seconds):
+    """Chamada a um fetcher cacheado: outcome é 'hit', 'stale', 'miss', 'refresh' ou 'error'."""
+    registry.inc('sonarview_fetch_total', {'endpoint': endpoint, 'outcome': outcome})
+    registry.observe('sonarview_fetch_seconds', {'endpoint': endpoint}, seconds)
+    trace = current_trace()
+    if trace:
+        trace.add('fetch', name=endpoint, outcome=outcome, ms=_ms(seconds))
+
+
+def record_upstream(path, status, seconds, size=0, parse_seconds=0.0):
+    """Requisição ao backend (status HTTP, 'error', 'replay', 'snapshot', 'deduplicated', 'throttled' ou 'circuit_open')."""
+    registry.inc('sonarview_upstream_requests_total', {'path': path, 'status': str(status)})
+    registry.observe('sonarview_upstream_seconds', {'path': path}, seconds)
+    if size:
+        registry.inc('sonarview_upstream_bytes_total', {'path': path}, size)
+    if parse_seconds:
+        registry.observe('sonarview_upstream_parse_seconds', {'path': path}, parse_seconds)
+    trace = current_trace()
+    if trace:
+        trace.add('upstream', name=path, outcome=str(status), ms=_ms(seconds), bytes=size, parse_ms=_ms(parse_seconds))
+
+
+def record_backend_guard(in_flight, circuit):
+    """Requisições em andamento e estado do circuit breaker (api_client)."""
+    registry.set('sonarview_upstream_in_flight', {}, in_flight)
+    registry.set('sonarview_upstream_circuit_open', {}, int(circuit != 'closed'))
+
+
+def record_figure(name, hit, seconds):
+    """Obtenção de um gráfico pelo cache de figuras."""
+    outcome = 'hit' if hit else 'miss'
+    registry.inc('sonarview_figure_total', {'figure': name, 'outcome': outcome})
+    registry.observe('sonarview_figure_seconds', {'figure': name}, seconds)
+    trace = current_trace()
+    if trace:
+        trace.add('figure', name=name, outcome=outcome, ms=_ms(seconds))
+
+
+def record_live_poll(page, result):
+    """Consulta do indicador de mudança no modo de atualização automática."""
+    registry.inc('sonarview_live_polls_total', {'page': page, 'result': result})
+
+
+def record_memory():
+    """Atualiza os gauges de memória a partir do relatório do governador."""
+    report = memory.report()
+    registry.set('sonarview_memory_budget_bytes', {}, report['budgetBytes'])
+    for name, usage in report['pools'].items():
+        registry.set('sonarview_memory_bytes', {'pool': name}, usage['bytes'])
+    registry.set('sonarview_memory_bytes', {'pool': 'sessions'}, sum(s['bytes'] for s in report['sessions']))
+    return report
+
+
+# ==========================================
+# PAINEL DE DEBUG
+# ==========================================
+
+def _render_panel(trace):
+    import pandas as pd
+    import streamlit as st
+
+    summary = trace.summary()
+    events = pd.DataFrame(summary['events'], columns=['kind', 'section', 'name', 'outcome', 'ms', 'bytes', 'parse_ms'])
+
+    with trace.placeholder.container():
+        with st.expander(f"⏱️ Desempenho ({summary['total_ms']:.0f} ms)", expanded=True):
+            fetches = events[events['kind'] == 'fetch']
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Hits", int(fetches['outcome'].isin(['hit', 'stale']).sum()))
+            col2.metric("Misses", int((fetches['outcome'] == 'miss').sum()))
+            col3.metric("Backend", f"{events.loc[events['kind'] == 'upstream', 'bytes'].sum() / 1024:,.0f} KB")
+
+            st.caption("Seções")
+            st.dataframe(pd.DataFrame(summary['sections']), hide_index=True, use_container_width=True)
+            st.caption("Fetchers, backend e gráficos")
+            st.dataframe(events, hide_index=True, use_container_width=True)
+
+            pages = [
+                h for h in registry.to_json()['histograms']
+                if h['metric'] == 'sonarview_page_seconds' and h['labels'].get('page') == trace.page
+            ]
+            if pages:
+                st.caption(f"Página (últimas execuções): p50 {pages[0]['p50_ms']} ms · p95 {pages[0]['p95_ms']} ms")
+
+            report = memory.report()
+            st.caption(
+                f"Memória: {report['totalBytes'] / 2**20:,.1f} de {report['budgetBytes'] / 2**20:,.0f} MB · "
+                f"esta sessão {memory.current_session_bytes() / 2**20:,.2f} MB · {len(report['sessions'])} sessões"
+            )
+            st.dataframe(
+                pd.DataFrame([{'pool': name, **usage} for name, usage in report['pools'].items()]),
+                hide_index=True, use_container_width=True
+            )
+
+
+# ==========================================
+# EXPORTAÇÃO
+# ==========================================
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def _ensure_logging():
+    if METRICS_LOG and not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def _ensure_server():
+    """Sobe o servidor de métricas (/metrics, /metrics.json e /memory.json) uma vez por processo."""
+    global _server
+    if not METRICS_PORT or _server is not None:
+        return
+    with _server_lock:
+        if _server is not None:
+            return
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                record_memory()
+                if self.path.startswith('/metrics.json'):
+                    body = json.dumps(registry.to_json()).encode()
+                    content_type = 'application/json'
+                elif self.path.startswith('/memory.json'):
+                    body = json.dumps(memory.report()).encode()
+                    content_type = 'application/json'
+                elif self.path.startswith('/metrics'):
+                    body = registry.to_prometheus().encode()
+                    content_type = 'text/plain; version=0.0.4'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), Handler)
+        except OSError as exc:
+            # Porta ocupada (ex.: outro processo do Streamlit já expõe as métricas)
+            logger.warning(f"Servidor de métricas não iniciado na porta {METRICS_PORT}: {exc}")
+            _server = False
+            return
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
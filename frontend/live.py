@@ -0,0 +1,177 @@
+# frontend/live.py
+# Modo de atualização automática das páginas (telões/monitores)
+#
+# Cada seção da página é um fragmento do Streamlit que, com o modo ativo, roda
+# no intervalo escolhido. A primeira execução do intervalo consulta um indicador
+# de mudança barato (timestamp do snapshot mais recente, com ETag) e atualiza
+# os caches; as seções só recarregam seus dados quando o indicador muda, e
+# apenas as que tiveram conteúdo novo são marcadas como atualizadas. A página
+# inteira não é reexecutada. Sem mudança, o intervalo entre consultas cresce
+# até o teto.
+import functools
+import os
+import time
+
+import requests
+import streamlit as st
+
+import instrumentation
+from figures import content_key
+from history import get_history_store
+from utils import get_latest_metrics
+
+# Intervalo padrão entre consultas (segundos), teto do backoff e fator de crescimento
+LIVE_REFRESH_SECONDS = float(os.getenv("LIVE_REFRESH_SECONDS", "30"))
+LIVE_REFRESH_MAX_SECONDS = float(os.getenv("LIVE_REFRESH_MAX_SECONDS", "600"))
+LIVE_BACKOFF_FACTOR = float(os.getenv("LIVE_BACKOFF_FACTOR", "2"))
+
+# Intervalos oferecidos na barra lateral
+REFRESH_INTERVALS = {'15 s': 15, '30 s': 30, '1 min': 60, '5 min': 300}
+
+
+def change_token(project_id):
+    """Consulta o backend e retorna (token, payload) das métricas mais recentes.
+
+    O token é o timestamp do snapshot. A consulta passa pelo fetcher cacheado
+    (`get_latest_metrics.refresh`): ignora o TTL, mas usa o mesmo caminho dos
+    demais fetchers (ETag, proteção do backend, instrumentação) e já grava o
+    payload no cache.
+    """
+    payload = get_latest_metrics.refresh(project_id)
+    return (payload or {}).get('timestamp'), payload
+
+
+def apply_change(project_id):
+    """Atualiza os caches do projeto depois de um snapshot novo.
+
+    As métricas mais recentes já entraram no cache pela consulta; o histórico
+    busca apenas os snapshots posteriores ao último carregado.
+    """
+    get_history_store(project_id).expire()
+
+
+def _state(page, project_id, token, interval):
+    """Estado do polling da sessão, reiniciado ao trocar de página, projeto ou intervalo."""
+    state = st.session_state.get('live_state')
+    if not state or (state['page'], state['project'], state['base']) != (page, project_id, interval):
+        state = st.session_state['live_state'] = {
+            'page': page,
+            'project': project_id,
+            'token': token,
+            'base': interval,
+            'interval': interval,
+            'next_poll': time.time() + interval,
+            'checked_at': None,
+            'sections': {},
+        }
+    elif token is not None:
+        # Uma execução completa da página já leu as métricas mais recentes do cache
+        state['token'] = token
+    return state
+
+
+def poll(state, now=None):
+    """Consulta o indicador se já passou o intervalo; retorna True quando os dados mudaram."""
+    now = time.time() if now is None else now
+    if now < state['next_poll']:
+        return False
+
+    try:
+        token, _ = change_token(state['project'])
+    except requests.exceptions.RequestException:
+        token, result = None, 'error'
+    else:
+        result = 'changed' if token is not None and token != state['token'] else 'unchanged'
+    instrumentation.record_live_poll(state['page'], result)
+    state['checked_at'] = now
+
+    if result == 'changed':
+        state['token'] = token
+        state['interval'] = state['base']
+        state['next_poll'] = now + state['base']
+        apply_change(state['project'])
+        return True
+
+    state['interval'] = min(state['interval'] * LIVE_BACKOFF_FACTOR, max(LIVE_REFRESH_MAX_SECONDS, state['base']))
+    state['next_poll'] = now + state['interval']
+    return False
+
+
+def _watch(state):
+    poll(state)
+    checked = time.strftime('%H:%M:%S', time.localtime(state['checked_at'])) if state['checked_at'] else '—'
+    st.caption(f"Última verificação: {checked} · próxima em {max(0, state['next_poll'] - time.time()):.0f} s")
+
+
+def live_controls(page, project_id, token):
+    """Exibe os controles de atualização automática na barra lateral e inicia o polling.
+
+    `token` é o timestamp dos dados exibidos nesta execução. Retorna o estado
+    do polling, usado por `live_fragment` e `section_data`, ou None com o modo
+    desligado.
+    """
+    st.sidebar.markdown("---")
+    if not st.sidebar.toggle("🔄 Atualização automática", key='live_enabled'):
+        st.session_state.pop('live_state', None)
+        return None
+
+    labels = list(REFRESH_INTERVALS)
+    default = min(labels, key=lambda label: abs(REFRESH_INTERVALS[label] - LIVE_REFRESH_SECONDS))
+    label = st.sidebar.selectbox("Verificar a cada", labels, index=labels.index(default), key='live_interval')
+    interval = REFRESH_INTERVALS[label]
+
+    state = _state(page, project_id, token, interval)
+    # O fragmento roda no intervalo base; o backoff apenas pula consultas
+    with st.sidebar:
+        st.fragment(_watch, run_every=interval)(state)
+    return state
+
+
+def live_fragment(state):
+    """Decorator das seções da página: um fragmento que, com o modo ativo, roda a cada intervalo.
+
+    Cada execução consulta o indicador se a consulta já venceu (a primeira
+    seção a rodar no intervalo consulta pelas demais). O Streamlit só permite
+    que o próprio fragmento se reexecute pelo timer; as seções sem mudança
+    redesenham os dados guardados por `section_data`, sem recalcular nada.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if state is not None:
+                poll(state)
+            return func(*args, **kwargs)
+        return st.fragment(run, run_every=state['base'] if state else None)
+    return decorator
+
+
+def section_data(state, name, params, load):
+    """Dados de uma seção, recarregados só quando há snapshot novo ou `params` muda.
+
+    Sem o modo automático (`state` None) apenas retorna `load()`. Com ele,
+    `load()` roda quando o token ou `params` (valores dos widgets da seção)
+    mudam; se o conteúdo mudou com os mesmos `params`, a seção é marcada como
+    atualizada (ver `mark_updated`).
+    """
+    if state is None:
+        return load()
+    seen = state['sections'].get(name)
+    if seen and seen['token'] == state['token'] and seen['params'] == params:
+        return seen['data']
+
+    data = load()
+    digest = content_key(name, (data,), {})
+    updated = seen['updated'] if seen else None
+    if seen and seen['params'] == params and seen['digest'] != digest:
+        updated = time.time()
+    state['sections'][name] = {
+        'token': state['token'], 'params': params, 'digest': digest, 'data': data, 'updated': updated,
+    }
+    return data
+
+
+def mark_updated(state, name):
+    """Sinaliza abaixo do cabeçalho quando a seção recebeu dados novos no modo automático."""
+    seen = state['sections'].get(name) if state else None
+    if seen and seen['updated']:
+        st.caption(f"🆕 Atualizado às {time.strftime('%H:%M:%S', time.localtime(seen['updated']))}")
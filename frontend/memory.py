@@ -0,0 +1,350 @@
+# frontend/memory.py
+# Contabilidade e limites de memória dos caches do processo e das sessões
+#
+# Cada cache em memória (SWR, figuras, históricos, índices, logs DORA) é um
+# "pool" registrado aqui, que informa quantos bytes ocupa e sabe liberar as
+# entradas menos usadas. A cada execução de página o governador mede o
+# session_state da sessão, aplica o limite por sessão e, se o total do
+# processo passar do orçamento global, esvazia os pools na ordem de EVICTION_ORDER.
+import os
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+
+# Orçamento global dos caches + sessões e limite por sessão (MB)
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "512"))
+SESSION_BUDGET_MB = float(os.getenv("SESSION_BUDGET_MB", "32"))
+# Pools esvaziados primeiro quando o orçamento global é excedido (mais baratos de reconstruir)
+EVICTION_ORDER = ['figures', 'diffs', 'dora_logs', 'explorer_indexes', 'swr_cache', 'history']
+
+# Chave do session_state com a ordem de uso dos valores despejáveis da sessão
+_SESSION_LRU_KEY = '_memory_lru'
+
+# Listas maiores que isto são estimadas por amostragem (payloads com milhares de registros)
+SIZEOF_SAMPLE = 100
+
+# Referências que não pertencem ao valor medido (classes, módulos, funções)
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType)
+
+
+# ==========================================
+# TAMANHO DOS OBJETOS
+# ==========================================
+
+def sizeof(value, _seen=None):
+    """Estimativa em bytes de `value` e de tudo que ele referencia.
+
+    DataFrames, arrays e tabelas Arrow usam o tamanho dos buffers; estruturas
+    do Python e objetos comuns são percorridos (cada objeto contado uma vez).
+    Listas, tuplas e dicionários longos são estimados a partir de SIZEOF_SAMPLE elementos.
+    """
+    pd = sys.modules.get('pandas')
+    np = sys.modules.get('numpy')
+    pa = sys.modules.get('pyarrow')
+
+    total = 0
+    seen = set() if _seen is None else _seen
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        if pd is not None and isinstance(item, pd.DataFrame):
+            total += int(item.memory_usage(deep=True).sum())
+        elif pd is not None and isinstance(item, (pd.Series, pd.Index)):
+            total += int(item.memory_usage(deep=True))
+        elif np is not None and isinstance(item, np.ndarray):
+            total += sys.getsizeof(item) if item.base is None else item.nbytes
+            if item.dtype == object:
+                stack.extend(item.ravel().tolist())
+        elif pa is not None and isinstance(item, (pa.Table, pa.Array, pa.ChunkedArray, pa.RecordBatch)):
+            total += item.nbytes
+        elif isinstance(item, (str, bytes, bytearray, int, float, bool, type(None))):
+            total += sys.getsizeof(item)
+        elif isinstance(item, dict):
+            total += sys.getsizeof(item)
+            if len(item) > 2 * SIZEOF_SAMPLE:
+                total += _sampled_size(list(item.keys()), seen) + _sampled_size(list(item.values()), seen)
+            else:
+                stack.extend(item.keys())
+                stack.extend(item.values())
+        elif isinstance(item, (list, tuple)) and len(item) > 2 * SIZEOF_SAMPLE:
+            total += sys.getsizeof(item) + _sampled_size(item, seen)
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            total += sys.getsizeof(item)
+            stack.extend(item)
+        elif isinstance(item, _SKIPPED_TYPES):
+            continue
+        else:
+            total += sys.getsizeof(item)
+            if hasattr(item, '__dict__'):
+                stack.append(vars(item))
+            for slot in getattr(type(item), '__slots__', ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+def _sampled_size(elements, seen):
+    """Tamanho somado de `elements` estimado a partir de SIZEOF_SAMPLE deles, espaçados."""
+    step = len(elements) / SIZEOF_SAMPLE
+    sample = sum(sizeof(elements[int(i * step)], seen) for i in range(SIZEOF_SAMPLE))
+    return int(sample * len(elements) / SIZEOF_SAMPLE)
+
+
+# ==========================================
+# DATAFRAMES COMPACTOS
+# ==========================================
+
+def compact_frame(df, categories=(), integers=(), floats=()):
+    """Reduz os tipos das colunas: categóricas, inteiros de 32 bits (ou menos) e float32.
+
+    Inteiros com valores ausentes viram o tipo anulável Int32. Colunas
+    inexistentes são ignoradas. Retorna o próprio DataFrame (alterado).
+    """
+    import numpy as np
+    import pandas as pd
+
+    for column in categories:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    for column in integers:
+        if column not in df:
+            continue
+        values = pd.to_numeric(df[column], errors='coerce')
+        if values.isna().any():
+            df[column] = values.round().astype('Int32')
+        else:
+            df[column] = pd.to_numeric(values.astype(np.int64), downcast='integer')
+            if df[column].dtype.itemsize > 4:
+                df[column] = df[column].astype(np.int32)
+    for column in floats:
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(np.float32)
+    return df
+
+
+# ==========================================
+# POOLS DE CACHE DO PROCESSO
+# ==========================================
+
+class LRUPool:
+    """Dicionário com ordem de uso e limite de bytes, para os caches por projeto.
+
+    Com `dynamic=True` os valores podem crescer depois de inseridos (como o
+    HistoryStore). Eles expõem um contador `version`, incrementado a cada
+    alteração, e o tamanho só é medido de novo quando o contador muda.
+    """
+
+    def __init__(self, name, max_bytes=None, dynamic=False):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.dynamic = dynamic
+        self.evictions = 0
+        self._entries = OrderedDict()  # chave -> (valor, bytes, versão medida)
+        self._lock = threading.Lock()
+        register(name, self)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """Insere `value`; `size` substitui a medição quando o valor referencia dados de outro pool."""
+        size = sizeof(value) if size is None else size
+        with self._lock:
+            self._entries[key] = (value, size, getattr(value, 'version', None))
+            self._entries.move_to_end(key)
+            if self.max_bytes is not None:
+                self._shrink_locked(self._bytes_locked() - self.max_bytes, keep=key)
+        return value
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bytes_locked(self):
+        if self.dynamic:
+            for key, (value, size, measured) in list(self._entries.items()):
+                version = getattr(value, 'version', None)
+                if version != measured:
+                    self._entries[key] = (value, sizeof(value), version)
+        return sum(entry[1] for entry in self._entries.values())
+
+    def _shrink_locked(self, excess, keep=None):
+        freed = 0
+        for key in list(self._entries):
+            if freed >= excess:
+                break
+            if key == keep:
+                continue
+            freed += self._entries.pop(key)[1]
+            self.evictions += 1
+        return freed
+
+    def usage(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes_locked(), 'maxBytes': self.max_bytes, 'evictions': self.evictions}
+
+    def shrink(self, nbytes):
+        """Libera ao menos `nbytes` (se houver), começando pelas entradas menos usadas."""
+        with self._lock:
+            return self._shrink_locked(nbytes)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def register(name, pool):
+    """Registra um cache com `usage()` (dict com 'bytes') e, opcionalmente, `shrink(nbytes)`."""
+    with _pools_lock:
+        _pools[name] = pool
+
+
+# ==========================================
+# SESSÕES
+# ==========================================
+
+# id da sessão -> {'bytes', 'keys': {chave: bytes}, 'seen'}
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def _prune_sessions():
+    """Esquece sessões encerradas (o Streamlit já liberou o session_state delas)."""
+    from streamlit import runtime
+    if not runtime.exists():
+        return
+    instance = runtime.get_instance()
+    with _sessions_lock:
+        for session_id in [s for s in _sessions if not instance.is_active_session(s)]:
+            del _sessions[session_id]
+
+
+def remember(key, value):
+    """Guarda `value` no session_state como valor despejável pelo limite da sessão.
+
+    Use para resultados grandes que podem ser recalculados (ex.: arquivos
+    gerados para download); widgets e estado de navegação não passam por aqui.
+    """
+    import streamlit as st
+
+    st.session_state[key] = value
+    order = st.session_state.setdefault(_SESSION_LRU_KEY, [])
+    if key in order:
+        order.remove(key)
+    order.append(key)
+    track_session()
+    return value
+
+
+def track_session():
+    """Mede o session_state da sessão atual e despeja valores de `remember` acima do limite."""
+    import streamlit as st
+
+    session_id = _session_id()
+    if session_id is None:
+        return None
+
+    sizes = {key: sizeof(value) for key, value in st.session_state.items()}
+    total = sum(sizes.values())
+    order = st.session_state.get(_SESSION_LRU_KEY, [])
+    budget = SESSION_BUDGET_MB * 1024 * 1024
+    while total > budget and order:
+        evicted = order.pop(0)
+        if evicted in st.session_state:
+            total -= sizes.pop(evicted, 0)
+            del st.session_state[evicted]
+
+    with _sessions_lock:
+        _sessions[session_id] = {'bytes': total, 'keys': sizes, 'seen': time.time()}
+    return total
+
+
+# ==========================================
+# GOVERNADOR
+# ==========================================
+
+def enforce():
+    """Aplica o orçamento global esvaziando os pools na ordem de EVICTION_ORDER."""
+    budget = MEMORY_BUDGET_MB * 1024 * 1024
+    with _pools_lock:
+        pools = dict(_pools)
+    usage = {name: pool.usage()['bytes'] for name, pool in pools.items()}
+    with _sessions_lock:
+        sessions = sum(s['bytes'] for s in _sessions.values())
+
+    excess = sum(usage.values()) + sessions - budget
+    freed = 0
+    order = EVICTION_ORDER + [name for name in pools if name not in EVICTION_ORDER]
+    for name in order:
+        if excess - freed <= 0:
+            break
+        pool = pools.get(name)
+        if pool is not None and hasattr(pool, 'shrink'):
+            freed += pool.shrink(excess - freed)
+    return freed
+
+
+def govern():
+    """Chamado a cada execução de página: mede a sessão e aplica os limites."""
+    _prune_sessions()
+    track_session()
+    enforce()
+
+
+def report():
+    """Uso atual: orçamento, total, bytes por pool e por sessão (maiores primeiro)."""
+    with _pools_lock:
+        pools = {name: pool.usage() for name, pool in _pools.items()}
+    with _sessions_lock:
+        sessions = sorted(
+            (
+                {
+                    'session': session_id,
+                    'bytes': data['bytes'],
+                    'largest': sorted(data['keys'].items(), key=lambda item: -item[1])[:5],
+                    'seen': data['seen'],
+                }
+                for session_id, data in _sessions.items()
+            ),
+            key=lambda s: -s['bytes']
+        )
+    total = sum(p['bytes'] for p in pools.values()) + sum(s['bytes'] for s in sessions)
+    return {
+        'budgetBytes': int(MEMORY_BUDGET_MB * 1024 * 1024),
+        'sessionBudgetBytes': int(SESSION_BUDGET_MB * 1024 * 1024),
+        'totalBytes': total,
+        'pools': pools,
+        'sessions': sessions,
+    }
+
+
+def current_session_bytes():
+    session_id = _session_id()
+    with _sessions_lock:
+        data = _sessions.get(session_id)
+    return data['bytes'] if data else 0
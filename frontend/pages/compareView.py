@@ -0,0 +1,195 @@
+# pages/compareView.py
+from datetime import timedelta
+
+import numpy as np
+import streamlit as st
+from api_client import reference_now
+from instrumentation import start_page
+from utils import (
+    display_sidebar, render_no_data,
+    get_comparison_points, get_history_point, get_score_history,
+    issues_to_frame,
+)
+from analytics import HIGHER_IS_BETTER
+from diff import FILE_FIELDS, FILE_STATUSES, compare
+from explorer import METRIC_LABELS as FILE_METRICS
+from history import SCORE_FIELDS
+
+# Período do histórico oferecido para pontos sem dados por arquivo (90 dias)
+COMPARE_HISTORY_HOURS = 2160
+HISTORY_OPTION = "Histórico (somente métricas)"
+# Linhas exibidas na tabela de arquivos
+FILE_TABLE_ROWS = 200
+# Rótulos das métricas por arquivo (campo -> rótulo)
+FILE_FIELD_LABELS = {field: label for label, field in FILE_METRICS.items()}
+# Métricas do resumo: campo -> (rótulo, formato)
+SUMMARY_METRICS = {
+    'qualityIndex': ("Índice de Qualidade", "{:.0f}/100"),
+    'bugs': ("Bugs", "{:.0f}"),
+    'vulnerabilities': ("Vulnerabilidades", "{:.0f}"),
+    'codeSmells': ("Code Smells", "{:.0f}"),
+    'coverage': ("Cobertura", "{:.1f}%"),
+    'technicalDebtMinutes': ("Dívida Técnica", "{:,.0f} min"),
+}
+
+st.set_page_config(page_title="Comparação", page_icon="🔀", layout="wide")
+
+# Título e descrição
+st.title("🔀 Comparação entre Pontos no Tempo")
+st.markdown("Diferenças de métricas, arquivos e issues entre dois momentos do projeto.")
+
+# Sidebar e seleção de projeto
+project_id = display_sidebar()
+trace = start_page('compareView')
+
+if not project_id:
+    st.info("Selecione um projeto na barra lateral para visualizar os dados.")
+    trace.stop()
+
+with trace.section('Carregamento de dados'):
+    points = get_comparison_points(project_id)
+    df_scores = get_score_history(project_id, COMPARE_HISTORY_HOURS)
+
+has_history = df_scores is not None and not df_scores.empty
+if not points and not has_history:
+    render_no_data()
+    trace.stop()
+
+options = {point.label: point for point in points}
+if has_history:
+    first_day = df_scores['timestamp'].iloc[0].date()
+    last_day = df_scores['timestamp'].iloc[-1].date()
+    options[HISTORY_OPTION] = None
+labels = list(options)
+
+
+def select_point(column, title, default_label, default_day, key):
+    """Seletor de um ponto: um dos pontos com dados por arquivo ou um dia do histórico."""
+    with column:
+        st.subheader(title)
+        label = st.selectbox("Origem", options=labels, index=labels.index(default_label), key=f'{key}_source')
+        if label != HISTORY_OPTION:
+            return options[label]
+        day = st.date_input(
+            "Data", value=min(max(default_day, first_day), last_day),
+            min_value=first_day, max_value=last_day, key=f'{key}_date'
+        )
+        # Último snapshot até o fim do dia escolhido
+        return get_history_point(project_id, f"{day}T23:59:59.999999Z")
+
+
+# Padrões: snapshot exportado mais recente (ou o histórico de uma semana atrás) contra o estado atual
+archives = [point.label for point in points if point.kind == 'archive']
+live = [point.label for point in points if point.kind == 'live']
+default_before = archives[0] if archives else (HISTORY_OPTION if has_history else labels[0])
+default_after = live[0] if live else labels[-1]
+# Data de referência (a do snapshot, quando houver), não a data local do servidor
+today = reference_now().date()
+
+col_before, col_after = st.columns(2)
+before = select_point(col_before, "Antes", default_before, today - timedelta(days=7), 'compare_before')
+after = select_point(col_after, "Depois", default_after, today, 'compare_after')
+
+if before is None or after is None:
+    st.warning("Não há snapshot no histórico até a data escolhida.")
+    trace.stop()
+if before.key == after.key:
+    st.info("Escolha dois pontos diferentes para comparar.")
+    trace.stop()
+
+with trace.section('Diff'):
+    with st.spinner("Comparando..."):
+        result = compare(project_id, before, after)
+
+# --- Resumo ---
+with trace.section('Resumo'):
+    st.header("Resumo", divider='violet')
+    st.caption(f"{before.label} → {after.label}")
+
+    metrics = result.metrics.set_index('campo')
+    for column, (field, (label, fmt)) in zip(st.columns(len(SUMMARY_METRICS)), SUMMARY_METRICS.items()):
+        value, delta = metrics.at[field, 'depois'], metrics.at[field, 'delta']
+        better_up = field in HIGHER_IS_BETTER or field in SCORE_FIELDS
+        with column:
+            st.metric(
+                label,
+                fmt.format(value) if not np.isnan(value) else "N/A",
+                delta=None if np.isnan(delta) or delta == 0 else fmt.format(delta).replace('/100', ''),
+                delta_color='normal' if better_up else 'inverse',
+            )
+
+    col_ratings, col_metrics = st.columns([1, 2])
+    with col_ratings:
+        st.subheader("Ratings")
+        st.dataframe(result.ratings, use_container_width=True, hide_index=True)
+    with col_metrics:
+        st.subheader("Métricas")
+        st.dataframe(
+            result.metrics.drop(columns='campo'),
+            use_container_width=True, hide_index=True,
+            column_config={
+                'antes': st.column_config.NumberColumn(format="%.2f"),
+                'depois': st.column_config.NumberColumn(format="%.2f"),
+                'delta': st.column_config.NumberColumn(format="%+.2f"),
+                'delta %': st.column_config.NumberColumn(format="%+.1f%%"),
+            }
+        )
+
+# --- Arquivos ---
+with trace.section('Arquivos'):
+    st.header("Arquivos", divider='violet')
+
+    if result.files is None:
+        st.info("Dados por arquivo disponíveis apenas para o estado atual e para snapshots exportados.")
+    else:
+        counts = result.file_counts()
+        for column, status in zip(st.columns(len(FILE_STATUSES)), FILE_STATUSES):
+            with column:
+                st.metric(status.capitalize(), f"{counts[status]:,}")
+
+        col_status, col_sort = st.columns([2, 1])
+        with col_status:
+            statuses = st.multiselect(
+                "Situação", options=FILE_STATUSES, default=['adicionado', 'removido', 'alterado'], key='compare_statuses'
+            )
+        with col_sort:
+            sort_field = st.selectbox(
+                "Ordenar pela variação de", options=FILE_FIELDS,
+                format_func=lambda f: FILE_FIELD_LABELS.get(f, f), key='compare_sort'
+            )
+
+        files = result.files[result.files['status'].isin(statuses)]
+        if files.empty:
+            st.info("Nenhum arquivo na situação escolhida.")
+        else:
+            order = np.argsort(-np.nan_to_num(np.abs(files[f'{sort_field}Delta'].to_numpy()), nan=-1), kind='stable')
+            shown = files.iloc[order[:FILE_TABLE_ROWS]]
+            columns = ['path', 'status'] + [f'{sort_field}{suffix}' for suffix in ('Before', 'After', 'Delta')]
+            st.dataframe(shown[columns], use_container_width=True, hide_index=True)
+            if len(files) > FILE_TABLE_ROWS:
+                st.caption(f"Exibindo {FILE_TABLE_ROWS} de {len(files):,} arquivos.")
+
+# --- Issues ---
+with trace.section('Issues'):
+    st.header("Issues em Código Novo", divider='violet')
+
+    if result.issues_added is None:
+        st.info("Issues disponíveis apenas para o estado atual e para snapshots exportados.")
+    else:
+        tab_added, tab_resolved = st.tabs([
+            f"🆕 Novas ({len(result.issues_added):,})",
+            f"✅ Resolvidas ({len(result.issues_resolved):,})",
+        ])
+        for tab, issues, empty in (
+            (tab_added, result.issues_added, "Nenhuma issue nova."),
+            (tab_resolved, result.issues_resolved, "Nenhuma issue resolvida."),
+        ):
+            with tab:
+                if len(issues):
+                    st.dataframe(issues_to_frame(issues), use_container_width=True, hide_index=True)
+                else:
+                    st.info(empty)
+
+st.caption(f"Diff calculado em {result.seconds * 1000:.0f} ms (em cache por par de pontos).")
+
+trace.finish()
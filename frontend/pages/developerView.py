@@ -1,15 +1,29 @@
 # pages/developerView.py
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
+from figures import complexity_bar_figure, coverage_bar_figure
+from instrumentation import start_page
 from utils import (
-    display_sidebar, get_latest_metrics, render_no_data,
+    display_sidebar, render_no_data,
     is_numeric_value,
-    get_new_code_issues,
-    get_complexity_data,
-    get_coverage_by_file
+    prefetch,
+    get_new_code_issue_counts, get_new_code_issues_page, issues_to_frame, prepare_worst_coverage,
+    ISSUE_TYPES, ISSUE_SEVERITIES
 )
+from explorer import get_hotspot_index, METRIC_LABELS
+
+# Abas da tabela de issues: tipo -> (rótulo, mensagem quando vazia)
+ISSUE_TABS = {
+    'BUG': ("🐛 Bugs", "✅ Nenhum bug em código novo!"),
+    'VULNERABILITY': ("🔐 Vulnerabilidades", "✅ Nenhuma vulnerabilidade em código novo!"),
+    'CODE_SMELL': ("💡 Code Smells", "✅ Nenhum code smell em código novo!"),
+}
+ISSUE_PAGE_SIZES = [50, 100, 250, 500]
+# Limite de arquivos listados na busca do explorador
+EXPLORER_SEARCH_LIMIT = 200
+# Arquivos enviados ao backend pelo filtro da tabela de issues (limite do backend)
+ISSUE_FILTER_MAX_FILES = 100
+
 st.set_page_config(page_title="Visão do Desenvolvedor", page_icon="👩‍💻", layout="wide")
 
 # Título e descrição
@@ -17,206 +31,324 @@ st.title("👩‍💻 Visão do Desenvolvedor")
 
 # Sidebar e seleção de projeto
 project_id = display_sidebar()
+trace = start_page('developerView')
 
 if not project_id:
     st.info("Selecione um projeto na barra lateral para visualizar os dados.")
-    st.stop()
+    trace.stop()
+
+# Filtros da tabela de issues (lidos antes do prefetch para buscar só a página visível)
+with trace.section('Carregamento de dados'):
+    selected_severities = st.session_state.get('issues_severities', ISSUE_SEVERITIES)
+    severity_filter = (
+        tuple(s for s in ISSUE_SEVERITIES if s in selected_severities)
+        if len(selected_severities) < len(ISSUE_SEVERITIES) else None
+    )
+    issue_type = st.session_state.get('issues_type', 'BUG')
+    issue_page_size = st.session_state.get('issues_page_size', 100)
+    issue_page = st.session_state.get('issues_page', 1)
+    component_filter = st.session_state.get('issues_component', '').strip()
 
-# Carregar dados
-latest_data = get_latest_metrics(project_id)
+    # Carregar dados (em paralelo); com filtro de arquivo, as issues dependem da lista de arquivos
+    issue_keys = [] if component_filter else ['new_code_issue_counts', 'new_code_issues_page']
+    page_data = prefetch(
+        project_id,
+        ['latest_metrics', *issue_keys, 'complexity', 'coverage'],
+        params={
+            'new_code_issue_counts': {'severities': severity_filter},
+            'new_code_issues_page': {
+                'issue_type': issue_type,
+                'page': issue_page,
+                'page_size': issue_page_size,
+                'severities': severity_filter
+            }
+        }
+    )
+    latest_data = page_data['latest_metrics']
+
+    issue_files = None
+    if component_filter:
+        # O texto vira a lista de arquivos do projeto que o contêm, filtrada pelo backend em todas as páginas
+        file_index = get_hotspot_index(project_id, page_data['complexity'], page_data['coverage'])
+        issue_files = tuple(file_index.search(component_filter, limit=ISSUE_FILTER_MAX_FILES + 1)['path'])
+        page_data['new_code_issue_counts'] = (
+            get_new_code_issue_counts(project_id, severity_filter, issue_files[:ISSUE_FILTER_MAX_FILES])
+            if issue_files else dict.fromkeys(ISSUE_TYPES, 0)
+        )
+        page_data['new_code_issues_page'] = None
 
 if not latest_data:
     render_no_data()
-    st.stop()
+    trace.stop()
 
 # --- Foco em Código Novo ---
-st.header("Código Novo", divider='orange')
-new_code = latest_data.get('newCode', {})
-
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.metric("Novos Bugs", new_code.get('bugs', '*'), delta_color="inverse")
-with col2:
-    st.metric("Novas Vulnerabilidades", new_code.get('vulnerabilities', '*'), delta_color="inverse")
-with col3:
-    st.metric("Novos Code Smells", new_code.get('codeSmells', '*'), delta_color="inverse")
-
-# Tabela de Problemas em Código Novo
-st.subheader("Tabela de Problemas em Código Novo")
-
-issues_data = get_new_code_issues(project_id)
-
-if issues_data and issues_data.get('total', 0) > 0:
-    issues = issues_data['issues']
-
-    # Criar abas para cada tipo
-    tab1, tab2, tab3 = st.tabs([
-        f"🐛 Bugs ({len(issues['bugs'])})",
-        f"🔐 Vulnerabilidades ({len(issues['vulnerabilities'])})",
-        f"💡 Code Smells ({len(issues['codeSmells'])})"
-    ])
-
-    with tab1:
-        if issues['bugs']:
-            df_bugs = pd.DataFrame(issues['bugs'])
-            st.dataframe(
-                df_bugs[['severity', 'component', 'message', 'line', 'effort']],
-                use_container_width=True,
-                hide_index=True
-            )
+with trace.section('Código Novo'):
+    st.header("Código Novo", divider='orange')
+    new_code = latest_data.get('newCode', {})
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Novos Bugs", new_code.get('bugs', '*'), delta_color="inverse")
+    with col2:
+        st.metric("Novas Vulnerabilidades", new_code.get('vulnerabilities', '*'), delta_color="inverse")
+    with col3:
+        st.metric("Novos Code Smells", new_code.get('codeSmells', '*'), delta_color="inverse")
+
+    # Tabela de Problemas em Código Novo
+    st.subheader("Tabela de Problemas em Código Novo")
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        st.multiselect("Severidade", options=ISSUE_SEVERITIES, default=ISSUE_SEVERITIES, key='issues_severities')
+    with col2:
+        st.text_input("Filtrar por arquivo", key='issues_component', placeholder="trecho do caminho, ex.: models/")
+    with col3:
+        st.selectbox("Itens por página", options=ISSUE_PAGE_SIZES, index=ISSUE_PAGE_SIZES.index(100), key='issues_page_size')
+
+    if issue_files is not None:
+        if not issue_files:
+            st.caption(f"Nenhum arquivo do projeto contém \"{component_filter}\".")
+        elif len(issue_files) > ISSUE_FILTER_MAX_FILES:
+            st.caption(f"Mais de {ISSUE_FILTER_MAX_FILES} arquivos contêm \"{component_filter}\": "
+                       f"exibindo as issues dos {ISSUE_FILTER_MAX_FILES} primeiros. Refine o filtro.")
+        issue_files = issue_files[:ISSUE_FILTER_MAX_FILES]
+
+    issue_counts = page_data['new_code_issue_counts']
+
+    if not selected_severities:
+        st.info("Selecione ao menos uma severidade.")
+    elif issue_counts and sum(issue_counts.values()) > 0:
+        # Apenas o tipo selecionado é carregado e convertido em DataFrame
+        st.radio(
+            "Tipo de problema",
+            options=list(ISSUE_TYPES),
+            format_func=lambda t: f"{ISSUE_TABS[t][0]} ({issue_counts.get(t, 0)})",
+            horizontal=True,
+            label_visibility='collapsed',
+            key='issues_type'
+        )
+
+        total = issue_counts.get(issue_type, 0)
+        if total == 0:
+            st.success(ISSUE_TABS[issue_type][1])
         else:
-            st.success("✅ Nenhum bug em código novo!")
+            page_count = -(-total // issue_page_size)
+            if issue_page > page_count:
+                # Filtros mudaram e a página guardada deixou de existir
+                st.session_state['issues_page'] = issue_page = page_count
+
+            st.number_input(f"Página (de {page_count})", min_value=1, max_value=page_count, step=1, key='issues_page')
+
+            issues_page = page_data['new_code_issues_page']
+            if not issues_page or issues_page['page'] != issue_page:
+                issues_page = get_new_code_issues_page(
+                    project_id, issue_type, issue_page, issue_page_size, severity_filter, issue_files
+                )
+
+            df_issues = issues_to_frame(issues_page['issues'] if issues_page else [])
 
-    with tab2:
-        if issues['vulnerabilities']:
-            df_vuln = pd.DataFrame(issues['vulnerabilities'])
+            first = (issue_page - 1) * issue_page_size
+            st.caption(f"Exibindo {first + 1}–{min(first + issue_page_size, total)} de {total} issues")
             st.dataframe(
-                df_vuln[['severity', 'component', 'message', 'line', 'effort']],
+                df_issues,
                 use_container_width=True,
-                hide_index=True
+                hide_index=True,
+                column_config={'effort': st.column_config.NumberColumn("effort (min)", format="%d")}
             )
-        else:
-            st.success("✅ Nenhuma vulnerabilidade em código novo!")
+    else:
+        st.success("✅ Nenhum problema encontrado em código novo!")
+
+# --- Pontos de Atenção no Código ---
+with trace.section('Pontos de Atenção'):
+    st.header("Pontos de Atenção no Código para Refatoração", divider='orange')
+    size = latest_data.get('size', {})
+    duplication = latest_data.get('duplication', {})
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Complexidade Ciclomática Total", size.get('complexity', 0))
+    with col2:
+        st.metric("Densidade de Duplicação", f"{duplication.get('density', 0)}%")
+
+    # Complexidade por Módulo/Classe
+    st.subheader("Complexidade por Módulo/Classe")
+
+    complexity_data = page_data['complexity']
+
+    if complexity_data and complexity_data.get('stats'):
+        stats = complexity_data['stats']
+        hotspots = stats['hotspots'][:10]  # Top 10 mais complexos
+
+        # Métricas resumidas
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total de Arquivos", stats['totalComponents'])
+        with col2:
+            st.metric("Complexidade Média", stats['avgComplexity'])
+        with col3:
+            st.metric("Complexidade Máxima", stats['maxComplexity'])
+
+        # Tabela dos top 10 mais complexos
+        if hotspots:
+            st.subheader("⚠️ Top 10 Arquivos Mais Complexos")
+            df_complexity = pd.DataFrame(hotspots)
 
-    with tab3:
-        if issues['codeSmells']:
-            df_smells = pd.DataFrame(issues['codeSmells'])
+            # Criar gráfico de barras
+            fig = complexity_bar_figure(df_complexity)
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Tabela detalhada
             st.dataframe(
-                df_smells[['severity', 'component', 'message', 'line', 'effort']],
+                df_complexity[['name', 'complexity', 'cognitiveComplexity', 'linesOfCode']],
                 use_container_width=True,
                 hide_index=True
             )
         else:
-            st.success("✅ Nenhum code smell em código novo!")
-else:
-    st.success("✅ Nenhum problema encontrado em código novo!")
+            st.info("Nenhum dado de complexidade disponível")
+    else:
+        st.info("Dados de complexidade não disponíveis")
 
-# --- Pontos de Atenção no Código ---
-st.header("Pontos de Atenção no Código para Refatoração", divider='orange')
-size = latest_data.get('size', {})
-duplication = latest_data.get('duplication', {})
+# --- Qualidade dos Testes ---
+with trace.section('Qualidade dos Testes'):
+    st.header("Qualidade e Cobertura de Testes", divider='orange')
+    coverage = latest_data.get('coverage', {})
 
-col1, col2 = st.columns(2)
-with col1:
-    st.metric("Complexidade Ciclomática Total", size.get('complexity', 0))
-with col2:
-    st.metric("Densidade de Duplicação", f"{duplication.get('density', 0)}%")
+    # Linhas Não Cobertas por Testes
+    st.subheader("Linhas Cobertas por Testes")
 
-# Complexidade por Módulo/Classe
-st.subheader("Complexidade por Módulo/Classe")
+    coverage_data = page_data['coverage']
 
-complexity_data = get_complexity_data(project_id)
+    if coverage_data and coverage_data.get('worstCoverage'):
+        worst = coverage_data['worstCoverage'][:10]  # Top 10 com pior cobertura
 
-if complexity_data and complexity_data.get('stats'):
-    stats = complexity_data['stats']
-    hotspots = stats['hotspots'][:10]  # Top 10 mais complexos
+        if worst:
+            df_coverage = prepare_worst_coverage(worst)
+            total_uncovered = df_coverage['uncoveredLines'].sum()
+            total_covered = df_coverage['coveredLines'].sum()
 
-    # Métricas resumidas
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Total de Arquivos", stats['totalComponents'])
-    with col2:
-        st.metric("Complexidade Média", stats['avgComplexity'])
-    with col3:
-        st.metric("Complexidade Máxima", stats['maxComplexity'])
-
-    # Tabela dos top 10 mais complexos
-    if hotspots:
-        st.subheader("⚠️ Top 10 Arquivos Mais Complexos")
-        df_complexity = pd.DataFrame(hotspots)
-
-        # Criar gráfico de barras
-        fig = px.bar(
-            df_complexity,
-            x='complexity',
-            y='name',
-            orientation='h',
-            title='Complexidade por Arquivo',
-            labels={'complexity': 'Complexidade Ciclomática', 'name': 'Arquivo'},
-            color='complexity',
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(
-            height=400,
-            showlegend=False,
-            font=dict(size=14),
-            title_font_size=18,
-            xaxis=dict(title_font_size=16),
-            yaxis=dict(title_font_size=16, tickfont=dict(size=13))
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(
+                    "Total de Linhas Cobertas",
+                    f"{int(total_covered):,}",
+                    help="Número total de linhas com cobertura de testes"
+                )
+            with col2:
+                st.metric(
+                    "Total de Linhas Não Cobertas",
+                    f"{int(total_uncovered):,}",
+                    help="Número total de linhas sem cobertura de testes"
+                )
 
-        # Tabela detalhada
-        st.dataframe(
-            df_complexity[['name', 'complexity', 'cognitiveComplexity', 'linesOfCode']],
-            use_container_width=True,
-            hide_index=True
-        )
-    else:
-        st.info("Nenhum dado de complexidade disponível")
-else:
-    st.info("Dados de complexidade não disponíveis")
+            # Gráfico de barras
+            fig = coverage_bar_figure(df_coverage)
+            st.plotly_chart(fig, use_container_width=True)
 
-# --- Qualidade dos Testes ---
-st.header("Qualidade e Cobertura de Testes", divider='orange')
-coverage = latest_data.get('coverage', {})
+            # Tabela
+            st.dataframe(
+                df_coverage[['name', 'coverage', 'uncoveredLines', 'linesToCover']],
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.success("✅ Cobertura de testes excelente!")
+    else:
+        st.info("📊 Dados de cobertura não disponíveis no SonarCloud.\n\nConfigure a análise de cobertura no seu projeto.")
 
-# Linhas Não Cobertas por Testes
-st.subheader("Linhas Cobertas por Testes")
+# --- Explorador de Arquivos ---
+with trace.section('Explorador de Arquivos'):
+    st.header("Explorador de Arquivos", divider='orange')
 
-coverage_data = get_coverage_by_file(project_id)
+    if not (complexity_data and complexity_data.get('components')) and not (coverage_data and coverage_data.get('components')):
+        st.info("Dados por arquivo não disponíveis")
+        st.stop()
 
-if coverage_data and coverage_data.get('worstCoverage'):
-    worst = coverage_data['worstCoverage'][:10]  # Top 10 com pior cobertura
+    # Índice reaproveitado entre interações enquanto o cache devolver os mesmos payloads
+    index = get_hotspot_index(project_id, complexity_data, coverage_data)
+    file_columns = {
+        'path': 'Arquivo',
+        'risk': st.column_config.NumberColumn("Risco", format="%.0f"),
+        'complexity': st.column_config.NumberColumn("Complexidade", format="%d"),
+        'coverage': st.column_config.ProgressColumn("Cobertura (%)", min_value=0, max_value=100, format="%.1f"),
+        'uncoveredLines': st.column_config.NumberColumn("Linhas Não Cobertas", format="%d"),
+        'issues': st.column_config.NumberColumn("Issues", format="%d"),
+        'linesOfCode': st.column_config.NumberColumn("Linhas de Código", format="%d"),
+    }
 
-    if worst:
-        df_coverage = pd.DataFrame(worst)
-        # Calcular linhas cobertas: linesToCover - uncoveredLines
-        df_coverage['coveredLines'] = df_coverage['linesToCover'] - df_coverage['uncoveredLines']
-        total_uncovered = df_coverage['uncoveredLines'].sum()
-        total_covered = df_coverage['coveredLines'].sum()
+    directory = st.text_input("Diretório", key='explorer_directory', placeholder="ex.: src/models (vazio = projeto inteiro)")
+    summary = index.rollup(directory)
 
-        col1, col2 = st.columns(2)
+    if summary is None:
+        st.warning(f"Diretório '{directory}' não encontrado.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric(
-                "Total de Linhas Cobertas",
-                f"{int(total_covered):,}",
-                help="Número total de linhas com cobertura de testes"
-            )
+            st.metric("Arquivos", f"{summary['files']:,}")
         with col2:
-            st.metric(
-                "Total de Linhas Não Cobertas",
-                f"{int(total_uncovered):,}",
-                help="Número total de linhas sem cobertura de testes"
-            )
+            st.metric("Complexidade Total", f"{summary['complexity']:,.0f}")
+        with col3:
+            coverage_value = summary['coverage']
+            st.metric("Cobertura", f"{coverage_value:.1f}%" if coverage_value == coverage_value else '*')
+        with col4:
+            st.metric("Issues", f"{summary['issues']:,.0f}")
 
-        # Gráfico de barras
-        fig = px.bar(
-            df_coverage,
-            x='uncoveredLines',
-            y='name',
-            orientation='h',
-            title='Top 10 Arquivos com Mais Linhas Não Cobertas',
-            labels={'uncoveredLines': 'Linhas Não Cobertas', 'name': 'Arquivo'},
-            color='coverage',
-            color_continuous_scale='RdYlGn'
+        # Ranking de risco: complexidade alta com cobertura baixa
+        st.subheader("🎯 Arquivos de Maior Risco")
+        st.caption("Risco = complexidade² × (1 − cobertura)³ + complexidade: arquivos complexos e pouco testados primeiro.")
+        risk_count = st.slider("Quantidade de arquivos", min_value=5, max_value=100, value=20, step=5, key='explorer_risk_count')
+        st.dataframe(
+            index.risk_ranking(risk_count, directory)[list(file_columns)],
+            column_config=file_columns,
+            use_container_width=True,
+            hide_index=True
         )
-        fig.update_layout(
-            height=400,
-            font=dict(size=14),
-            title_font_size=18,
-            xaxis=dict(title_font_size=16),
-            yaxis=dict(title_font_size=16, tickfont=dict(size=13))
+
+        # Agregados por subdiretório
+        st.subheader("📁 Subdiretórios")
+        df_children = index.children(directory)
+        st.dataframe(
+            df_children[['path', 'kind', 'files', 'risk', 'complexity', 'coverage', 'uncoveredLines', 'issues']],
+            column_config={
+                **file_columns,
+                'path': 'Caminho',
+                'kind': 'Tipo',
+                'files': st.column_config.NumberColumn("Arquivos", format="%d"),
+            },
+            use_container_width=True,
+            hide_index=True
         )
-        st.plotly_chart(fig, use_container_width=True)
 
-        # Tabela
+        # Top-K por qualquer métrica
+        st.subheader("📊 Top Arquivos por Métrica")
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            metric_label = st.selectbox("Métrica", options=list(METRIC_LABELS), key='explorer_metric')
+        with col2:
+            top_count = st.number_input("Quantidade", min_value=1, max_value=500, value=10, key='explorer_top_count')
+        with col3:
+            lowest_first = st.toggle("Menores primeiro", value=METRIC_LABELS[metric_label] == 'coverage', key='explorer_ascending')
         st.dataframe(
-            df_coverage[['name', 'coverage', 'uncoveredLines', 'linesToCover']],
+            index.top(METRIC_LABELS[metric_label], int(top_count), directory, ascending=lowest_first)[list(file_columns)],
+            column_config=file_columns,
             use_container_width=True,
             hide_index=True
         )
-    else:
-        st.success("✅ Cobertura de testes excelente!")
-else:
-    st.info("📊 Dados de cobertura não disponíveis no SonarCloud.\n\nConfigure a análise de cobertura no seu projeto.")
+
+    # Busca por nome/caminho em todo o projeto
+    st.subheader("🔎 Buscar Arquivo")
+    query = st.text_input("Trecho do caminho", key='explorer_search', placeholder="ex.: models/user")
+    if query:
+        df_found = index.search(query, EXPLORER_SEARCH_LIMIT)
+        if df_found.empty:
+            st.info("Nenhum arquivo encontrado")
+        else:
+            if len(df_found) == EXPLORER_SEARCH_LIMIT:
+                st.caption(f"Exibindo os {EXPLORER_SEARCH_LIMIT} primeiros resultados.")
+            st.dataframe(
+                df_found[list(file_columns)],
+                column_config=file_columns,
+                use_container_width=True,
+                hide_index=True
+            )
+
+trace.finish()
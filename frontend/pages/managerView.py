@@ -1,9 +1,25 @@
 # pages/managerView.py
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-from utils import display_sidebar, get_latest_metrics, get_metrics_history, get_dora_metrics, render_no_data, minutes_to_days, format_rating, format_lead_time
+from figures import effort_pie_figure, debt_trend_figure, dora_trend_figure
+from instrumentation import start_page
+from live import live_controls, live_fragment, section_data, mark_updated
+from utils import (
+    display_sidebar, prefetch, render_no_data, minutes_to_days, format_rating, format_lead_time, get_trends,
+    get_latest_metrics, get_history_frame, get_dora_deployments, get_dora_metrics, prepare_debt_trend,
+)
+from analytics import HIGHER_IS_BETTER
+from dora import DORA_HISTORY_DAYS, deployment_log
+
+# Períodos disponíveis para o gráfico de tendência (em horas)
+HISTORY_PERIODS = {'7 dias': 168, '30 dias': 720, '90 dias': 2160, '1 ano': 8760}
+# Quantidade máxima de pontos enviados ao navegador no gráfico de tendência
+HISTORY_MAX_POINTS = 500
+# Janela da média móvel exibida no gráfico de tendência (em horas)
+TREND_ROLLING_HOURS = 24
+# Janelas (em dias) oferecidas para as métricas DORA, limitadas ao período buscado
+DORA_WINDOWS = [d for d in (7, 14, 30, 60, 90, 180, 365) if d <= DORA_HISTORY_DAYS]
+# Métricas exibidas como indicadores de tendência
+TREND_BADGES = ['technicalDebtMinutes', 'bugs', 'vulnerabilities', 'codeSmells', 'coverage', 'duplication']
 
 st.set_page_config(page_title="Visão Gerencial", page_icon="👨‍💼", layout="wide")
 
@@ -13,128 +29,215 @@ st.markdown("Métricas e Indicadores-Chave de Desempenho para gestores acompanha
 
 # Sidebar e seleção de projeto
 project_id = display_sidebar()
+trace = start_page('managerView')
 
 if not project_id:
     st.info("Selecione um projeto na barra lateral para visualizar os dados.")
-    st.stop()
-
-# Carregar dados
-latest_data = get_latest_metrics(project_id)
-history_data = get_metrics_history(project_id)
-dora_data = get_dora_metrics(project_id, days=30)
+    trace.stop()
+
+# Carregar dados (em paralelo); as seções leem dos caches populados aqui
+with trace.section('Carregamento de dados'):
+    history_period = st.session_state.get('history_period', '7 dias')
+    history_hours = HISTORY_PERIODS[history_period]
+    page_data = prefetch(
+        project_id,
+        ['latest_metrics', 'trends', 'dora_deployments'],
+        params={
+            'dora_deployments': {'days': DORA_HISTORY_DAYS},
+            'trends': {'hours': history_hours},
+        }
+    )
+    latest_data = page_data['latest_metrics']
 
 if not latest_data:
     render_no_data()
-    st.stop()
+    trace.stop()
+
+# Atualização automática: cada seção é um fragmento e só recarrega quando há snapshot novo
+live = live_controls('managerView', project_id, latest_data.get('timestamp'))
+section = live_fragment(live)
+
+
+def load_key_indicators(dora_days):
+    """(manutenibilidade, código novo, métricas DORA, série DORA) da seção de indicadores."""
+    latest = get_latest_metrics(project_id) or {}
+    # Métricas DORA da janela escolhida, calculadas localmente sobre os deployments
+    # (trocar a janela não consulta o backend); sem deployments, usa o agregado do backend
+    deployments = get_dora_deployments(project_id, DORA_HISTORY_DAYS)
+    dora_log = deployment_log(project_id, deployments) if deployments is not None else None
+    dora_data = dora_log.metrics(dora_days) if dora_log is not None else get_dora_metrics(project_id, dora_days)
+    df_dora = dora_log.series(dora_days) if dora_log is not None and len(dora_log) else None
+    return latest.get('maintainability', {}), latest.get('newCode', {}), dora_data, df_dora
+
+
+def load_visual_analysis(hours):
+    """(taxa de dívida, tendência reduzida, eventos) da seção de análise visual."""
+    latest = get_latest_metrics(project_id) or {}
+    debt_ratio = latest.get('maintainability', {}).get('debtRatio', 0)
+    df_history = get_history_frame(project_id, hours, TREND_ROLLING_HOURS)
+    if df_history is None or df_history.empty:
+        return debt_ratio, None, None
+    # Calculado sobre o histórico já carregado acima (sem nova consulta ao backend)
+    _, trend_events = get_trends(project_id, hours)
+    df_trend, df_events = prepare_debt_trend(df_history, trend_events, HISTORY_MAX_POINTS)
+    return debt_ratio, df_trend, df_events
+
 
 # --- Métricas Chave ---
-st.header("Indicadores-Chave de Desempenho Principais", divider='blue')
-maintainability = latest_data.get('maintainability', {})
-
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric(
-        label="Taxa de Dívida Técnica",
-        value=f"{maintainability.get('debtRatio', '*' )}%",
-        help="Proporção do esforço de refatoração necessário em relação ao custo de desenvolvimento."
-    )
-with col2:
-    st.metric(
-        label="Rating de Manutenibilidade",
-        value=format_rating(maintainability.get('rating')),
-        help="Avaliação da manutenibilidade do código (A-E)."
-    )
-with col3:
-    lead_time_value = "*"
-    total_deploys = 0
-    if dora_data:
-        # Handle new nested structure from API
-        lead_time_data = dora_data.get('leadTime', {})
-        if lead_time_data.get('average') is not None:
-            lead_time_value = format_lead_time(lead_time_data['average'])
-
-        # Get total deployments from deployment frequency
-        deploy_freq = dora_data.get('deploymentFrequency', {})
-        total_deploys = deploy_freq.get('total', 0)
-
-    st.metric(
-        label="⏱️ Tempo de Espera para Mudanças",
-        value=lead_time_value,
-        help=f"📊 Métrica DORA\n\nTempo médio desde o commit até a produção (deploy).\n\n🎯 Classificação:\n• Elite: < 1 hora\n• Alto: < 1 dia\n• Médio: 1 dia - 1 semana\n• Baixo: > 1 semana\n\n{'📈 Baseado em ' + str(total_deploys) + ' deploys nos últimos 30 dias.' if dora_data else '⚠️ Nenhum deploy registrado ainda.'}"
+@section
+def key_indicators():
+    dora_days = st.session_state.get('dora_window', 30)
+    maintainability, new_code, dora_data, df_dora = section_data(
+        live, 'Indicadores-Chave', dora_days, lambda: load_key_indicators(dora_days)
     )
-with col4:
-    cfr_value = "*"
-    if dora_data:
-        # Handle new nested structure from API
-        cfr_data = dora_data.get('changeFailureRate', {})
-        if cfr_data.get('rate') is not None:
-            cfr_value = f"{cfr_data['rate']}%"
-
-    st.metric(
-        label="🚨 Taxa de Falha em Mudanças",
-        value=cfr_value,
-        help=f"📊 Métrica DORA\n\nPercentual de deploys que causam falhas em produção (requerem hotfix, rollback ou patch).\n\n🎯 Classificação:\n• Elite: 0-15%\n• Alto: 16-30%\n• Médio: 31-45%\n• Baixo: > 45%\n\n{'📈 Baseado em ' + str(total_deploys) + ' deploys nos últimos 30 dias.' if dora_data else '⚠️ Nenhum deploy registrado ainda.'}"
+    mark_updated(live, 'Indicadores-Chave')
+    st.select_slider(
+        "Janela das métricas DORA", options=DORA_WINDOWS, value=dora_days if dora_days in DORA_WINDOWS else 30,
+        format_func=lambda days: f"{days} dias", key='dora_window'
     )
 
-# --- Limiar de Qualidade para Código Novo ---
-st.subheader("Limiar de Qualidade em Código Novo")
-new_code = latest_data.get('newCode', {})
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(
+            label="Taxa de Dívida Técnica",
+            value=f"{maintainability.get('debtRatio', '*' )}%",
+            help="Proporção do esforço de refatoração necessário em relação ao custo de desenvolvimento."
+        )
+    with col2:
+        st.metric(
+            label="Rating de Manutenibilidade",
+            value=format_rating(maintainability.get('rating')),
+            help="Avaliação da manutenibilidade do código (A-E)."
+        )
+    with col3:
+        lead_time_value = "*"
+        total_deploys = 0
+        if dora_data:
+            # Handle new nested structure from API
+            lead_time_data = dora_data.get('leadTime', {})
+            if lead_time_data.get('average') is not None:
+                lead_time_value = format_lead_time(lead_time_data['average'])
+
+            # Get total deployments from deployment frequency
+            deploy_freq = dora_data.get('deploymentFrequency', {})
+            total_deploys = deploy_freq.get('total', 0)
+
+        st.metric(
+            label="⏱️ Tempo de Espera para Mudanças",
+            value=lead_time_value,
+            help=f"📊 Métrica DORA\n\nTempo médio desde o commit até a produção (deploy).\n\n🎯 Classificação:\n• Elite: < 1 hora\n• Alto: < 1 dia\n• Médio: 1 dia - 1 semana\n• Baixo: > 1 semana\n\n{'📈 Baseado em ' + str(total_deploys) + f' deploys nos últimos {dora_days} dias.' if dora_data else '⚠️ Nenhum deploy registrado ainda.'}"
+        )
+    with col4:
+        cfr_value = "*"
+        if dora_data:
+            # Handle new nested structure from API
+            cfr_data = dora_data.get('changeFailureRate', {})
+            if cfr_data.get('rate') is not None:
+                cfr_value = f"{cfr_data['rate']}%"
+
+        st.metric(
+            label="🚨 Taxa de Falha em Mudanças",
+            value=cfr_value,
+            help=f"📊 Métrica DORA\n\nPercentual de deploys que causam falhas em produção (requerem hotfix, rollback ou patch).\n\n🎯 Classificação:\n• Elite: 0-15%\n• Alto: 16-30%\n• Médio: 31-45%\n• Baixo: > 45%\n\n{'📈 Baseado em ' + str(total_deploys) + f' deploys nos últimos {dora_days} dias.' if dora_data else '⚠️ Nenhum deploy registrado ainda.'}"
+        )
+
+    # --- Evolução das métricas DORA (janela móvel) ---
+    if df_dora is not None:
+        with st.expander(f"📈 Evolução DORA (janela móvel de {dora_days} dias)"):
+            lead = dora_data.get('leadTime', {}).get('percentiles', {})
+            if lead:
+                st.caption("Lead time: " + " · ".join(f"{name} {format_lead_time(value)}" for name, value in lead.items()))
+            st.plotly_chart(dora_trend_figure(df_dora), use_container_width=True)
+
+    # --- Limiar de Qualidade para Código Novo ---
+    st.subheader("Limiar de Qualidade em Código Novo")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Novos Bugs", new_code.get('bugs', '*'), delta_color="inverse")
+    with col2:
+        st.metric("Novas Vulnerabilidades", new_code.get('vulnerabilities', '*'), delta_color="inverse")
+
+
+with trace.section('Indicadores-Chave'):
+    st.header("Indicadores-Chave de Desempenho Principais", divider='blue')
+    key_indicators()
+
+
+# --- Tendências ---
+@section
+def period_trends(hours, period):
+    trend_rows = section_data(live, 'Tendências', hours, lambda: get_trends(project_id, hours)[0])
+    mark_updated(live, 'Tendências')
+
+    trends = {row['field']: row for row in trend_rows}
+    period_label = 'na semana' if hours == 168 else f'em {period}'
+    columns = st.columns(len(TREND_BADGES))
+    for col, field in zip(columns, TREND_BADGES):
+        row = trends.get(field)
+        with col:
+            if not row or row['last'] is None:
+                st.metric(row['label'] if row else field, '*')
+                continue
+            if field == 'technicalDebtMinutes':
+                value = minutes_to_days(int(row['last']))
+            elif field in ('coverage', 'duplication'):
+                value = f"{row['last']:.1f}%"
+            else:
+                value = f"{row['last']:,.0f}".replace(',', '.')
+            if row['pct'] is not None:
+                delta = f"{row['pct']:+.0f}% {period_label}"
+            else:  # partiu de zero: variação absoluta
+                delta = f"{row['delta']:+,.0f} {period_label}".replace(',', '.')
+            notes = []
+            if row['regressions']:
+                notes.append(f"{row['regressions']} regressão(ões) detectada(s)")
+            if row['anomalies']:
+                notes.append(f"{row['anomalies']} anomalia(s)")
+            st.metric(
+                row['label'], value, delta=delta,
+                delta_color='normal' if field in HIGHER_IS_BETTER else 'inverse',
+                help=f"Inclinação: {row['slopePerDay']:+.2f} por dia" if row['slopePerDay'] is not None else None
+            )
+            if notes:
+                st.caption("⚠️ " + " · ".join(notes))
+
+
+with trace.section('Tendências'):
+    st.header("Tendências do Período", divider='blue')
+    # Muda a janela de todas as seções: fora dos fragmentos, reexecuta a página
+    st.selectbox("Período", options=list(HISTORY_PERIODS), key='history_period')
+    period_trends(history_hours, history_period)
 
-col1, col2 = st.columns(2)
-with col1:
-    st.metric("Novos Bugs", new_code.get('bugs', '*'), delta_color="inverse")
-with col2:
-    st.metric("Novas Vulnerabilidades", new_code.get('vulnerabilities', '*'), delta_color="inverse")
 
 # --- Visualizações ---
-st.header("Análise Visual", divider='blue')
-
-col1, col2 = st.columns(2)
-
-with col1:
-    # Gráfico de Pizza: Dívida Técnica vs. Esforço Total
-    st.subheader("Composição do Esforço")
-    debt_ratio = maintainability.get('debtRatio', 0)
-    esforco_produtivo = 100 - debt_ratio
-    
-    fig_pie = go.Figure(data=[go.Pie(
-        labels=['Esforço Produtivo', 'Pagamento de Dívida'],
-        values=[esforco_produtivo, debt_ratio],
-        hole=.4,
-        marker_colors=['#2575FC', '#FFB000'],
-        textfont=dict(size=16)
-    )])
-    fig_pie.update_layout(
-        legend_title_text='Tipo de Esforço',
-        height=400,
-        font=dict(size=14),
-        legend=dict(font=dict(size=14))
+@section
+def visual_analysis(hours):
+    debt_ratio, df_trend, df_events = section_data(
+        live, 'Análise Visual', hours, lambda: load_visual_analysis(hours)
     )
-    st.plotly_chart(fig_pie, use_container_width=True)
-
-with col2:
-    # Gráfico de Linha: Tendência da Dívida Técnica
-    st.subheader("Tendência da Dívida Técnica Acumulada")
-    if history_data:
-        df_history = pd.DataFrame(history_data)
-        df_history['timestamp'] = pd.to_datetime(df_history['timestamp'])
-        df_history['technicalDebtHours'] = df_history['technicalDebtMinutes'] / 60
-
-        fig_line = px.line(
-            df_history,
-            x='timestamp',
-            y='technicalDebtHours',
-            title="Evolução da Dívida Técnica",
-            labels={'timestamp': 'Período', 'technicalDebtHours': 'Dívida (horas)'},
-            markers=True
-        )
-        fig_line.update_layout(
-            height=400,
-            font=dict(size=14),
-            title_font_size=18,
-            xaxis=dict(title_font_size=16, tickfont=dict(size=13)),
-            yaxis=dict(title_font_size=16, tickfont=dict(size=13))
-        )
-        st.plotly_chart(fig_line, use_container_width=True)
-    else:
-        st.info("Dados históricos insuficientes para gerar o gráfico de tendência.")
+    mark_updated(live, 'Análise Visual')
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Gráfico de Pizza: Dívida Técnica vs. Esforço Total
+        st.subheader("Composição do Esforço")
+        fig_pie = effort_pie_figure(debt_ratio)
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+    with col2:
+        # Gráfico de Linha: Tendência da Dívida Técnica
+        st.subheader("Tendência da Dívida Técnica Acumulada")
+        if df_trend is not None:
+            fig_line = debt_trend_figure(df_trend, df_events)
+            st.plotly_chart(fig_line, use_container_width=True)
+        else:
+            st.info("Dados históricos insuficientes para gerar o gráfico de tendência.")
+
+
+with trace.section('Análise Visual'):
+    st.header("Análise Visual", divider='blue')
+    visual_analysis(history_hours)
+
+trace.finish()
@@ -0,0 +1,195 @@
+# pages/portfolioView.py
+import os
+
+import streamlit as st
+from instrumentation import start_page
+from utils import display_sidebar, get_projects, prefetch_many, render_no_data, format_lead_time
+from portfolio import build_portfolio_frame, SCORE_COLUMNS
+from figures import score_heatmap_figure
+
+st.set_page_config(page_title="Visão de Portfólio", page_icon="🗂️", layout="wide")
+
+# Limite de chamadas simultâneas ao backend ao carregar todos os projetos
+PORTFOLIO_WORKERS = int(os.getenv("PORTFOLIO_WORKERS", "8"))
+# Quantidade máxima de projetos exibidos no mapa de calor
+HEATMAP_MAX_PROJECTS = 60
+
+# Título e descrição
+st.title("🗂️ Visão de Portfólio")
+st.markdown("Comparação da saúde de todos os projetos monitorados, com ranking pelas dimensões de qualidade do radar.")
+
+display_sidebar()
+trace = start_page('portfolioView')
+
+projects_data = get_projects()
+if not projects_data or not projects_data.get('projects'):
+    render_no_data()
+    trace.stop()
+
+projects = projects_data['projects']
+
+# Carregar métricas de todos os projetos (paralelo e limitado)
+with trace.section('Carregamento de dados'):
+    with st.spinner(f"Carregando métricas de {len(projects)} projetos..."):
+        data_by_project = prefetch_many(
+            [p['id'] for p in projects],
+            ['latest_metrics', 'dora_metrics'],
+            params={'dora_metrics': {'days': 30}},
+            max_workers=PORTFOLIO_WORKERS
+        )
+
+df = build_portfolio_frame(projects, data_by_project)
+df_valid = df[df['hasData']]
+
+if df_valid.empty:
+    render_no_data()
+    trace.stop()
+
+# --- Resumo ---
+with trace.section('Resumo do Portfólio'):
+    st.header("Resumo do Portfólio", divider='violet')
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Projetos com Dados", f"{len(df_valid)}/{len(df)}")
+    with col2:
+        st.metric("Índice de Qualidade Médio", f"{df_valid['qualityIndex'].mean():.0f}/100")
+    with col3:
+        st.metric("Dívida Técnica Total", f"{df_valid['technicalDebtMinutes'].sum() / 60:,.0f}h")
+    with col4:
+        median_lead_time = df_valid['leadTimeMinutes'].median()
+        st.metric(
+            "Lead Time Mediano",
+            format_lead_time(float(median_lead_time)) if median_lead_time == median_lead_time else '*'
+        )
+
+# --- Ranking ---
+with trace.section('Ranking de Projetos'):
+    st.header("Ranking de Projetos", divider='violet')
+
+    sort_options = {'Índice de Qualidade': 'qualityIndex', **SCORE_COLUMNS, 'Taxa de Dívida': 'debtRatio'}
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_label = st.selectbox("Ordenar por", options=list(sort_options))
+    with col2:
+        ascending = st.toggle("Piores primeiro", value=True)
+
+    df_ranking = df_valid.sort_values(sort_options[sort_label], ascending=ascending, na_position='last')
+
+    score_config = {
+        column: st.column_config.ProgressColumn(label, min_value=0, max_value=100, format="%.0f")
+        for label, column in SCORE_COLUMNS.items()
+    }
+    st.dataframe(
+        df_ranking[['name', 'qualityIndex', *SCORE_COLUMNS.values(), 'debtRatio', 'bugs', 'vulnerabilities', 'changeFailureRate']],
+        column_config={
+            'name': 'Projeto',
+            'qualityIndex': st.column_config.ProgressColumn("Índice de Qualidade", min_value=0, max_value=100, format="%.0f"),
+            **score_config,
+            'debtRatio': st.column_config.NumberColumn("Taxa de Dívida (%)", format="%.1f"),
+            'bugs': st.column_config.NumberColumn("Bugs", format="%d"),
+            'vulnerabilities': st.column_config.NumberColumn("Vulnerabilidades", format="%d"),
+            'changeFailureRate': st.column_config.NumberColumn("Taxa de Falha (%)", format="%.1f"),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+# --- Mapa de Calor ---
+with trace.section('Mapa de Calor'):
+    st.header("Mapa de Calor das Dimensões", divider='violet')
+
+    df_heat = df_ranking.head(HEATMAP_MAX_PROJECTS)
+    if len(df_ranking) > HEATMAP_MAX_PROJECTS:
+        st.caption(f"Exibindo os {HEATMAP_MAX_PROJECTS} primeiros projetos do ranking atual.")
+
+    fig_heat = score_heatmap_figure(
+        df_heat[list(SCORE_COLUMNS.values())].to_numpy(),
+        list(SCORE_COLUMNS),
+        df_heat['name'].tolist()
+    )
+    st.plotly_chart(fig_heat, use_container_width=True)
+
+# --- Exportação ---
+with trace.section('Exportar Snapshot'):
+    with st.expander("📦 Exportar snapshot offline"):
+        st.caption(
+            "Gera um arquivo com métricas, histórico, DORA, issues, complexidade e cobertura dos projetos "
+            "em Arrow/Parquet. Descompacte e abra com SONARVIEW_SNAPSHOT=<diretório> para revisar sem acessar a API."
+        )
+        names = {p['id']: p['name'] for p in projects}
+        selected = st.multiselect("Projetos", options=list(names), format_func=names.get, key='snapshot_projects')
+        snapshot_format = st.radio(
+            "Formato", ['arrow', 'parquet'], horizontal=True, key='snapshot_format',
+            format_func={'arrow': 'Arrow (abertura instantânea)', 'parquet': 'Parquet (compacto)'}.get
+        )
+        if st.button("Gerar snapshot", key='snapshot_generate'):
+            from memory import remember
+            from snapshots import export_zip
+            with st.spinner("Exportando..."):
+                # Despejável pelo limite de memória da sessão (pode ser gerado de novo)
+                remember('snapshot_zip', export_zip(selected or None, snapshot_format))
+        if st.session_state.get('snapshot_zip'):
+            st.download_button(
+                "⬇️ Baixar snapshot (.zip)",
+                data=st.session_state.snapshot_zip,
+                file_name="sonarview-snapshot.zip",
+                mime="application/zip"
+            )
+
+# --- Relatórios ---
+with trace.section('Relatórios em Lote'):
+    with st.expander("📄 Relatórios em lote (HTML)"):
+        from reports import KALEIDO_AVAILABLE, REPORT_PROGRESS_SECONDS, current_job, start_job
+
+        st.caption(
+            "Gera, em processos separados e em segundo plano, um relatório por projeto com as Visões Gerencial "
+            "e do Desenvolvedor (gráficos interativos" + (" e imagens" if KALEIDO_AVAILABLE else "") + ")."
+        )
+        names = {p['id']: p['name'] for p in projects}
+        selected = st.multiselect("Projetos", options=list(names), format_func=names.get, key='report_projects')
+        job = current_job()
+        if st.button("Gerar relatórios", key='report_generate', disabled=job is not None and job.running):
+            job = start_job([p for p in projects if not selected or p['id'] in selected])
+
+        polling = job is not None and job.running
+
+        # Atualiza só o progresso enquanto o lote roda; ao terminar, reexecuta a página para parar a consulta
+        @st.fragment(run_every=REPORT_PROGRESS_SECONDS if polling else None)
+        def report_progress():
+            job = current_job()
+            if job is None:
+                return
+            progress = job.progress()
+            if polling and not progress['running']:
+                st.rerun()
+            st.progress(progress['done'] / progress['total'], text=f"{progress['done']}/{progress['total']} projetos · {progress['elapsed']:.0f}s")
+            st.dataframe(
+                [{'Projeto': p['name'], 'Status': p['status'], 'Tempo (s)': p['seconds']} for p in progress['projects']],
+                use_container_width=True,
+                hide_index=True
+            )
+            if progress['running']:
+                return
+            if progress['error']:
+                st.error(f"O lote falhou: {progress['error']}")
+                return
+            if progress['failed']:
+                st.warning(f"{progress['failed']} relatório(s) falharam.")
+            st.caption(f"Lote em {job.out_dir}")
+            if st.button("Preparar download", key='report_zip_prepare'):
+                from memory import remember
+                # Despejável pelo limite de memória da sessão (pode ser gerado de novo)
+                remember('report_zip', (job.out_dir, job.zip_bytes()))
+            prepared = st.session_state.get('report_zip')
+            if prepared and prepared[0] == job.out_dir:
+                st.download_button(
+                    "⬇️ Baixar relatórios (.zip)",
+                    data=prepared[1],
+                    file_name="sonarview-relatorios.zip",
+                    mime="application/zip"
+                )
+
+        report_progress()
+
+trace.finish()
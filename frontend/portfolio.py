@@ -0,0 +1,82 @@
+# frontend/portfolio.py
+# Consolidação das métricas de vários projetos em um único DataFrame
+import numpy as np
+import pandas as pd
+
+import ratings
+
+# Dimensões do radar (mesma ordem de prepare_radar_data) -> coluna de score
+SCORE_COLUMNS = {
+    'Confiabilidade': 'reliabilityScore',
+    'Segurança': 'securityScore',
+    'Manutenibilidade': 'maintainabilityScore',
+    'Cobertura de Testes': 'coverageScore',
+    'Qualidade do Código': 'codeQualityScore',
+}
+
+# Campos achatados do payload de /metrics/latest e /dora/metrics: (coluna, origem, caminho)
+PORTFOLIO_FIELDS = [
+    ('reliabilityRating', 'latest', ('reliability', 'rating')),
+    ('securityRating', 'latest', ('security', 'rating')),
+    ('maintainabilityRating', 'latest', ('maintainability', 'rating')),
+    ('coverage', 'latest', ('coverage', 'overall')),
+    ('duplication', 'latest', ('duplication', 'density')),
+    ('debtRatio', 'latest', ('maintainability', 'debtRatio')),
+    ('technicalDebtMinutes', 'latest', ('technicalDebtMinutes',)),
+    ('bugs', 'latest', ('reliability', 'bugs')),
+    ('vulnerabilities', 'latest', ('security', 'vulnerabilities')),
+    ('codeSmells', 'latest', ('maintainability', 'codeSmells')),
+    ('deploysPerDay', 'dora', ('deploymentFrequency', 'perDay')),
+    ('leadTimeMinutes', 'dora', ('leadTime', 'average')),
+    ('changeFailureRate', 'dora', ('changeFailureRate', 'rate')),
+    ('mttrMinutes', 'dora', ('meanTimeToRestore', 'average')),
+]
+
+# Valor usado quando a chave não existe no payload (prepare_radar_data usa density=0)
+_MISSING_DEFAULTS = {'duplication': 0}
+
+
+def _extract(payload, path, missing=None):
+    value = payload
+    for part in path:
+        if not isinstance(value, dict) or part not in value:
+            return missing
+        value = value[part]
+    return value
+
+
+def build_portfolio_frame(projects, data_by_project):
+    """Monta o DataFrame do portfólio e calcula os scores do radar de forma vetorizada.
+
+    `projects` é a lista de projetos de /api/projects e `data_by_project` mapeia
+    id -> {'latest_metrics': ..., 'dora_metrics': ...}. Projetos sem métricas
+    ficam com hasData=False.
+    """
+    ids = [p['id'] for p in projects]
+    sources = {
+        'latest': [data_by_project.get(pid, {}).get('latest_metrics') or {} for pid in ids],
+        'dora': [data_by_project.get(pid, {}).get('dora_metrics') or {} for pid in ids],
+    }
+
+    df = pd.DataFrame({
+        'id': ids,
+        'name': [p.get('name', p['id']) for p in projects],
+        'hasData': [bool(payload) for payload in sources['latest']],
+    })
+    for column, source, path in PORTFOLIO_FIELDS:
+        missing = _MISSING_DEFAULTS.get(column)
+        df[column] = [_extract(payload, path, missing) for payload in sources[source]]
+
+    numeric_columns = [c for c, _, _ in PORTFOLIO_FIELDS if not c.endswith('Rating')]
+    df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce').astype(np.float32)
+
+    # Scores do radar, com as mesmas regras de prepare_radar_data
+    df['reliabilityScore'] = ratings.ratings_to_scores(df['reliabilityRating'])
+    df['securityScore'] = ratings.ratings_to_scores(df['securityRating'])
+    df['maintainabilityScore'] = ratings.ratings_to_scores(df['maintainabilityRating'])
+    df['coverageScore'] = df['coverage'].fillna(0).astype(np.float32)
+    df['codeQualityScore'] = (100 - df['duplication']).clip(lower=0).fillna(ratings.NEUTRAL_SCORE).astype(np.float32)
+    df['qualityIndex'] = df[list(SCORE_COLUMNS.values())].mean(axis=1).astype(np.float32)
+
+    df.loc[~df['hasData'], list(SCORE_COLUMNS.values()) + ['qualityIndex']] = np.nan
+    return df
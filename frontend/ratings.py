@@ -0,0 +1,225 @@
+# frontend/ratings.py
+# Conversões de rating, score, cor e cobertura (escalares e vetorizadas)
+#
+# NumPy e pandas só são importados pelas funções vetorizadas: as escalares são
+# usadas na primeira renderização da página inicial, que não precisa deles.
+import functools
+
+# Tabelas de conversão pré-calculadas
+RATING_LETTERS = {1.0: 'A', 2.0: 'B', 3.0: 'C', 4.0: 'D', 5.0: 'E'}
+LETTER_CODES = {'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5}
+SCORE_BY_VALUE = {1.0: 100, 2.0: 75, 3.0: 50, 4.0: 25, 5.0: 0}
+SCORE_BY_LETTER = {'A': 100, 'B': 75, 'C': 50, 'D': 25, 'E': 0}
+COLOR_BY_LETTER = {'A': 'green', 'B': 'orange', 'C': 'orange', 'D': 'red', 'E': 'red'}
+
+# Score usado quando não há rating (valor neutro)
+NEUTRAL_SCORE = 50
+MISSING_COLOR = 'grey'
+
+# Dimensões do radar de qualidade (na ordem do gráfico) e seus pesos no índice composto
+QUALITY_DIMENSIONS = ['reliabilityScore', 'securityScore', 'maintainabilityScore', 'coverageScore', 'codeQualityScore']
+QUALITY_WEIGHTS = {name: 0.2 for name in QUALITY_DIMENSIONS}
+
+
+# ==========================================
+# FUNÇÕES ESCALARES
+# ==========================================
+
+def rating_letter(rating):
+    """Formata o rating para exibição (A, B, C, D, E)."""
+    try:
+        return RATING_LETTERS.get(float(rating), rating)
+    except (ValueError, TypeError):
+        return rating
+
+
+def rating_color(rating):
+    """Retorna uma cor baseada no rating."""
+    return COLOR_BY_LETTER.get(rating_letter(rating), MISSING_COLOR)
+
+
+def rating_score(rating):
+    """Converte rating (A-E ou 1-5) para escala 0-100."""
+    if rating is None or rating == '*':
+        return NEUTRAL_SCORE
+    try:
+        score = SCORE_BY_VALUE.get(float(rating))
+        if score is not None:
+            return score
+    except (ValueError, TypeError):
+        pass
+    return SCORE_BY_LETTER.get(str(rating), NEUTRAL_SCORE)
+
+
+def coverage_score(coverage):
+    """Score da cobertura: o próprio percentual (0 sem dado)."""
+    return float(coverage) if is_numeric(coverage) else 0
+
+
+def duplication_score(duplication):
+    """Score da duplicação invertida: 0% duplicado = 100 (NEUTRAL_SCORE sem dado)."""
+    return max(0, 100 - float(duplication)) if is_numeric(duplication) else NEUTRAL_SCORE
+
+
+def quality_index(scores):
+    """Índice de qualidade composto: média ponderada dos scores das dimensões (dict dimensão -> score)."""
+    return sum(QUALITY_WEIGHTS[name] * scores[name] for name in QUALITY_DIMENSIONS) / sum(QUALITY_WEIGHTS.values())
+
+
+def is_numeric(value):
+    """Verifica se um valor é numérico (não é '*' ou None)."""
+    if value == '*' or value is None:
+        return False
+    try:
+        float(value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def coverage_text(coverage_value):
+    """Formata valores de cobertura para exibição."""
+    if coverage_value == '*' or coverage_value is None:
+        return '*'
+    try:
+        return f"{float(coverage_value):.1f}%"
+    except (ValueError, TypeError):
+        return '*'
+
+
+# ==========================================
+# FUNÇÕES VETORIZADAS
+# ==========================================
+# Aceitam pandas Series, arrays NumPy ou listas. NaN é tratado como ausência de dado.
+
+@functools.cache
+def _code_tables():
+    """Tabelas (scores, letras, cores) indexadas pelo código do rating (0 = sem dado, 1..5 = A..E)."""
+    import numpy as np
+    return (
+        np.array([np.nan, 100, 75, 50, 25, 0], dtype=np.float32),
+        np.array([None, 'A', 'B', 'C', 'D', 'E'], dtype=object),
+        np.array([MISSING_COLOR, 'green', 'orange', 'orange', 'red', 'red'], dtype=object),
+    )
+
+
+def _as_series(values):
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(values, pd.Series):
+        return values
+    return pd.Series(np.asarray(values, dtype=object) if not isinstance(values, np.ndarray) else values)
+
+
+def _apply_on_categories(series, func):
+    """Aplica `func` só às categorias de uma Series categórica (evita percorrer as linhas)."""
+    import numpy as np
+    import pandas as pd
+
+    categories = pd.Series(series.cat.categories)
+    mapped = np.asarray(func(categories))
+    codes = series.cat.codes.to_numpy()
+    result = mapped[codes] if len(mapped) else np.empty(len(codes), dtype=mapped.dtype)
+    return codes, result
+
+
+def rating_codes(values):
+    """Converte ratings (1-5, '1.0', 'A'-'E') em códigos int8 1..5 (0 = sem dado)."""
+    import numpy as np
+    import pandas as pd
+
+    series = _as_series(values)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, mapped = _apply_on_categories(series, rating_codes)
+        return np.where(codes >= 0, mapped, 0).astype(np.int8)
+
+    numeric = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = np.isin(numeric, (1.0, 2.0, 3.0, 4.0, 5.0))
+    codes = np.where(valid, np.nan_to_num(numeric), 0).astype(np.int8)
+
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        letters = series.map(LETTER_CODES).to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.where(~valid & ~np.isnan(letters), np.nan_to_num(letters), codes).astype(np.int8)
+    return codes
+
+
+def ratings_to_scores(values):
+    """Converte ratings em scores 0-100 (NEUTRAL_SCORE quando não há rating válido)."""
+    import numpy as np
+
+    scores = _code_tables()[0][rating_codes(values)]
+    return np.where(np.isnan(scores), NEUTRAL_SCORE, scores).astype(np.float32)
+
+
+def quality_scores(reliability, security, maintainability, coverage, duplication):
+    """Scores das dimensões do radar e o índice composto para vários snapshots de uma vez.
+
+    Os ratings chegam como códigos int8 (rating_codes) e cobertura/duplicação
+    em percentual (NaN sem dado). Mesmas regras das funções escalares: o
+    cálculo é feito em float64 e só o resultado, que vai para o histórico, é
+    guardado em float32. Retorna {dimensão: float32} mais 'qualityIndex'.
+    """
+    import numpy as np
+
+    table = _code_tables()[0]
+    coverage = np.asarray(coverage, dtype=np.float64)
+    duplication = np.asarray(duplication, dtype=np.float64)
+    scores = {
+        name: np.where(np.isnan(table[codes]), NEUTRAL_SCORE, table[codes]).astype(np.float64)
+        for name, codes in zip(QUALITY_DIMENSIONS[:3], (reliability, security, maintainability))
+    }
+    scores['coverageScore'] = np.nan_to_num(coverage, nan=0.0)
+    scores['codeQualityScore'] = np.where(np.isnan(duplication), NEUTRAL_SCORE, np.maximum(0, 100 - duplication))
+    weighted = sum(QUALITY_WEIGHTS[name] * scores[name] for name in QUALITY_DIMENSIONS)
+    scores['qualityIndex'] = weighted / sum(QUALITY_WEIGHTS.values())
+    return {name: values.astype(np.float32) for name, values in scores.items()}
+
+
+def ratings_to_letters(values):
+    """Converte ratings em letras A-E; valores não reconhecidos são mantidos como estão."""
+    import numpy as np
+    import pandas as pd
+
+    series = _as_series(values)
+    codes = rating_codes(series)
+    letters = _code_tables()[1][codes]
+    return pd.Series(np.where(codes > 0, letters, series.to_numpy(dtype=object)), index=series.index)
+
+
+def ratings_to_colors(values):
+    """Converte ratings nas cores usadas pelo dashboard."""
+    import pandas as pd
+
+    series = _as_series(values)
+    return pd.Series(_code_tables()[2][rating_codes(series)], index=series.index)
+
+
+def coverage_to_numeric(values):
+    """Converte valores de cobertura em float64, com NaN para '*', None e não numéricos.
+
+    float64, como o float() de `coverage_text`: em float32 '12.35' vira
+    12.3500004 e seria arredondado para '12.4%' na formatação.
+    """
+    import numpy as np
+    import pandas as pd
+
+    series = _as_series(values)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def is_numeric_array(values):
+    """Máscara booleana dos valores numéricos (não '*', None ou NaN)."""
+    import numpy as np
+
+    return ~np.isnan(coverage_to_numeric(values))
+
+
+def format_coverage_series(values):
+    """Formata uma coluna de cobertura como texto ('12.3%' ou '*')."""
+    import pandas as pd
+
+    series = _as_series(values)
+    numeric = pd.Series(coverage_to_numeric(series), index=series.index)
+    text = numeric.map('{:.1f}%'.format)
+    return text.where(numeric.notna(), '*')
@@ -0,0 +1,465 @@
+# frontend/reports.py
+"""Relatórios em lote das visões Gerencial e do Desenvolvedor (HTML e imagens estáticas).
+
+Cada projeto é renderizado em um processo de um pool limitado
+(REPORT_WORKERS) e com prioridade reduzida (REPORT_NICE), para não disputar
+CPU com as páginas; os dados e os gráficos vêm dos mesmos fetchers de
+utils.py e construtores de figures.py. O lote é um diretório com um
+`index.html` e um `manifest.json` gerais e, por projeto, `index.html` (gráficos
+interativos), `manifest.json` e, com o kaleido instalado, as imagens dos
+gráficos em `images/`. Uso (a partir de frontend/):
+
+    python reports.py reports/2026-W42                          # todos os projetos
+    python reports.py reports/fk -p fklearn --workers 1 --image-format pdf
+"""
+import argparse
+import html
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+# Processos simultâneos e prioridade (nice) deles, para rodar junto com o tráfego das páginas
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORT_NICE = int(os.getenv("REPORT_NICE", "10"))
+# Diretório base dos lotes gerados pela página de portfólio e intervalo de atualização do progresso
+REPORT_DIR = os.getenv("REPORT_DIR", "reports")
+REPORT_PROGRESS_SECONDS = 2
+# Formato das imagens dos gráficos (requer kaleido); 'none' desativa
+REPORT_IMAGE_FORMAT = os.getenv("REPORT_IMAGE_FORMAT", "png")
+IMAGE_FORMATS = ['png', 'svg', 'pdf', 'none']
+KALEIDO_AVAILABLE = importlib.util.find_spec('kaleido') is not None
+
+# Janelas dos relatórios (semanais) e tamanho das listas de arquivos
+REPORT_HISTORY_HOURS = 168
+REPORT_DORA_DAYS = 30
+REPORT_TOP_FILES = 10
+REPORT_RISK_FILES = 20
+# Máximo de pontos da tendência de dívida (como na Visão Gerencial)
+REPORT_MAX_POINTS = 500
+
+MANIFEST = 'manifest.json'
+PLOTLY_JS = 'plotly.min.js'
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{scripts}
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 2rem auto; max-width: 1100px; color: #262730; }}
+h1 {{ margin-bottom: 0; }}
+h2 {{ border-bottom: 3px solid #7c4dff; padding-bottom: .3rem; margin-top: 2.5rem; }}
+.meta {{ color: #808495; margin-top: .3rem; }}
+table.tabela {{ border-collapse: collapse; margin: 1rem 0; font-size: .9rem; }}
+table.tabela th, table.tabela td {{ padding: .35rem .8rem; border-bottom: 1px solid #e6e6eb; text-align: left; }}
+table.tabela th {{ background: #f0f2f6; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p class="meta">{subtitle}</p>
+{body}
+</body>
+</html>
+"""
+
+
+# ==========================================
+# CONTEÚDO DO RELATÓRIO
+# ==========================================
+
+class Report:
+    """Conteúdo de um relatório: blocos HTML em ordem e os gráficos (nome -> figura)."""
+
+    def __init__(self):
+        self.parts = []
+        self.figures = {}
+
+    def heading(self, text, level=2):
+        self.parts.append(f"<h{level}>{html.escape(text)}</h{level}>")
+
+    def text(self, text):
+        self.parts.append(f"<p>{html.escape(text)}</p>")
+
+    def table(self, df):
+        self.parts.append(df.to_html(
+            index=False, border=0, classes='tabela', na_rep='*', float_format=lambda v: f"{v:,.1f}"
+        ))
+
+    def figure(self, name, fig):
+        self.figures[name] = fig
+        self.parts.append(('figure', name))
+
+    def render(self):
+        """Corpo HTML, com os gráficos interativos (plotly.js carregado pela página)."""
+        blocks = []
+        for part in self.parts:
+            if isinstance(part, tuple):
+                blocks.append(self.figures[part[1]].to_html(full_html=False, include_plotlyjs=False))
+            else:
+                blocks.append(part)
+        return "\n".join(blocks)
+
+
+def _indicators(rows):
+    import pandas as pd
+    return pd.DataFrame(rows, columns=['Indicador', 'Valor'])
+
+
+def manager_report(report, project_id):
+    """Visão Gerencial: indicadores-chave, DORA, tendências da semana e gráficos da página."""
+    import pandas as pd
+    from dora import DORA_HISTORY_DAYS, deployment_log
+    from figures import debt_trend_figure, dora_trend_figure, effort_pie_figure
+    from utils import (
+        format_lead_time, format_rating, get_dora_metrics, get_trends, minutes_to_days, prefetch, prepare_debt_trend,
+    )
+
+    page_data = prefetch(
+        project_id,
+        ['latest_metrics', 'history_frame', 'dora_deployments'],
+        params={
+            'dora_deployments': {'days': DORA_HISTORY_DAYS},
+            'history_frame': {'hours': REPORT_HISTORY_HOURS, 'rolling_hours': 24},
+        }
+    )
+    latest_data = page_data['latest_metrics'] or {}
+    df_history = page_data['history_frame']
+    deployments = page_data['dora_deployments']
+    dora_log = deployment_log(project_id, deployments) if deployments is not None else None
+    dora_data = (dora_log.metrics(REPORT_DORA_DAYS) if dora_log is not None else get_dora_metrics(project_id, REPORT_DORA_DAYS)) or {}
+    trend_rows, trend_events = get_trends(project_id, REPORT_HISTORY_HOURS)
+
+    maintainability = latest_data.get('maintainability', {})
+    new_code = latest_data.get('newCode', {})
+    report.heading("Visão Gerencial")
+    report.table(_indicators([
+        ("Taxa de Dívida Técnica", f"{maintainability.get('debtRatio', '*')}%"),
+        ("Rating de Manutenibilidade", format_rating(maintainability.get('rating'))),
+        ("Dívida Técnica", minutes_to_days(latest_data.get('technicalDebtMinutes'))),
+        (f"Deploys ({REPORT_DORA_DAYS} dias)", dora_data.get('deploymentFrequency', {}).get('total', '*')),
+        ("Tempo de Espera para Mudanças", format_lead_time(dora_data.get('leadTime', {}).get('average'))),
+        ("Taxa de Falha em Mudanças", f"{dora_data.get('changeFailureRate', {}).get('rate', '*')}%"),
+        ("Tempo Médio de Restauração", format_lead_time(dora_data.get('meanTimeToRestore', {}).get('average'))),
+        ("Novos Bugs", new_code.get('bugs', '*')),
+        ("Novas Vulnerabilidades", new_code.get('vulnerabilities', '*')),
+    ]))
+
+    if trend_rows:
+        report.heading("Tendências da Semana", 3)
+        report.table(pd.DataFrame({
+            'Métrica': [row['label'] for row in trend_rows],
+            'Atual': [row['last'] for row in trend_rows],
+            'Variação (%)': [row['pct'] for row in trend_rows],
+            'Regressões': [row['regressions'] for row in trend_rows],
+            'Anomalias': [row['anomalies'] for row in trend_rows],
+        }))
+
+    report.heading("Composição do Esforço", 3)
+    report.figure('composicao_esforco', effort_pie_figure(maintainability.get('debtRatio', 0)))
+    if df_history is not None and not df_history.empty:
+        report.heading("Tendência da Dívida Técnica Acumulada", 3)
+        report.figure('tendencia_divida', debt_trend_figure(*prepare_debt_trend(df_history, trend_events, REPORT_MAX_POINTS)))
+    if dora_log is not None and len(dora_log):
+        report.heading(f"Evolução DORA (janela móvel de {REPORT_DORA_DAYS} dias)", 3)
+        report.figure('evolucao_dora', dora_trend_figure(dora_log.series(REPORT_DORA_DAYS)))
+
+
+def developer_report(report, project_id):
+    """Visão do Desenvolvedor: código novo, arquivos mais complexos, pior cobertura e ranking de risco."""
+    import pandas as pd
+    from explorer import get_hotspot_index
+    from figures import complexity_bar_figure, coverage_bar_figure
+    from utils import ISSUE_TYPES, prefetch, prepare_worst_coverage
+
+    page_data = prefetch(project_id, ['latest_metrics', 'new_code_issue_counts', 'complexity', 'coverage'])
+    latest_data = page_data['latest_metrics'] or {}
+    issue_counts = page_data['new_code_issue_counts'] or {}
+    complexity_data = page_data['complexity']
+    coverage_data = page_data['coverage']
+
+    report.heading("Visão do Desenvolvedor")
+    size = latest_data.get('size', {})
+    report.table(_indicators([
+        *((f"Issues em código novo ({issue_type})", issue_counts.get(issue_type, '*')) for issue_type in ISSUE_TYPES),
+        ("Complexidade Ciclomática Total", size.get('complexity', '*')),
+        ("Densidade de Duplicação", f"{latest_data.get('duplication', {}).get('density', '*')}%"),
+        ("Cobertura", f"{latest_data.get('coverage', {}).get('overall', '*')}%"),
+    ]))
+
+    hotspots = ((complexity_data or {}).get('stats') or {}).get('hotspots') or []
+    if hotspots:
+        report.heading(f"Top {REPORT_TOP_FILES} Arquivos Mais Complexos", 3)
+        df_complexity = pd.DataFrame(hotspots[:REPORT_TOP_FILES])
+        report.figure('complexidade', complexity_bar_figure(df_complexity))
+        report.table(df_complexity[['name', 'complexity', 'cognitiveComplexity', 'linesOfCode']])
+
+    worst = (coverage_data or {}).get('worstCoverage') or []
+    if worst:
+        report.heading(f"Top {REPORT_TOP_FILES} Arquivos com Menor Cobertura", 3)
+        df_coverage = prepare_worst_coverage(worst[:REPORT_TOP_FILES])
+        report.figure('cobertura', coverage_bar_figure(df_coverage))
+        report.table(df_coverage[['name', 'coverage', 'uncoveredLines', 'linesToCover']])
+
+    if (complexity_data and complexity_data.get('components')) or (coverage_data and coverage_data.get('components')):
+        report.heading("Arquivos de Maior Risco", 3)
+        report.text("Risco = complexidade² × (1 − cobertura)³ + complexidade: arquivos complexos e pouco testados primeiro.")
+        index = get_hotspot_index(project_id, complexity_data, coverage_data)
+        report.table(index.risk_ranking(REPORT_RISK_FILES)[['path', 'risk', 'complexity', 'coverage', 'uncoveredLines', 'issues']])
+
+
+# ==========================================
+# RENDERIZAÇÃO (PROCESSOS DO POOL)
+# ==========================================
+
+def _init_worker(nice):
+    """Inicialização de cada processo do pool: prioridade reduzida em relação ao servidor."""
+    if nice and hasattr(os, 'nice'):
+        os.nice(nice)
+
+
+def render_project(project_id, name, out_dir, image_format=REPORT_IMAGE_FORMAT, plotlyjs=f"../{PLOTLY_JS}"):
+    """Gera o relatório de um projeto em `out_dir`; retorna o manifest do projeto.
+
+    Roda em um processo do pool (ou direto, para um projeto só); `plotlyjs` é o
+    caminho do plotly.js relativo ao `index.html` do projeto.
+    """
+    start = time.perf_counter()
+    report = Report()
+    manager_report(report, project_id)
+    developer_report(report, project_id)
+
+    from utils import get_latest_metrics
+    snapshot = (get_latest_metrics(project_id) or {}).get('timestamp')
+    generated_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+    os.makedirs(out_dir, exist_ok=True)
+    page = PAGE_TEMPLATE.format(
+        title=html.escape(f"SonarView · {name}"),
+        subtitle=html.escape(f"Gerado em {generated_at} · snapshot {snapshot or '*'}"),
+        scripts=f'<script src="{html.escape(plotlyjs)}"></script>',
+        body=report.render(),
+    )
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(page)
+
+    images = []
+    if image_format != 'none' and KALEIDO_AVAILABLE:
+        os.makedirs(os.path.join(out_dir, 'images'), exist_ok=True)
+        for figure_name, fig in report.figures.items():
+            filename = os.path.join('images', f"{figure_name}.{image_format}")
+            fig.write_image(os.path.join(out_dir, filename), format=image_format)
+            images.append(filename)
+
+    manifest = {
+        'project': project_id,
+        'name': name,
+        'generatedAt': generated_at,
+        'snapshot': snapshot,
+        'html': 'index.html',
+        'figures': list(report.figures),
+        'images': images,
+        'seconds': round(time.perf_counter() - start, 2),
+    }
+    with open(os.path.join(out_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+# ==========================================
+# LOTES
+# ==========================================
+
+class ReportJob:
+    """Geração de relatórios de vários projetos em um pool de processos, com progresso consultável.
+
+    `run()` bloqueia até o fim; `start()` roda em uma thread de fundo (página
+    de portfólio) e `progress()` pode ser lido de outras threads.
+    """
+
+    def __init__(self, projects, out_dir, workers=REPORT_WORKERS, image_format=REPORT_IMAGE_FORMAT):
+        self.projects = [{'id': p['id'], 'name': p.get('name', p['id'])} for p in projects]
+        self.out_dir = out_dir
+        self.workers = max(1, min(workers, len(self.projects) or 1))
+        self.image_format = image_format
+        self.started = None
+        self.finished = None
+        self.error = None         # falha do lote como um todo (ex.: diretório sem permissão)
+        self._status = {p['id']: {'status': 'na fila', 'seconds': None, 'error': None} for p in self.projects}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self.started is not None and self.finished is None
+
+    def run(self, on_progress=None):
+        """Gera os relatórios e o índice do lote; retorna o manifest do lote.
+
+        `on_progress(project_id, progress)` é chamado a cada projeto concluído.
+        Falhas de um projeto ficam no status dele, sem interromper os demais; uma
+        falha do lote (ex.: disco cheio) fica em `error`, marca os projetos
+        pendentes como falhos e é propagada.
+        """
+        self.started = time.time()
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            from plotly.offline import get_plotlyjs
+            with open(os.path.join(self.out_dir, PLOTLY_JS), 'w', encoding='utf-8') as f:
+                f.write(get_plotlyjs())
+
+            # spawn: o servidor do Streamlit tem threads, que não sobrevivem a um fork
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context, initializer=_init_worker, initargs=(REPORT_NICE,)
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        render_project, p['id'], p['name'], os.path.join(self.out_dir, p['id']), self.image_format
+                    ): p['id']
+                    for p in self.projects
+                }
+                for future in as_completed(futures):
+                    project_id = futures[future]
+                    try:
+                        manifest = future.result()
+                        update = {'status': 'concluído', 'seconds': manifest['seconds']}
+                    except Exception as e:
+                        update = {'status': 'falhou', 'error': f"{type(e).__name__}: {e}"}
+                    with self._lock:
+                        self._status[project_id].update(update)
+                    if on_progress:
+                        on_progress(project_id, self.progress())
+            return self._write_index()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            with self._lock:
+                for status in self._status.values():
+                    if status['status'] == 'na fila':
+                        status.update({'status': 'falhou', 'error': self.error})
+            raise
+        finally:
+            self.finished = time.time()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="reports", daemon=True)
+        self._thread.start()
+        return self
+
+    def progress(self):
+        """{'total', 'done', 'failed', 'running', 'elapsed', 'error', 'projects': [{id, name, status, seconds, error}]}."""
+        with self._lock:
+            projects = [{**p, **self._status[p['id']]} for p in self.projects]
+        done = sum(p['status'] != 'na fila' for p in projects)
+        end = self.finished or time.time()
+        return {
+            'total': len(projects),
+            'done': done,
+            'failed': sum(p['status'] == 'falhou' for p in projects),
+            'running': self.running,
+            'elapsed': end - self.started if self.started else 0.0,
+            'error': self.error,
+            'projects': projects,
+        }
+
+    def _write_index(self):
+        import pandas as pd
+
+        progress = self.progress()
+        manifest = {
+            'createdAt': datetime.fromtimestamp(self.started, timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'imageFormat': self.image_format if KALEIDO_AVAILABLE else 'none',
+            'projects': progress['projects'],
+        }
+        with open(os.path.join(self.out_dir, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        df = pd.DataFrame({
+            'Projeto': [
+                f'<a href="{html.escape(p["id"])}/index.html">{html.escape(p["name"])}</a>' if p['status'] == 'concluído'
+                else html.escape(p['name'])
+                for p in progress['projects']
+            ],
+            'Status': [p['status'] for p in progress['projects']],
+            'Tempo (s)': [p['seconds'] for p in progress['projects']],
+        })
+        page = PAGE_TEMPLATE.format(
+            title="SonarView · Relatórios",
+            subtitle=html.escape(f"Gerado em {manifest['createdAt']} · {progress['done'] - progress['failed']}/{progress['total']} projeto(s)"),
+            scripts='',
+            body=df.to_html(index=False, border=0, classes='tabela', na_rep='*', escape=False),
+        )
+        with open(os.path.join(self.out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+        return manifest
+
+    def zip_bytes(self):
+        """O lote como um .zip em memória (para download pela página)."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for root, _, files in os.walk(self.out_dir):
+                for filename in sorted(files):
+                    path = os.path.join(root, filename)
+                    archive.write(path, os.path.relpath(path, self.out_dir))
+        return buffer.getvalue()
+
+
+# Um lote por vez no processo do servidor (o pool já é o limite de CPU)
+_job = None
+_job_lock = threading.Lock()
+
+
+def current_job():
+    return _job
+
+
+def start_job(projects, out_dir=None):
+    """Inicia um lote em segundo plano, a menos que outro esteja em andamento; retorna o lote ativo."""
+    global _job
+    with _job_lock:
+        if _job is not None and _job.running:
+            return _job
+        out_dir = out_dir or os.path.join(REPORT_DIR, datetime.now(timezone.utc).strftime('%Y-%m-%d_%H%M%S'))
+        _job = ReportJob(projects, out_dir).start()
+        return _job
+
+
+def main():
+    from api_client import api_get
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('out', help="diretório do lote")
+    parser.add_argument('-p', '--project', action='append', default=[], help="projeto (padrão: todos)")
+    parser.add_argument('--workers', type=int, default=REPORT_WORKERS, help="processos simultâneos")
+    parser.add_argument('--image-format', choices=IMAGE_FORMATS, default=REPORT_IMAGE_FORMAT,
+                        help="formato das imagens dos gráficos (requer kaleido)")
+    args = parser.parse_args()
+
+    catalog = api_get("/projects") or {}
+    projects = [p for p in catalog.get('projects', []) if not args.project or p['id'] in args.project]
+    if not projects:
+        parser.error("nenhum projeto para gerar")
+    if args.image_format != 'none' and not KALEIDO_AVAILABLE:
+        print("kaleido não instalado: relatórios apenas em HTML")
+
+    def report_progress(project_id, progress):
+        last = next(p for p in progress['projects'] if p['id'] == project_id)
+        print(f"[{progress['done']}/{progress['total']}] {last['id']}: {last['status']}"
+              + (f" ({last['seconds']:.1f}s)" if last['seconds'] is not None else f" - {last['error']}"))
+
+    job = ReportJob(projects, args.out, args.workers, args.image_format)
+    job.run(report_progress)
+    progress = job.progress()
+    print(f"{progress['done'] - progress['failed']}/{progress['total']} relatório(s) em {progress['elapsed']:.1f}s em {args.out}")
+
+
+if __name__ == '__main__':
+    main()
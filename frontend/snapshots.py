@@ -0,0 +1,372 @@
+# frontend/snapshots.py
+"""Snapshots offline do dashboard em formato colunar (Arrow IPC ou Parquet).
+
+Um snapshot é um diretório com um `manifest.json` e uma tabela por conjunto
+de dados (métricas mais recentes, histórico, deployments, issues,
+complexidade e cobertura), com a coluna `project` identificando o projeto de
+cada linha. Uso (a partir de frontend/):
+
+    python snapshots.py export snapshots/2024-Q3                 # todos os projetos
+    python snapshots.py export snapshots/fk -p fklearn --format parquet
+    SONARVIEW_SNAPSHOT=snapshots/2024-Q3 streamlit run app.py    # páginas leem o snapshot
+    python snapshots.py serve snapshots/2024-Q3 --port 3001      # snapshot como API HTTP
+
+No modo de importação as tabelas Arrow são abertas com memory-map, sem cópia,
+e cada projeto é uma fatia contígua delas; as rotas da API são respondidas pelo
+mesmo roteamento do stub_backend, com o horário da exportação como "agora".
+"""
+import argparse
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from api_client import api_get
+from stub_backend import DatasetBackend, ISSUE_GROUPS
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+
+# Janelas exportadas: histórico e deployments do último ano
+EXPORT_HISTORY_HOURS = int(os.getenv("SNAPSHOT_HISTORY_HOURS", "8760"))
+EXPORT_DEPLOYMENT_DAYS = int(os.getenv("SNAPSHOT_DEPLOYMENT_DAYS", "365"))
+# Projetos exportados em paralelo e tamanho de página da paginação de issues
+EXPORT_WORKERS = int(os.getenv("SNAPSHOT_EXPORT_WORKERS", "4"))
+ISSUES_PAGE_SIZE = 500
+
+# Tabelas do snapshot: nome -> chave do dataset por projeto (ver DatasetBackend)
+TABLES = ['latest_metrics', 'metrics_history', 'deployments', 'issues', 'complexity', 'coverage']
+
+
+# ==========================================
+# EXPORTAÇÃO
+# ==========================================
+
+def _all_issues(project_id):
+    """Todas as issues de código novo do projeto, percorrendo as páginas do backend."""
+    issues, page = [], 1
+    while True:
+        payload = api_get("/sonarcloud/new-code-issues", params={
+            'project': project_id, 'page': page, 'pageSize': ISSUES_PAGE_SIZE
+        }) or {}
+        for group in ISSUE_GROUPS.values():
+            issues.extend(payload.get('issues', {}).get(group, []))
+        paging = payload.get('paging')
+        if not paging or page * paging['pageSize'] >= paging['total']:
+            return issues
+        page += 1
+
+
+def collect_project(project_id, history_hours=EXPORT_HISTORY_HOURS, deployment_days=EXPORT_DEPLOYMENT_DAYS):
+    """Busca no backend os dados brutos de um projeto.
+
+    Retorna (registros por tabela, envelopes), onde os envelopes são as partes
+    agregadas dos payloads de complexidade e cobertura (estatísticas e top 10).
+    """
+    params = {'project': project_id}
+    latest = api_get("/metrics/latest", params=params)
+    history = api_get("/metrics/history", params={**params, 'hours': history_hours}) or []
+    deployments = api_get("/dora/deployments", params={**params, 'days': deployment_days}) or {}
+    complexity = api_get("/sonarcloud/complexity", params=params) or {}
+    coverage = api_get("/sonarcloud/coverage-by-file", params=params) or {}
+
+    records = {
+        'latest_metrics': [latest] if latest else [],
+        'metrics_history': sorted(history, key=lambda s: s['timestamp'], reverse=True),
+        'deployments': deployments.get('deployments', []),
+        'issues': _all_issues(project_id),
+        'complexity': complexity.get('components', []),
+        'coverage': coverage.get('components', []),
+    }
+    envelopes = {
+        'complexity': {k: v for k, v in complexity.items() if k != 'components'},
+        'coverage': {k: v for k, v in coverage.items() if k != 'components'},
+    }
+    return records, envelopes
+
+
+def _flatten(record, prefix=''):
+    """{'coverage': {'overall': 80}} -> {'coverage.overall': 80} (listas continuam como valores)."""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _unflatten(flat):
+    record = {}
+    for name, value in flat.items():
+        *parents, key = name.split('.')
+        node = record
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value
+    return record
+
+
+def _to_table(project_ids, rows):
+    """Monta a tabela com a coluna `project` e uma coluna por campo (aninhados com '.').
+
+    Campos sem tipo consistente entre os registros (ex.: cobertura numérica ou
+    '*') são gravados como texto JSON; retorna (tabela, nomes dessas colunas).
+    """
+    flat_rows = [_flatten(row) for row in rows]
+    names = list(dict.fromkeys(name for row in flat_rows for name in row))
+    arrays, json_columns = [pa.array(project_ids, pa.string()).dictionary_encode()], []
+    for name in names:
+        values = [row.get(name) for row in flat_rows]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([json.dumps(value) for value in values], pa.string()))
+            json_columns.append(name)
+    return pa.Table.from_arrays(arrays, names=['project', *names]), json_columns
+
+
+def _write_table(table, path, fmt):
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression='zstd')
+        return
+    # IPC sem compressão: pode ser aberto com memory-map e lido sem cópia
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def export_snapshot(out_dir, project_ids=None, fmt='arrow', history_hours=EXPORT_HISTORY_HOURS,
+                    deployment_days=EXPORT_DEPLOYMENT_DAYS):
+    """Exporta os projetos (todos, se `project_ids` for vazio) para `out_dir`; retorna o manifest."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato de snapshot desconhecido: {fmt}")
+    catalog = api_get("/projects") or {}
+    projects = [p for p in catalog.get('projects', []) if not project_ids or p['id'] in project_ids]
+    if not projects:
+        raise ValueError("Nenhum projeto para exportar")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(EXPORT_WORKERS, len(projects)))) as executor:
+        collected = list(executor.map(
+            lambda p: collect_project(p['id'], history_hours, deployment_days), projects
+        ))
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        'formatVersion': FORMAT_VERSION,
+        'createdAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'format': fmt,
+        'projects': projects,
+        'default': catalog.get('default') if any(p['id'] == catalog.get('default') for p in projects) else projects[0]['id'],
+        'windows': {'historyHours': history_hours, 'deploymentDays': deployment_days},
+        'envelopes': {p['id']: envelopes for p, (_, envelopes) in zip(projects, collected)},
+        'tables': {},
+    }
+    for name in TABLES:
+        # Linhas agrupadas por projeto: cada projeto vira uma fatia contígua da tabela
+        ids, rows = [], []
+        for project, (records, _) in zip(projects, collected):
+            ids.extend([project['id']] * len(records[name]))
+            rows.extend(records[name])
+        table, json_columns = _to_table(ids, rows)
+        filename = name + FORMATS[fmt]
+        _write_table(table, os.path.join(out_dir, filename), fmt)
+        manifest['tables'][name] = {
+            'file': filename,
+            'rows': table.num_rows,
+            'jsonColumns': json_columns,
+            'schema': table.schema.to_string(show_schema_metadata=False),
+        }
+
+    with open(os.path.join(out_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def export_zip(project_ids=None, fmt='arrow'):
+    """Exporta um snapshot e o retorna como um .zip em memória (para download pela página)."""
+    with tempfile.TemporaryDirectory(prefix='sonarview-snapshot-') as tmp:
+        export_snapshot(tmp, project_ids, fmt)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for filename in sorted(os.listdir(tmp)):
+                archive.write(os.path.join(tmp, filename), filename)
+    return buffer.getvalue()
+
+
+# ==========================================
+# IMPORTAÇÃO
+# ==========================================
+
+def _read_table(path):
+    """Abre uma tabela do snapshot: IPC com memory-map (sem cópia) ou Parquet."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.read_table(path, memory_map=True)
+    # O arquivo mapeado fica vivo enquanto houver buffers da tabela apontando para ele
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+def _project_slices(table):
+    """{projeto: (início, quantidade)} das fatias contíguas da coluna `project`."""
+    if table.num_rows == 0:
+        return {}
+    column = pc.run_end_encode(table['project'].combine_chunks().cast(pa.string()))
+    ends = column.run_ends.to_pylist()
+    starts = [0] + ends[:-1]
+    return {
+        project: (start, end - start)
+        for project, start, end in zip(column.values.to_pylist(), starts, ends)
+    }
+
+
+class SnapshotBackend(DatasetBackend):
+    """Responde às rotas da API a partir de um snapshot exportado."""
+
+    service = 'Quality Lens API (snapshot)'
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('formatVersion') != FORMAT_VERSION:
+            raise ValueError(f"Versão de snapshot não suportada: {self.manifest.get('formatVersion')}")
+        self.project_ids = [p['id'] for p in self.manifest['projects']]
+        self.default_project = self.manifest.get('default')
+        self.created_at = datetime.fromisoformat(self.manifest['createdAt'].replace('Z', '+00:00'))
+        self.tables = {
+            name: _read_table(os.path.join(path, info['file']))
+            for name, info in self.manifest['tables'].items()
+        }
+        self.slices = {name: _project_slices(table) for name, table in self.tables.items()}
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+    def projects(self):
+        return self.manifest['projects']
+
+    def now(self):
+        return self.created_at
+
+    def _rows(self, name, project_id):
+        """Registros de um projeto em uma tabela (fatia contígua, convertida para dicts)."""
+        table = self.tables[name]
+        start, count = self.slices[name].get(project_id, (0, 0))
+        if not count:
+            return []
+        columns = table.slice(start, count).drop_columns(['project']).to_pydict()
+        for column in self.manifest['tables'][name]['jsonColumns']:
+            columns[column] = [json.loads(value) for value in columns[column]]
+        return [_unflatten(dict(zip(columns, values))) for values in zip(*columns.values())]
+
+    def dataset(self, project_id):
+        with self._lock:
+            data = self._datasets.get(project_id)
+        if data is not None:
+            return data
+
+        envelopes = self.manifest['envelopes'].get(project_id, {})
+        grouped = {group: [] for group in ISSUE_GROUPS.values()}
+        for issue in self._rows('issues', project_id):
+            grouped[ISSUE_GROUPS.get(issue.get('type'), 'codeSmells')].append(issue)
+        latest = self._rows('latest_metrics', project_id)
+        data = {
+            'latest': latest[0] if latest else None,
+            'history': self._rows('metrics_history', project_id),
+            'deployments': self._rows('deployments', project_id),
+            'issues': {'issues': grouped},
+            'complexity': {**envelopes.get('complexity', {}), 'components': self._rows('complexity', project_id)},
+            'coverage': {**envelopes.get('coverage', {}), 'components': self._rows('coverage', project_id)},
+        }
+        with self._lock:
+            return self._datasets.setdefault(project_id, data)
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def load_snapshot(path):
+    """SnapshotBackend do diretório `path`, aberto uma vez por processo."""
+    path = os.path.abspath(path)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(path)
+        if snapshot is None:
+            snapshot = _snapshots[path] = SnapshotBackend(path)
+        return snapshot
+
+
+def list_snapshots(root):
+    """Snapshots exportados nos subdiretórios de `root`, do mais recente ao mais antigo.
+
+    Lê apenas os manifests: retorna dicts com 'path', 'name', 'createdAt' (datetime) e 'projects' (ids).
+    """
+    found = []
+    if not root or not os.path.isdir(root):
+        return found
+    for name in sorted(os.listdir(root)):
+        manifest_path = os.path.join(root, name, MANIFEST)
+        if not os.path.isfile(manifest_path):
+            continue
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get('formatVersion') != FORMAT_VERSION:
+            continue
+        found.append({
+            'path': os.path.abspath(os.path.join(root, name)),
+            'name': name,
+            'createdAt': datetime.fromisoformat(manifest['createdAt'].replace('Z', '+00:00')),
+            'projects': [p['id'] for p in manifest.get('projects', [])],
+        })
+    return sorted(found, key=lambda snapshot: snapshot['createdAt'], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="exporta projetos do backend para um diretório")
+    export.add_argument('out', help="diretório de destino")
+    export.add_argument('-p', '--project', action='append', default=[], help="projeto a exportar (padrão: todos)")
+    export.add_argument('--format', choices=list(FORMATS), default='arrow', help="arrow (memory-map) ou parquet (compacto)")
+    export.add_argument('--history-hours', type=int, default=EXPORT_HISTORY_HOURS)
+    export.add_argument('--deployment-days', type=int, default=EXPORT_DEPLOYMENT_DAYS)
+
+    serve = commands.add_parser('serve', help="serve um snapshot como a API do backend")
+    serve.add_argument('path', help="diretório do snapshot")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=3001)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        start = time.perf_counter()
+        manifest = export_snapshot(args.out, args.project, args.format, args.history_hours, args.deployment_days)
+        for name, info in manifest['tables'].items():
+            print(f"{name:<16} {info['rows']:>8} linhas  {info['file']}")
+        print(f"{len(manifest['projects'])} projeto(s) exportado(s) em {time.perf_counter() - start:.1f}s para {args.out}")
+        return
+
+    snapshot = load_snapshot(args.path)
+    url = snapshot.serve(args.host, args.port)
+    print(f"Snapshot de {snapshot.manifest['createdAt']} em {url} (BACKEND_API_URL={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+# frontend/stub_backend.py
+"""Backend local que imita a API do Quality Lens a partir de fixtures.
+
+Pode ser usado de duas formas:
+
+* em processo, via `StubBackend.handle(path, params)` (modo replay do api_client);
+* como servidor HTTP, para apontar o frontend com BACKEND_API_URL:
+
+    python stub_backend.py --port 3001 --scale 10 --latency-ms 150
+
+A escala multiplica o tamanho dos payloads (histórico, issues, arquivos e
+deployments) e a latência é aplicada a cada requisição, permitindo perfilar
+e fazer testes de carga das páginas de forma determinística e offline.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import fixtures
+
+# Tamanhos com escala 1.0
+BASE_HISTORY_POINTS = 2000
+HISTORY_INTERVAL_MINUTES = 30
+BASE_ISSUES = 200
+BASE_FILES = 500
+BASE_DEPLOYMENTS = 100
+DEPLOYMENT_DAYS = 365
+
+# Projeto semeado pelos dados gravados em backend/data
+SEEDED_PROJECT = 'fklearn'
+
+ISSUE_GROUPS = {'BUG': 'bugs', 'VULNERABILITY': 'vulnerabilities', 'CODE_SMELL': 'codeSmells'}
+
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+
+
+def _int_param(params, name, default):
+    try:
+        return int(params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def aggregate_dora(deployments, days):
+    """Calcula as métricas DORA agregadas como o backend (models/dora.js)."""
+    total = len(deployments)
+    failures = sum(1 for d in deployments if d['status'] == 'failure')
+    lead_times = sorted(d['leadTimeMinutes'] for d in deployments if d['status'] == 'success' and d['leadTimeMinutes'] is not None)
+
+    restore_times = []
+    ordered = sorted(deployments, key=lambda d: d['deploymentTimestamp'])
+    failed = [d for d in ordered if d['status'] == 'failure']
+    for current, following in zip(failed, failed[1:]):
+        delta = _parse_timestamp(following['deploymentTimestamp']) - _parse_timestamp(current['deploymentTimestamp'])
+        restore_times.append(delta.total_seconds() / 60)
+
+    average_lead = round(sum(lead_times) / len(lead_times), 2) if lead_times else 0
+    median_lead = 0
+    if lead_times:
+        middle = len(lead_times) // 2
+        median_lead = lead_times[middle] if len(lead_times) % 2 else (lead_times[middle - 1] + lead_times[middle]) / 2
+
+    return {
+        'period': {
+            'days': days,
+            'firstDeployment': ordered[0]['deploymentTimestamp'] if ordered else None,
+            'lastDeployment': ordered[-1]['deploymentTimestamp'] if ordered else None
+        },
+        'deploymentFrequency': {'total': total, 'perDay': round(total / days, 2) if days else 0},
+        'leadTime': {'average': average_lead, 'median': round(median_lead, 2), 'unit': 'minutes'},
+        'changeFailureRate': {
+            'rate': round(100 * failures / total, 2) if total else 0,
+            'failures': failures,
+            'total': total
+        },
+        'meanTimeToRestore': {
+            'average': round(sum(restore_times) / len(restore_times), 2) if restore_times else 0,
+            'unit': 'minutes'
+        }
+    }
+
+
+def paginate_issues(grouped, params):
+    """Filtra e pagina as issues como o backend (services/sonarcloud-details.js)."""
+    page = max(_int_param(params, 'page', 1), 1)
+    page_size = min(max(_int_param(params, 'pageSize', 100), 1), 500)
+    types = [params['type']] if params.get('type') in ISSUE_GROUPS else list(ISSUE_GROUPS)
+    severities = [s for s in params.get('severity', '').split(',') if s in fixtures.SEVERITIES] or fixtures.SEVERITIES
+    files = set([f for f in params.get('files', '').split(',') if f][:100])
+
+    matching = [
+        issue
+        for issue_type in types
+        for issue in grouped['issues'][ISSUE_GROUPS[issue_type]]
+        if issue['severity'] in severities and (not files or issue['component'] in files)
+    ]
+    page_items = matching[(page - 1) * page_size:page * page_size]
+
+    facets = {'types': {t: 0 for t in ISSUE_GROUPS}, 'severities': {s: 0 for s in fixtures.SEVERITIES}}
+    for issue in matching:
+        facets['types'][issue['type']] += 1
+        facets['severities'][issue['severity']] += 1
+
+    result = {'bugs': [], 'vulnerabilities': [], 'codeSmells': [], 'byFile': {}}
+    for issue in page_items:
+        result[ISSUE_GROUPS[issue['type']]].append(issue)
+        result['byFile'].setdefault(issue['component'], []).append(issue)
+    return {
+        'total': len(page_items),
+        'totalBugs': len(result['bugs']),
+        'totalVulnerabilities': len(result['vulnerabilities']),
+        'totalCodeSmells': len(result['codeSmells']),
+        'paging': {'pageIndex': page, 'pageSize': page_size, 'total': len(matching)},
+        'facets': facets,
+        'issues': result
+    }
+
+
+class DatasetBackend:
+    """Implementa as rotas da API sobre os dados brutos de cada projeto.
+
+    As subclasses fornecem `project_ids` e `dataset(project_id)`, que retorna
+    um dicionário com 'history' (snapshots do mais recente para o mais antigo),
+    'deployments', 'issues' (payload agrupado por tipo), 'complexity',
+    'coverage' e, opcionalmente, 'latest'.
+    """
+
+    service = 'Quality Lens API (stub)'
+    project_ids = []
+    default_project = None
+    server = None
+    url = None
+
+    def projects(self):
+        return [{'id': pid, 'name': pid.replace('-', ' ').title(), 'sonarKey': pid} for pid in self.project_ids]
+
+    def dataset(self, project_id):
+        raise NotImplementedError
+
+    def now(self):
+        """Instante de referência das janelas de tempo (hours/days) das consultas."""
+        return datetime.now(timezone.utc)
+
+    # ------------------------------------------
+    # Roteamento
+    # ------------------------------------------
+
+    def handle(self, path, params=None):
+        """Responde a um GET; retorna (status, corpo)."""
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        path = path.rstrip('/')
+        if path.startswith('/api'):
+            path = path[len('/api'):]
+
+        if path == '/health':
+            return 200, {'status': 'healthy', 'timestamp': datetime.now(timezone.utc).isoformat(), 'service': self.service}
+        if path == '/projects':
+            return 200, {'projects': self.projects(), 'default': self.default_project}
+
+        project_id = params.get('project', self.default_project)
+        if project_id not in self.project_ids:
+            return 404, {'error': 'Unknown project'}
+        data = self.dataset(project_id)
+        now = self.now()
+
+        if path == '/metrics/latest':
+            latest = data.get('latest') or (data['history'][0] if data['history'] else None)
+            if latest is None:
+                return 404, {'error': 'No metrics found'}
+            return 200, latest
+        if path == '/metrics/history':
+            cutoff = fixtures._isoformat(now - timedelta(hours=_int_param(params, 'hours', 168)))
+            since = params.get('since')
+            return 200, [
+                s for s in data['history']
+                if s['timestamp'] >= cutoff and (since is None or s['timestamp'] > since)
+            ]
+        if path in ('/dora/metrics', '/dora/deployments'):
+            days = _int_param(params, 'days', 30)
+            cutoff = fixtures._isoformat(now - timedelta(days=days))
+            recent = [d for d in data['deployments'] if d['deploymentTimestamp'] >= cutoff]
+            if path == '/dora/metrics':
+                return 200, {'projectKey': project_id, **aggregate_dora(recent, days)}
+            return 200, {'projectKey': project_id, 'period': f"{days} days", 'count': len(recent), 'deployments': recent}
+        if path == '/sonarcloud/new-code-issues':
+            return 200, paginate_issues(data['issues'], params)
+        if path == '/sonarcloud/complexity':
+            return 200, data['complexity']
+        if path == '/sonarcloud/coverage-by-file':
+            return 200, data['coverage']
+        if path == '/sonarcloud/security-hotspots':
+            return 200, {'total': 0, 'hotspots': []}
+        return 404, {'error': 'Not found'}
+
+    # ------------------------------------------
+    # Servidor HTTP
+    # ------------------------------------------
+
+    def serve(self, host='127.0.0.1', port=0):
+        """Inicia o servidor HTTP em uma thread daemon e retorna a URL base da API."""
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, body = backend.handle(url.path, params)
+                encoded = json.dumps(body).encode()
+                etag = f'W/"{hashlib.blake2b(encoded, digest_size=12).hexdigest()}"'
+
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(encoded)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="stub-backend", daemon=True).start()
+        self.url = f"http://{host}:{self.server.server_port}/api"
+        return self.url
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server = None
+
+
+
+class StubBackend(DatasetBackend):
+    """Implementa os endpoints da API sobre fixtures geradas sob demanda por projeto."""
+
+    default_project = SEEDED_PROJECT
+
+    def __init__(self, scale=1.0, latency_ms=0.0, jitter_ms=0.0, projects=1, seed=0):
+        self.scale = scale
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+        self.project_ids = [SEEDED_PROJECT] + [f"project-{i}" for i in range(1, projects)]
+        self._datasets = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    # ------------------------------------------
+    # Fixtures por projeto
+    # ------------------------------------------
+
+    def _sized(self, base):
+        return max(1, int(base * self.scale))
+
+    def dataset(self, project_id):
+        """Fixtures de um projeto (geradas na primeira requisição e reaproveitadas)."""
+        with self._lock:
+            data = self._datasets.get(project_id)
+            if data is not None:
+                return data
+
+        seed = self.seed + self.project_ids.index(project_id) if project_id in self.project_ids else self.seed
+        if project_id == SEEDED_PROJECT:
+            history = fixtures.seeded_history(self._sized(BASE_HISTORY_POINTS), HISTORY_INTERVAL_MINUTES)
+            deployments = fixtures.seeded_deployments(self._sized(BASE_DEPLOYMENTS), DEPLOYMENT_DAYS)
+        else:
+            history = fixtures.metrics_history(self._sized(BASE_HISTORY_POINTS), HISTORY_INTERVAL_MINUTES, seed)
+            deployments = fixtures.deployments(self._sized(BASE_DEPLOYMENTS), DEPLOYMENT_DAYS, seed)['deployments']
+
+        data = {
+            'history': history,
+            'deployments': deployments,
+            'issues': fixtures.new_code_issues(self._sized(BASE_ISSUES), seed, self._sized(BASE_FILES)),
+            'complexity': fixtures.complexity(self._sized(BASE_FILES), seed),
+            'coverage': fixtures.coverage(self._sized(BASE_FILES), seed),
+        }
+        with self._lock:
+            return self._datasets.setdefault(project_id, data)
+
+    # ------------------------------------------
+    # Roteamento
+    # ------------------------------------------
+
+    def handle(self, path, params=None):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep(max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+        return super().handle(path, params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend local com fixtures para o frontend do Quality Lens.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001)
+    parser.add_argument('--scale', type=float, default=1.0, help="multiplicador do tamanho dos payloads")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="latência adicionada a cada requisição")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="variação aleatória da latência")
+    parser.add_argument('--projects', type=int, default=1, help="quantidade de projetos expostos")
+    args = parser.parse_args()
+
+    stub = StubBackend(args.scale, args.latency_ms, args.jitter_ms, args.projects)
+    url = stub.serve(args.host, args.port)
+    print(f"Stub do backend em {url} (BACKEND_API_URL={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+# frontend/tests/conftest.py
+# Os módulos do frontend são importados pelo nome (como nas páginas): coloca frontend/ no path
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache  # noqa: E402
+
+
+@pytest.fixture
+def swr(monkeypatch):
+    """Cache SWR novo, em memória e sem limite, no lugar do cache do processo."""
+    fresh = cache.SWRCache(cache.MemoryBackend())
+    monkeypatch.setattr(cache, '_cache', fresh)
+    return fresh
@@ -0,0 +1,132 @@
+# frontend/tests/test_analytics.py
+# Somas prefixadas, CUSUM e detecção de anomalias do TrendAnalytics
+import numpy as np
+import pytest
+
+import analytics
+from analytics import NS_PER_DAY, TrendAnalytics
+
+HOUR = 3600 * 10**9
+START = 1_700_000_000 * 10**9
+
+
+def _series(values, field='bugs'):
+    timestamps = START + np.arange(len(values), dtype=np.int64) * HOUR
+    return timestamps, {field: np.asarray(values, dtype=np.float64)}
+
+
+def _naive_cusum(increments, state, threshold):
+    alarms = []
+    for i, increment in enumerate(increments):
+        state = max(0.0, state + increment)
+        if state > threshold:
+            alarms.append(i)
+            state = 0.0
+    return alarms, state
+
+
+def test_cusum_matches_lindley_recursion():
+    rng = np.random.default_rng(7)
+    increments = rng.normal(0.3, 2.0, 500)
+
+    alarms, state = analytics._cusum(increments, 1.5, 5.0)
+    expected_alarms, expected_state = _naive_cusum(increments, 1.5, 5.0)
+
+    assert alarms == expected_alarms
+    assert state == pytest.approx(expected_state)
+
+
+def test_window_matches_numpy_and_chunking():
+    rng = np.random.default_rng(1)
+    values = 1000 + rng.normal(0, 5, 300)
+    values[::17] = np.nan
+    timestamps, columns = _series(values)
+
+    whole = TrendAnalytics(['bugs'])
+    whole.extend(timestamps, columns)
+    chunked = TrendAnalytics(['bugs'])
+    for lo in range(0, len(values), 37):
+        chunked.extend(timestamps[lo:lo + 37], {'bugs': values[lo:lo + 37]})
+
+    start, end = timestamps[50], timestamps[250]
+    stats = whole.window('bugs', timestamps, start, end)
+    selected = values[50:251]
+    mask = ~np.isnan(selected)
+    t = (timestamps[50:251][mask] - timestamps[0]) / NS_PER_DAY
+
+    assert stats['count'] == mask.sum()
+    assert stats['mean'] == pytest.approx(selected[mask].mean())
+    assert stats['std'] == pytest.approx(selected[mask].std(), rel=1e-6)
+    assert stats['slope'] == pytest.approx(np.polyfit(t, selected[mask], 1)[0], rel=1e-6)
+    assert chunked.window('bugs', timestamps, start, end) == pytest.approx(stats)
+    assert chunked.anomalies == whole.anomalies
+    assert chunked.change_points == whole.change_points
+
+
+def test_window_without_points():
+    timestamps, columns = _series([np.nan, np.nan])
+    trends = TrendAnalytics(['bugs'])
+    trends.extend(timestamps, columns)
+
+    assert trends.window('bugs', timestamps, START) == {'count': 0, 'mean': None, 'std': None, 'slope': None}
+
+
+def test_rolling_mean_matches_naive_window():
+    values = np.arange(20, dtype=np.float64)
+    timestamps, columns = _series(values)
+    trends = TrendAnalytics(['bugs'])
+    trends.extend(timestamps, columns)
+
+    rolling = trends.rolling_mean('bugs', timestamps, hours=3)
+
+    expected = [values[max(0, i - 3):i + 1].mean() for i in range(len(values))]
+    assert rolling == pytest.approx(expected)
+
+
+def test_step_is_one_regression_episode():
+    rng = np.random.default_rng(3)
+    values = np.concatenate([100 + rng.normal(0, 1, 60), 130 + rng.normal(0, 1, 20)])
+    timestamps, columns = _series(values)
+    trends = TrendAnalytics(['bugs'])
+    trends.extend(timestamps, columns)
+
+    assert [(ts, direction) for ts, _, direction, _ in trends.change_points] == [(timestamps[60], 1)]
+    assert [ts for ts, *_ in trends.anomalies] == [timestamps[60]]
+    row, = trends.summary(timestamps, columns, hours=200, now_ns=timestamps[-1])
+    assert row['regressions'] == 1 and row['regressed']
+    assert [kind for _, kind, _ in trends.events('bugs', START)] == ['anomalia', 'regressão']
+
+
+def test_coverage_increase_is_improvement():
+    values = np.concatenate([np.full(60, 50.0), np.full(10, 80.0)])
+    timestamps, columns = _series(values, 'coverage')
+    trends = TrendAnalytics(['coverage'])
+    trends.extend(timestamps, columns)
+
+    assert [kind for _, kind, _ in trends.events('coverage', START)] == ['anomalia', 'melhora']
+    row, = trends.summary(timestamps, columns, hours=200, now_ns=timestamps[-1])
+    assert row['regressions'] == 0 and not row['regressed']
+    assert row['pct'] == pytest.approx(60.0)
+
+
+def test_drop_head_keeps_window_aligned():
+    values = np.concatenate([np.full(60, 10.0), np.full(10, 20.0), np.arange(30, dtype=np.float64)])
+    timestamps, columns = _series(values)
+    trends = TrendAnalytics(['bugs'])
+    trends.extend(timestamps, columns)
+    assert any(ts == timestamps[60] for ts, *_ in trends.change_points)
+
+    trends.drop_head(70, timestamps[70])
+    kept = timestamps[70:]
+
+    assert all(ts >= kept[0] for ts, *_ in trends.change_points + trends.anomalies)
+    assert trends.window('bugs', kept, kept[0])['mean'] == pytest.approx(values[70:].mean())
+
+
+def test_change_handles_zero_start():
+    trends = TrendAnalytics(['bugs'])
+    timestamps, columns = _series([np.nan, 0.0, 0.0, 5.0])
+
+    assert trends.change('bugs', timestamps, columns['bugs'], START) == (5.0, 5.0, None)
+    assert trends.change('bugs', timestamps[:3], columns['bugs'][:3], START) == (0.0, 0.0, 0.0)
+    assert trends.change('bugs', timestamps[:1], columns['bugs'][:1], START) == (None, None, None)
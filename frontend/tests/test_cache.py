@@ -0,0 +1,43 @@
+# frontend/tests/test_cache.py
+import cache
+import utils
+from ingest import Columns
+
+
+def test_fetchers_with_same_endpoint_have_separate_keys(swr):
+    @cache.swr_cache('shared')
+    def first(project_id):
+        return ('first', project_id)
+
+    @cache.swr_cache('shared')
+    def second(project_id):
+        return ('second', project_id)
+
+    assert first('p') == ('first', 'p')
+    assert second('p') == ('second', 'p')
+    assert first('p') == ('first', 'p')
+
+
+def test_key_normalizes_positional_keyword_and_default_arguments(swr):
+    calls = []
+
+    @cache.swr_cache('normalized')
+    def fetch(project_id, page=1):
+        calls.append((project_id, page))
+        return len(calls)
+
+    assert fetch('p') == fetch('p', 1) == fetch(project_id='p', page=1) == 1
+    assert fetch('p', 2) == 2
+    assert calls == [('p', 1), ('p', 2)]
+
+
+def test_all_new_code_issues_not_shadowed_by_new_code_issues(swr, monkeypatch):
+    payload = {'issues': {
+        'bugs': Columns.from_records([{'key': 'A', 'type': 'BUG', 'message': 'm'}], utils.DIFF_ISSUE_FIELDS),
+    }}
+    monkeypatch.setattr(utils, 'api_get', lambda path, params=None, stream=None: payload)
+
+    assert utils.get_new_code_issues('proj') is payload
+    issues = utils.get_all_new_code_issues('proj')
+    assert isinstance(issues, Columns)
+    assert list(issues['key']) == ['A']
@@ -0,0 +1,103 @@
+# frontend/tests/test_cache_backends.py
+# Backend SQLite compartilhado e single-flight entre processos (leases)
+import threading
+
+import pytest
+
+import cache
+import memory
+from ingest import NUMBER, TEXT, Columns
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    # Os backends criados nos testes registram seus pools fora do registro do processo
+    monkeypatch.setattr(memory, '_pools', dict(memory._pools))
+    return str(tmp_path / 'cache.sqlite3')
+
+
+def test_sqlite_round_trip_with_columns(db_path):
+    rows = Columns.from_records([{'path': 'a.py', 'coverage': 50}, {'path': 'b.py'}], {'path': TEXT, 'coverage': NUMBER})
+    value = {'components': rows, 'paging': {'total': 2}}
+
+    cache.SQLiteBackend(db_path).set(('complexity', 'f', (('project_id', 'p'),)), value, 123.0)
+    # Outra instância (outro processo) decodifica do arquivo
+    entry = cache.SQLiteBackend(db_path).get(('complexity', 'f', (('project_id', 'p'),)))
+
+    assert entry.fetched_at == 123.0
+    assert entry.value['paging'] == {'total': 2}
+    assert isinstance(entry.value['components'], Columns)
+    assert entry.value['components'].to_records() == rows.to_records()
+
+
+def test_sqlite_clear_by_endpoint_and_retry(db_path):
+    backend = cache.SQLiteBackend(db_path)
+    backend.set(('a', 'f', ()), 1, 1.0)
+    backend.set(('b', 'f', ()), 2, 1.0)
+    backend.mark_retry(('b', 'f', ()), 50.0)
+
+    backend.clear('a')
+
+    assert backend.get(('a', 'f', ())) is None
+    assert backend.get(('b', 'f', ())).retry_at == 50.0
+
+
+def test_sqlite_decoded_copies_are_bounded_and_governed(db_path):
+    backend = cache.SQLiteBackend(db_path, max_bytes=4096)
+    for i in range(50):
+        backend.set(('a', 'f', (('i', i),)), {'payload': 'x' * 200, 'i': i}, float(i))
+
+    assert memory._pools['swr_cache'] is backend._decoded
+    assert backend._decoded.usage()['bytes'] <= 4096 and len(backend._decoded) < 50
+    # Cópias descartadas voltam do arquivo
+    assert backend.get(('a', 'f', (('i', 0),))).value == {'payload': 'x' * 200, 'i': 0}
+    assert backend._decoded.shrink(10**9) > 0 and len(backend._decoded) == 0
+    assert backend.get(('a', 'f', (('i', 49),))).fetched_at == 49.0
+
+
+def test_lease_is_exclusive_until_released_or_expired(db_path):
+    first, second = cache.SQLiteBackend(db_path), cache.SQLiteBackend(db_path)
+
+    assert first.try_acquire('k', 'p1', ttl=30)
+    assert not second.try_acquire('k', 'p2', ttl=30)
+    first.release('k', 'p1')
+    assert second.try_acquire('k', 'p2', ttl=30)
+    # Lease vencido pode ser tomado por outro processo
+    assert first.try_acquire('other', 'p1', ttl=-1)
+    assert second.try_acquire('other', 'p2', ttl=30)
+
+
+def test_single_flight_across_processes(db_path, monkeypatch):
+    monkeypatch.setattr(cache, 'LEASE_POLL_SECONDS', 0.01)
+    leader = cache.SWRCache(cache.SQLiteBackend(db_path))
+    follower = cache.SWRCache(cache.SQLiteBackend(db_path))
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append('leader')
+        started.set()
+        release.wait(5)
+        return {'value': 1}
+
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('leader', leader.get('test', ('test', 'f', ()), slow_fetch)))
+    thread.start()
+    started.wait(5)
+
+    def follower_fetch():
+        calls.append('follower')
+        return {'value': 2}
+
+    threading.Timer(0.1, release.set).start()
+    value = follower.get('test', ('test', 'f', ()), follower_fetch)
+    thread.join(5)
+
+    assert calls == ['leader']
+    assert value == result['leader'] == {'value': 1}
+
+
+def test_create_backend_rejects_unknown_name():
+    assert isinstance(cache.create_backend('memory'), cache.MemoryBackend)
+    with pytest.raises(ValueError):
+        cache.create_backend('redis')
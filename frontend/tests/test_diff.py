@@ -0,0 +1,111 @@
+# frontend/tests/test_diff.py
+import numpy as np
+import pandas as pd
+
+import diff
+from ingest import Columns
+from utils import DIFF_ISSUE_FIELDS
+
+
+def issues(records):
+    return Columns.from_records(records, DIFF_ISSUE_FIELDS)
+
+
+def test_files_diff_statuses_and_deltas():
+    before = pd.DataFrame({'path': ['a.py', 'b.py', 'c.py'], 'complexity': [1.0, 2.0, 3.0]})
+    after = pd.DataFrame({'path': ['b.py', 'c.py', 'd.py'], 'complexity': [2.0, 5.0, 7.0]})
+
+    result = diff.files_diff(before, after, fields=['complexity']).set_index('path')
+
+    assert result['status'].to_dict() == {
+        'b.py': 'inalterado', 'c.py': 'alterado', 'd.py': 'adicionado', 'a.py': 'removido',
+    }
+    assert result.at['c.py', 'complexityDelta'] == 2.0
+    assert np.isnan(result.at['d.py', 'complexityBefore'])
+    assert result.at['d.py', 'complexityAfter'] == 7.0
+    assert result.at['a.py', 'complexityBefore'] == 1.0
+    assert np.isnan(result.at['a.py', 'complexityAfter'])
+
+
+def test_files_diff_missing_values_are_unchanged_when_both_missing():
+    before = pd.DataFrame({'path': ['a.py', 'b.py'], 'coverage': [np.nan, np.nan]})
+    after = pd.DataFrame({'path': ['a.py', 'b.py'], 'coverage': [np.nan, 50.0]})
+
+    result = diff.files_diff(before, after, fields=['coverage']).set_index('path')
+
+    assert result['status'].to_dict() == {'a.py': 'inalterado', 'b.py': 'alterado'}
+
+
+def test_files_diff_empty_before_marks_everything_added():
+    before = pd.DataFrame({'path': pd.Series([], dtype=object), 'risk': pd.Series([], dtype=float)})
+    after = pd.DataFrame({'path': ['a.py'], 'risk': [0.5]})
+
+    result = diff.files_diff(before, after, fields=['risk'])
+
+    assert list(result['status']) == ['adicionado']
+
+
+def test_issue_keys_prefers_key_and_numbers_repeated_fallbacks():
+    rows = issues([
+        {'key': 'K1', 'component': 'a.py', 'message': 'm'},
+        {'component': 'a.py', 'message': 'm', 'line': 10},
+        {'component': 'a.py', 'message': 'm', 'line': 20},
+        {'component': 'b.py', 'message': 'm'},
+    ])
+
+    keys = diff.issue_keys(rows)
+
+    assert keys[0] == 'K1'
+    assert keys[1] == 'a.py\x1fm\x1f0'
+    assert keys[2] == 'a.py\x1fm\x1f1'
+    assert keys[3] == 'b.py\x1fm\x1f0'
+
+
+def test_issues_diff_ignores_line_moves_without_key():
+    before = issues([
+        {'key': 'K1', 'message': 'x'},
+        {'key': 'K2', 'message': 'y'},
+        {'component': 'a.py', 'message': 'm', 'line': 10},
+    ])
+    after = issues([
+        {'key': 'K2', 'message': 'y'},
+        {'key': 'K3', 'message': 'z'},
+        {'component': 'a.py', 'message': 'm', 'line': 12},
+    ])
+
+    added, resolved = diff.issues_diff(before, after)
+
+    assert list(added['key']) == ['K3']
+    assert list(resolved['key']) == ['K1']
+
+
+def test_metrics_diff_ratings_and_deltas():
+    before = {'bugs': 10.0, 'coverage': 50.0, 'debtRatio': 0.0, 'reliabilityRating': 3, 'securityRating': 1}
+    after = {'bugs': 5.0, 'coverage': 60.0, 'debtRatio': 1.0, 'reliabilityRating': 1, 'securityRating': 2}
+
+    ratings, metrics = diff.metrics_diff(before, after)
+
+    changes = dict(zip(ratings['métrica'], ratings['mudança']))
+    assert changes['Confiabilidade'] == 'melhorou'
+    assert changes['Segurança'] == 'piorou'
+    assert changes['Manutenibilidade'] == 'igual'
+    assert list(ratings.loc[ratings['métrica'] == 'Confiabilidade', ['antes', 'depois']].iloc[0]) == ['C', 'A']
+
+    metrics = metrics.set_index('campo')
+    assert metrics.at['bugs', 'delta'] == -5.0
+    assert metrics.at['bugs', 'delta %'] == -50.0
+    assert metrics.at['coverage', 'delta %'] == 20.0
+    # Sem base (antes = 0) ou sem dado, o percentual fica indefinido
+    assert np.isnan(metrics.at['debtRatio', 'delta %'])
+    assert np.isnan(metrics.at['duplication', 'delta'])
+
+
+def test_diff_points_without_files_or_issues():
+    before = diff.PointData({'bugs': 1.0})
+    after = diff.PointData({'bugs': 2.0}, files=pd.DataFrame({'path': ['a.py']}))
+
+    result = diff.diff_points(before, after)
+
+    assert result.files is None
+    assert result.issues_added is None
+    assert result.file_counts() == {}
@@ -0,0 +1,97 @@
+# frontend/tests/test_dora.py
+# Métricas DORA por janela (somas prefixadas) contra um cálculo direto
+import numpy as np
+import pandas as pd
+import pytest
+
+import dora
+
+END = pd.Timestamp('2024-06-30T00:00:00Z')
+
+
+def _deployments(count=120, seed=5):
+    rng = np.random.default_rng(seed)
+    deployments = []
+    for i in range(count):
+        moment = END - pd.Timedelta(minutes=int(rng.integers(0, 90 * 1440)))
+        status = 'failure' if rng.random() < 0.25 else 'success'
+        deployments.append({
+            'id': i,
+            'deploymentTimestamp': moment.isoformat().replace('+00:00', 'Z'),
+            'status': status,
+            'leadTimeMinutes': None if i % 11 == 0 else float(rng.integers(5, 3000)),
+        })
+    return deployments
+
+
+def _naive(deployments, days, end):
+    start = end - pd.Timedelta(days=days)
+    window = sorted(
+        (d for d in deployments if start <= pd.Timestamp(d['deploymentTimestamp']) <= end),
+        key=lambda d: d['deploymentTimestamp'],
+    )
+    leads = [d['leadTimeMinutes'] for d in window if d['status'] == 'success' and d['leadTimeMinutes'] is not None]
+    failures = [pd.Timestamp(d['deploymentTimestamp']) for d in window if d['status'] == 'failure']
+    mttr = (failures[-1] - failures[0]).total_seconds() / 60 / (len(failures) - 1) if len(failures) > 1 else 0.0
+    return window, leads, failures, mttr
+
+
+@pytest.mark.parametrize('days', [1, 7, 30, 90])
+def test_metrics_match_direct_computation(days):
+    deployments = _deployments()
+    metrics = dora.DeploymentLog(deployments).metrics(days, end=END)
+    window, leads, failures, mttr = _naive(deployments, days, END)
+
+    assert metrics['deploymentFrequency']['total'] == len(window)
+    assert metrics['changeFailureRate']['failures'] == len(failures)
+    assert metrics['changeFailureRate']['rate'] == (round(100 * len(failures) / len(window), 2) if window else 0)
+    assert metrics['meanTimeToRestore']['average'] == pytest.approx(round(mttr, 2))
+    if leads:
+        assert metrics['leadTime']['average'] == pytest.approx(round(float(np.mean(leads)), 2))
+        for p in dora.LEAD_TIME_PERCENTILES:
+            assert metrics['leadTime']['percentiles'][f"p{p}"] == pytest.approx(round(float(np.percentile(leads, p)), 2))
+    if window:
+        assert metrics['period']['firstDeployment'] == window[0]['deploymentTimestamp']
+        assert metrics['period']['lastDeployment'] == window[-1]['deploymentTimestamp']
+
+
+def test_series_points_match_metrics():
+    deployments = _deployments()
+    log = dora.DeploymentLog(deployments)
+    series = log.series(days=7, span_days=30, step_days=3, end=END)
+
+    assert len(series) == 10
+    assert series['timestamp'].iloc[-1] == END
+    for row in series.itertuples():
+        window, leads, failures, mttr = _naive(deployments, 7, row.timestamp)
+        assert row.deploys == len(window)
+        expected_median = np.median(leads) if leads else np.nan
+        expected_mttr = mttr if len(failures) > 1 else np.nan
+        assert row.leadTimeMedian == pytest.approx(expected_median, nan_ok=True)
+        assert row.mttr == pytest.approx(expected_mttr, nan_ok=True)
+
+
+def test_empty_and_invalid_deployments():
+    log = dora.DeploymentLog([{'deploymentTimestamp': 'not a date', 'status': 'success'}])
+    metrics = log.metrics(30, end=END)
+
+    assert len(log) == 0
+    assert metrics['deploymentFrequency'] == {'total': 0, 'perDay': 0, 'description': 'Low'}
+    assert metrics['period']['firstDeployment'] is None
+    assert metrics['meanTimeToRestore']['average'] == 0.0
+    assert dora.DeploymentLog(None).series(days=7, span_days=7, end=END)['mttr'].isna().all()
+
+
+def test_levels_follow_backend_thresholds():
+    assert [dora.frequency_level(v) for v in (1, 0.14, 0.03, 0.01)] == ['Elite', 'High', 'Medium', 'Low']
+    assert [dora.duration_level(v) for v in (60, 1440, 10080, 10081)] == ['Elite', 'High', 'Medium', 'Low']
+    assert [dora.failure_rate_level(v) for v in (15, 30, 45, 46)] == ['Elite', 'High', 'Medium', 'Low']
+
+
+def test_deployment_log_rebuilds_only_when_payload_changes():
+    deployments = _deployments(10)
+    first = dora.deployment_log('test-dora', {'deployments': deployments})
+
+    assert dora.deployment_log('test-dora', {'deployments': list(deployments)}) is first
+    changed = dora.deployment_log('test-dora', {'deployments': deployments + [dict(deployments[0], id=99)]})
+    assert changed is not first and len(changed) == 11
@@ -0,0 +1,52 @@
+# frontend/tests/test_figures.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import figures
+
+
+@pytest.fixture
+def figure_cache(monkeypatch):
+    cache = figures.FigureCache(10 * 1024 * 1024)
+    monkeypatch.setattr(figures, '_figures', cache)
+    return cache
+
+
+def test_set_does_not_serialize_the_figure(figure_cache, monkeypatch):
+    import plotly.graph_objects as go
+
+    def fail(*args, **kwargs):
+        raise AssertionError("to_json chamado ao gravar no cache")
+    monkeypatch.setattr(go.Figure, 'to_json', fail)
+
+    figure = go.Figure(go.Scatter(x=np.arange(10000), y=np.random.rand(10000)))
+    figure_cache.set('key', figure)
+
+    # Dois arrays de 10k valores de 8 bytes
+    assert figure_cache.stats()['bytes'] >= 160000
+    assert figure_cache.get('key') is figure
+
+
+def test_cached_figure_reuses_figure_for_same_content(figure_cache):
+    df = pd.DataFrame({'timestamp': pd.date_range('2024-01-01', periods=3, freq='D', tz='UTC'), 'value': [1.0, 2.0, 3.0]})
+
+    first = figures.effort_pie_figure(12.5)
+    assert figures.effort_pie_figure(12.5) is first
+    assert figures.effort_pie_figure(13.0) is not first
+    assert figures.content_key('f', (df,), {}) == figures.content_key('f', (df.copy(),), {})
+    assert figures.content_key('f', (df,), {}) != figures.content_key('f', (df.assign(value=[1.0, 2.0, 4.0]),), {})
+
+
+def test_cache_evicts_least_recently_used_over_budget(monkeypatch):
+    cache = figures.FigureCache(250)
+    monkeypatch.setattr(figures, 'figure_bytes', lambda figure: 100)
+
+    cache.set('a', object())
+    cache.set('b', object())
+    cache.get('a')
+    cache.set('c', object())
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.stats()['bytes'] == 200
@@ -0,0 +1,96 @@
+# frontend/tests/test_ingest.py
+# Leitura em streaming dos payloads para Columns, comparada ao json.loads
+import json
+
+import numpy as np
+import pytest
+
+import ingest
+from ingest import NUMBER, TEXT, Columns, StreamError
+
+FIELDS = {'key': TEXT, 'coverage': NUMBER, 'lines': NUMBER}
+TARGETS = {'components': FIELDS, 'issues.bugs': {'key': TEXT, 'line': NUMBER}, 'facets': None}
+
+PAYLOAD = {
+    'paging': {'pageIndex': 1, 'total': 4},
+    'components': [
+        {'key': 'src/ação.py', 'coverage': 81.5, 'lines': 120, 'extra': [1, {'a': 'b'}]},
+        {'key': 'src/b.py', 'coverage': '42', 'lines': None},
+        {'key': 7, 'coverage': True},
+        {},
+    ],
+    'issues': {'bugs': [{'key': 'B1', 'line': 3}, {'key': 'B2'}], 'total': 2},
+    'facets': [{'property': 'severity', 'values': [{'val': 'MAJOR', 'count': 1}]}],
+    'note': 'texto com "aspas", \\n e é',
+}
+
+
+def _chunks(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@pytest.fixture(params=['builtin', 'ijson'])
+def parser(request, monkeypatch):
+    if request.param == 'ijson' and ingest.ijson is None:
+        pytest.skip('ijson não instalado')
+    monkeypatch.setattr(ingest, 'INGEST_PARSER', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64, 1 << 16])
+def test_stream_matches_columnar_of_json_loads(parser, size):
+    data = json.dumps(PAYLOAD, ensure_ascii=False).encode('utf-8')
+
+    streamed = ingest.parse_stream(_chunks(data, size), TARGETS)
+    loaded = ingest.columnar(json.loads(data), TARGETS)
+
+    assert ingest.to_jsonable(streamed) == ingest.to_jsonable(loaded)
+    assert 'facets' not in streamed
+    assert isinstance(streamed['issues']['bugs'], Columns)
+    assert streamed['components'].to_records() == [
+        {'key': 'src/ação.py', 'coverage': 81.5, 'lines': 120},
+        {'key': 'src/b.py', 'coverage': 42, 'lines': None},
+        {'key': '7', 'coverage': None, 'lines': None},
+        {'key': None, 'coverage': None, 'lines': None},
+    ]
+
+
+def test_target_that_is_not_a_list_is_kept(parser):
+    data = json.dumps({'components': {'total': 0}, 'issues': 5}).encode()
+
+    assert ingest.parse_stream(_chunks(data, 4), TARGETS) == {'components': {'total': 0}, 'issues': 5}
+
+
+def test_columnar_does_not_modify_payload():
+    payload = json.loads(json.dumps(PAYLOAD))
+    ingest.columnar(payload, TARGETS)
+
+    assert payload == json.loads(json.dumps(PAYLOAD))
+
+
+@pytest.mark.parametrize('data', [
+    b'{"components": [{"key": "a"}, {"key": "b"',
+    b'{"components": [{"key": "a"}}',
+    b'{"paging": {"total": 1}',
+    b'{"paging" 1}',
+])
+def test_truncated_or_invalid_input_raises(parser, data):
+    with pytest.raises(StreamError):
+        ingest.parse_stream(_chunks(data, 5), TARGETS)
+
+
+def test_columns_operations_round_trip():
+    first = Columns.from_records([{'key': 'a', 'coverage': 10}, {'key': 'b', 'coverage': 20.5}], FIELDS)
+    second = Columns.from_records([{'key': 'c'}], FIELDS)
+    joined = Columns.concat([first, Columns(FIELDS).finish(), second], FIELDS)
+
+    assert len(joined) == 3
+    assert np.array_equal(joined['coverage'], [10, 20.5, np.nan], equal_nan=True)
+    assert joined.take(joined.isin('key', {'a', 'c'})).to_records() == [
+        {'key': 'a', 'coverage': 10, 'lines': None},
+        {'key': 'c', 'coverage': None, 'lines': None},
+    ]
+    assert joined.take(slice(1, 2))['key'] == ['b']
+    assert Columns.from_json(json.loads(json.dumps(joined.to_json()))).to_records() == joined.to_records()
+    assert list(joined.to_frame(['key', 'missing']).columns) == ['key', 'missing']
+    assert not Columns.concat([], FIELDS)
@@ -0,0 +1,87 @@
+# frontend/tests/test_instrumentation.py
+import pytest
+
+import instrumentation
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = instrumentation.Registry()
+    monkeypatch.setattr(instrumentation, 'registry', fresh)
+    return fresh
+
+
+def test_upstream_statuses_of_mixed_types_export(registry):
+    for status in (200, 'deduplicated', 304, 'error', 503, 'circuit_open'):
+        instrumentation.record_upstream('/metrics/latest', status, 0.01)
+
+    text = registry.to_prometheus()
+    assert 'sonarview_upstream_requests_total{path="/metrics/latest",status="200"} 1' in text
+    assert 'sonarview_upstream_requests_total{path="/metrics/latest",status="circuit_open"} 1' in text
+
+    statuses = {
+        counter['labels']['status']
+        for counter in registry.to_json()['counters']
+        if counter['metric'] == 'sonarview_upstream_requests_total'
+    }
+    assert statuses == {'200', '304', '503', 'deduplicated', 'error', 'circuit_open'}
+
+
+def test_int_and_str_label_values_share_a_series(registry):
+    registry.inc('sonarview_upstream_requests_total', {'path': '/p', 'status': 200})
+    registry.inc('sonarview_upstream_requests_total', {'path': '/p', 'status': '200'})
+
+    [counter] = registry.to_json()['counters']
+    assert counter['value'] == 2
+
+
+def test_histogram_exposition_is_cumulative(registry):
+    for seconds in (0.001, 0.2, 50):
+        registry.observe('sonarview_fetch_seconds', {'endpoint': 'projects'}, seconds)
+
+    lines = [line for line in registry.to_prometheus().splitlines() if line.startswith('sonarview_fetch_seconds')]
+    buckets = [int(line.rsplit(' ', 1)[1]) for line in lines if '_bucket' in line]
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == 3
+    assert 'sonarview_fetch_seconds_count{endpoint="projects"} 3' in lines
+
+
+def test_finished_trace_ignores_late_events(registry):
+    trace = instrumentation.PageTrace('page')
+    trace.add('fetch', name='a')
+    trace.finish()
+    # Reexecuções de fragmentos depois do fim da página
+    trace.add('fetch', name='b')
+
+    assert [event['name'] for event in trace.summary()['events']] == ['a']
+
+
+def test_trace_events_are_capped(registry, monkeypatch):
+    monkeypatch.setattr(instrumentation, 'MAX_TRACE_EVENTS', 3)
+    trace = instrumentation.PageTrace('page')
+    for i in range(5):
+        trace.add('fetch', name=str(i))
+
+    summary = trace.summary()
+    assert [event['name'] for event in summary['events']] == ['2', '3', '4']
+    assert summary['droppedEvents'] == 2
+
+
+def test_stop_finishes_trace_before_stopping(registry, monkeypatch):
+    import streamlit as st
+
+    class Stopped(Exception):
+        pass
+
+    def stop():
+        raise Stopped()
+
+    monkeypatch.setattr(st, 'stop', stop)
+    trace = instrumentation.PageTrace('page')
+
+    with pytest.raises(Stopped):
+        trace.stop()
+
+    assert trace.finished
+    histogram, = registry.to_json()['histograms']
+    assert histogram['labels'] == {'page': 'page'} and histogram['count'] == 1
@@ -0,0 +1,41 @@
+# frontend/tests/test_issues.py
+# Filtros de severidade e de arquivos das issues de código novo
+import pytest
+
+import utils
+from ingest import Columns
+from stub_backend import StubBackend
+
+
+@pytest.fixture(params=['paginated', 'full'])
+def backend(request, swr, monkeypatch):
+    """Backend que pagina e filtra (stub) ou que devolve a lista completa sem `paging`."""
+    stub = StubBackend(scale=0.2)
+    requests_made = []
+
+    def api_get(path, params=None, stream=None):
+        requests_made.append(dict(params))
+        if request.param == 'full':
+            params = {'project': params['project'], 'pageSize': 500}
+        payload = stub.handle(path, params)[1]
+        if request.param == 'full':
+            payload = {k: v for k, v in payload.items() if k not in ('paging', 'facets')}
+        groups = {group: Columns.from_records(rows, utils.ISSUE_FIELDS) for group, rows in payload['issues'].items() if group != 'byFile'}
+        return {**payload, 'issues': groups}
+
+    monkeypatch.setattr(utils, 'api_get', api_get)
+    return stub, requests_made
+
+
+def test_file_filter_spans_all_pages(backend):
+    stub, requests_made = backend
+    all_bugs = stub.dataset(stub.default_project)['issues']['issues']['bugs']
+    files = tuple(sorted({issue['component'] for issue in all_bugs})[:3])
+    expected = [issue for issue in all_bugs if issue['component'] in files]
+
+    counts = utils.get_new_code_issue_counts(stub.default_project, None, files)
+    page = utils.get_new_code_issues_page(stub.default_project, 'BUG', 1, 2, None, files)
+
+    assert counts['BUG'] == len(expected) == page['total']
+    assert list(page['issues']['component']) == [issue['component'] for issue in expected[:2]]
+    assert any(made.get('files') == ','.join(files) for made in requests_made)
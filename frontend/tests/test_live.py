@@ -0,0 +1,80 @@
+# frontend/tests/test_live.py
+import requests
+
+import live
+
+
+def make_state(token='t1', base=30):
+    return {
+        'page': 'managerView', 'project': 'proj', 'token': token, 'base': base, 'interval': base,
+        'next_poll': 0, 'checked_at': None, 'sections': {},
+    }
+
+
+def test_poll_detects_change_and_backs_off_without_it(monkeypatch):
+    tokens = iter(['t1', 't2'])
+    applied = []
+    monkeypatch.setattr(live, 'change_token', lambda project_id: (next(tokens), {}))
+    monkeypatch.setattr(live, 'apply_change', applied.append)
+    state = make_state()
+
+    assert live.poll(state, now=100) is False
+    assert state['interval'] == 30 * live.LIVE_BACKOFF_FACTOR
+    # Antes do próximo horário não consulta
+    assert live.poll(state, now=101) is False
+
+    assert live.poll(state, now=state['next_poll']) is True
+    assert state['token'] == 't2'
+    assert state['interval'] == 30
+    assert applied == ['proj']
+
+
+def test_poll_error_keeps_token(monkeypatch):
+    def fail(project_id):
+        raise requests.exceptions.ConnectionError()
+    monkeypatch.setattr(live, 'change_token', fail)
+    state = make_state()
+
+    assert live.poll(state, now=100) is False
+    assert state['token'] == 't1'
+
+
+def test_change_token_goes_through_cached_fetcher(swr, monkeypatch):
+    import utils
+
+    calls = []
+    monkeypatch.setattr(utils, 'api_get', lambda path, params=None: calls.append(path) or {'timestamp': f't{len(calls)}'})
+
+    assert utils.get_latest_metrics('proj') == {'timestamp': 't1'}
+    # O polling ignora o TTL e grava o valor novo no cache dos fetchers
+    assert live.change_token('proj')[0] == 't2'
+    assert utils.get_latest_metrics('proj') == {'timestamp': 't2'}
+    assert calls == ['/metrics/latest', '/metrics/latest']
+
+
+def test_section_data_reloads_only_on_new_token_or_params():
+    state = make_state()
+    loads = []
+
+    def load(value):
+        return lambda: loads.append(value) or value
+
+    assert live.section_data(state, 'kpis', 30, load('a')) == 'a'
+    assert live.section_data(state, 'kpis', 30, load('b')) == 'a'
+    assert loads == ['a']
+
+    # Outros parâmetros (widget da seção) recarregam sem marcar como atualizada
+    assert live.section_data(state, 'kpis', 60, load('c')) == 'c'
+    assert state['sections']['kpis']['updated'] is None
+
+    # Snapshot novo: só marca a seção cujo conteúdo mudou
+    live.section_data(state, 'trends', 60, load('x'))
+    state['token'] = 't2'
+    assert live.section_data(state, 'kpis', 60, load('d')) == 'd'
+    assert live.section_data(state, 'trends', 60, load('x')) == 'x'
+    assert state['sections']['kpis']['updated'] is not None
+    assert state['sections']['trends']['updated'] is None
+
+
+def test_section_data_without_live_mode_always_loads():
+    assert live.section_data(None, 'kpis', 30, lambda: 'a') == 'a'
@@ -0,0 +1,87 @@
+# frontend/tests/test_memory.py
+import sys
+
+import pytest
+
+import memory
+
+
+def test_sizeof_small_dict_is_exact():
+    value = {'a': 'x' * 100, 'b': 12345}
+    expected = sum(sys.getsizeof(part) for part in (value, 'a', 'x' * 100, 'b', 12345))
+    assert memory.sizeof(value) == expected
+
+
+def test_sizeof_samples_large_dicts():
+    value = {f'key-{i:05d}': 'v' * 200 + str(i) for i in range(10000)}
+    exact = sys.getsizeof(value) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+
+    seen = set()
+    estimate = memory.sizeof(value, seen)
+
+    assert estimate == pytest.approx(exact, rel=0.05)
+    # Só a amostra de chaves e valores é visitada
+    assert len(seen) <= 1 + 2 * memory.SIZEOF_SAMPLE
+
+
+def test_sizeof_samples_large_lists():
+    value = ['x' * 50 + str(i) for i in range(5000)]
+    seen = set()
+    assert memory.sizeof(value, seen) == pytest.approx(memory.sizeof(value[:200]) * 25, rel=0.1)
+    assert len(seen) <= 1 + memory.SIZEOF_SAMPLE
+
+
+class Growing:
+    def __init__(self):
+        self.version = 0
+        self.items = []
+
+    def add(self, count):
+        self.items.extend('y' * 100 for _ in range(count))
+        self.version += 1
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(memory, '_pools', {})
+    return memory.LRUPool('test', dynamic=True)
+
+
+def test_dynamic_pool_remeasures_only_after_mutation(pool, monkeypatch):
+    value = pool.put('a', Growing())
+    measured = []
+    real_sizeof = memory.sizeof
+    monkeypatch.setattr(memory, 'sizeof', lambda item, _seen=None: measured.append(item) or real_sizeof(item, _seen))
+
+    before = pool.usage()['bytes']
+    pool.usage()
+    assert measured == []
+
+    value.add(50)
+    after = pool.usage()['bytes']
+    assert measured == [value]
+    assert after > before
+    pool.usage()
+    assert measured == [value]
+
+
+def test_pool_shrinks_least_recently_used_first(pool):
+    pool.put('old', 'a' * 1000)
+    pool.put('new', 'b' * 1000)
+    pool.get('old')
+
+    freed = pool.shrink(1)
+
+    assert freed > 0
+    assert pool.get('new') is None
+    assert pool.get('old') is not None
+    assert pool.evictions == 1
+
+
+def test_history_store_version_tracks_mutations():
+    from history import HistoryStore
+
+    store = HistoryStore('proj')
+    version = store.version
+    store.append([{'timestamp': '2024-01-01T00:00:00Z', 'reliability': {'bugs': 1}}])
+    assert store.version > version
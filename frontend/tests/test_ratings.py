@@ -0,0 +1,65 @@
+# frontend/tests/test_ratings.py
+# As funções vetorizadas devem produzir o mesmo resultado que as escalares
+import numpy as np
+import pytest
+
+import ratings
+
+RATINGS = [1, 2.0, '3', '4.0', 5, 'A', 'B', 'C', 'D', 'E', None, '*', 'x', 6, 0, np.nan]
+COVERAGES = ['12.35', 1.45, 0.05, '99.95', 100, 0, '0.0', 33.333, '*', None, 'abc', '']
+
+
+def test_format_coverage_series_matches_coverage_text():
+    expected = [ratings.coverage_text(value) for value in COVERAGES]
+    assert list(ratings.format_coverage_series(COVERAGES)) == expected
+
+
+@pytest.mark.parametrize('values', [COVERAGES[:8], np.array([12.35, 1.45, 0.05, 99.95])])
+def test_format_coverage_series_numeric_inputs(values):
+    expected = [ratings.coverage_text(value) for value in values]
+    assert list(ratings.format_coverage_series(values)) == expected
+
+
+def test_is_numeric_array_matches_is_numeric():
+    assert list(ratings.is_numeric_array(COVERAGES)) == [ratings.is_numeric(value) for value in COVERAGES]
+
+
+def test_ratings_to_scores_matches_rating_score():
+    assert list(ratings.ratings_to_scores(RATINGS)) == [ratings.rating_score(value) for value in RATINGS]
+
+
+def test_ratings_to_letters_and_colors_match_scalar():
+    letters = ratings.ratings_to_letters(RATINGS).tolist()
+    colors = ratings.ratings_to_colors(RATINGS).tolist()
+    for value, letter, color in zip(RATINGS[:-1], letters, colors):
+        assert letter == ratings.rating_letter(value)
+        assert color == ratings.rating_color(value)
+
+
+def test_categorical_ratings_match_plain_values():
+    import pandas as pd
+
+    values = pd.Series(['A', 'C', None, 'E', 'A'], dtype='category')
+    assert list(ratings.rating_codes(values)) == [1, 3, 0, 5, 1]
+
+
+def test_quality_scores_match_quality_index():
+    reliability = ratings.rating_codes([1, 3, None])
+    security = ratings.rating_codes(['B', 'E', 2])
+    maintainability = ratings.rating_codes([5, None, 'A'])
+    coverage = [81.3, np.nan, 12.35]
+    duplication = [3.2, 120.0, np.nan]
+
+    scores = ratings.quality_scores(reliability, security, maintainability, coverage, duplication)
+
+    for row, (r, s, m, c, d) in enumerate(zip([1, 3, None], ['B', 'E', 2], [5, None, 'A'], coverage, duplication)):
+        expected = {
+            'reliabilityScore': ratings.rating_score(r),
+            'securityScore': ratings.rating_score(s),
+            'maintainabilityScore': ratings.rating_score(m),
+            'coverageScore': ratings.coverage_score(None if np.isnan(c) else c),
+            'codeQualityScore': ratings.duplication_score(None if np.isnan(d) else d),
+        }
+        for name, value in expected.items():
+            assert scores[name][row] == pytest.approx(value, abs=1e-4)
+        assert scores['qualityIndex'][row] == pytest.approx(ratings.quality_index(expected), abs=1e-4)
@@ -0,0 +1,20 @@
+# frontend/tests/test_reports.py
+# Estado do lote de relatórios quando a preparação do diretório falha
+import pytest
+
+import reports
+
+
+def test_batch_failure_finishes_job(tmp_path):
+    blocker = tmp_path / 'arquivo'
+    blocker.write_text('')
+    job = reports.ReportJob([{'id': 'a'}, {'id': 'b', 'name': 'B'}], str(blocker / 'lote'))
+
+    with pytest.raises(OSError):
+        job.run()
+
+    progress = job.progress()
+    assert not job.running and not progress['running']
+    assert progress['error'].startswith(('FileExistsError', 'NotADirectoryError'))
+    assert progress['failed'] == progress['done'] == 2
+    assert {p['error'] for p in progress['projects']} == {progress['error']}
@@ -0,0 +1,64 @@
+# frontend/tests/test_snapshots.py
+# Exportação de snapshots e leitura de volta pelo SnapshotBackend
+import pytest
+
+import snapshots
+from stub_backend import StubBackend
+
+ALL_HOURS = 24 * 365 * 20
+ALL_DAYS = 365 * 20
+
+
+def _present(value):
+    """Sem os campos None: campos ausentes em parte dos registros voltam da tabela como None."""
+    if isinstance(value, dict):
+        return {k: _present(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_present(v) for v in value]
+    return value
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    backend = StubBackend(scale=0.05, projects=2)
+
+    def api_get(path, params=None):
+        status, body = backend.handle(path, params)
+        return body if status == 200 else None
+
+    monkeypatch.setattr(snapshots, 'api_get', api_get)
+    return backend
+
+
+@pytest.mark.parametrize('fmt', sorted(snapshots.FORMATS))
+def test_export_round_trip(stub, tmp_path, fmt):
+    manifest = snapshots.export_snapshot(tmp_path / fmt, fmt=fmt, history_hours=ALL_HOURS, deployment_days=ALL_DAYS)
+    snapshot = snapshots.SnapshotBackend(str(tmp_path / fmt))
+
+    assert manifest['format'] == fmt
+    assert snapshot.handle('/projects') == stub.handle('/projects')
+    for project_id in stub.project_ids:
+        params = {'project': project_id}
+        for path in ('/metrics/latest', '/sonarcloud/complexity', '/sonarcloud/coverage-by-file'):
+            assert _present(snapshot.handle(path, params)) == _present(stub.handle(path, params)), path
+        for name in ('history', 'deployments'):
+            assert _present(snapshot.dataset(project_id)[name]) == _present(stub.dataset(project_id)[name]), name
+        page = {**params, 'page': 2, 'pageSize': 7}
+        assert _present(snapshot.handle('/sonarcloud/new-code-issues', page)) == _present(stub.handle('/sonarcloud/new-code-issues', page))
+
+
+def test_export_selected_projects_and_listing(stub, tmp_path):
+    snapshots.export_snapshot(tmp_path / 'one', project_ids=['project-1'])
+    snapshot = snapshots.load_snapshot(str(tmp_path / 'one'))
+
+    assert snapshot.project_ids == ['project-1'] and snapshot.default_project == 'project-1'
+    assert snapshots.load_snapshot(str(tmp_path / 'one')) is snapshot
+    assert snapshot.handle('/metrics/latest', {'project': stub.default_project})[0] == 404
+    assert [s['name'] for s in snapshots.list_snapshots(str(tmp_path))] == ['one']
+
+
+def test_export_rejects_unknown_format_and_projects(stub, tmp_path):
+    with pytest.raises(ValueError):
+        snapshots.export_snapshot(tmp_path, fmt='csv')
+    with pytest.raises(ValueError):
+        snapshots.export_snapshot(tmp_path, project_ids=['missing'])
@@ -0,0 +1,182 @@
+# frontend/tests/test_swr.py
+# Cache stale-while-revalidate (SWRCache) com o backend em memória
+import threading
+import time
+
+import pytest
+import requests
+
+import cache
+
+
+@pytest.fixture
+def ttl(monkeypatch):
+    """Define (soft, hard) do endpoint 'test' e retorna o relógio controlado pelo teste."""
+    clock = {'now': 1000.0}
+    monkeypatch.setitem(cache.CACHE_TTLS, 'test', (10, 100))
+    monkeypatch.setattr(cache.time, 'time', lambda: clock['now'])
+    return clock
+
+
+def counter(values):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        value = values[len(calls) - 1]
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return fetch, calls
+
+
+def test_lookup_hit_stale_and_miss(swr, ttl, monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(swr, '_refresh_async', lambda key, fetch: refreshed.append(key))
+    fetch, calls = counter(['v1', 'v2'])
+
+    assert swr.lookup('test', 'k', fetch) == ('v1', 'miss')
+    assert swr.lookup('test', 'k', fetch) == ('v1', 'hit')
+
+    # Entre soft e hard: serve o valor antigo e agenda a revalidação
+    ttl['now'] += 50
+    assert swr.lookup('test', 'k', fetch) == ('v1', 'stale')
+    assert refreshed == ['k']
+
+    # Depois do hard TTL a busca volta a ser síncrona
+    ttl['now'] += 100
+    assert swr.lookup('test', 'k', fetch) == ('v2', 'miss')
+    assert len(calls) == 2
+
+
+def test_error_serves_last_value_even_after_hard_ttl(swr, ttl):
+    fetch, _ = counter(['v1', requests.exceptions.ConnectionError()])
+    swr.lookup('test', 'k', fetch)
+
+    ttl['now'] += 1000
+    assert swr.lookup('test', 'k', fetch) == ('v1', 'error')
+
+
+def test_error_without_value_calls_on_error_and_returns_default(swr, ttl):
+    errors = []
+    fetch, _ = counter([requests.exceptions.Timeout()])
+
+    assert swr.lookup('test', 'k', fetch, default=[], on_error=errors.append) == ([], 'error')
+    assert len(errors) == 1
+
+
+def test_failed_revalidation_waits_before_retrying(swr, ttl):
+    fetch, calls = counter(['v1', requests.exceptions.ConnectionError(), 'v3'])
+    swr.lookup('test', 'k', fetch)
+
+    ttl['now'] += 50
+    swr._refresh_async('k', fetch)
+    for _ in range(100):
+        if not swr._refreshing:
+            break
+        time.sleep(0.01)
+
+    entry = swr.backend.get('k')
+    assert entry.value == 'v1'
+    assert entry.retry_at == ttl['now'] + cache.ERROR_RETRY_SECONDS
+    assert len(calls) == 2
+
+
+def test_concurrent_misses_fetch_once(swr):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'value': 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(swr.get('test', 'k', fetch))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 10
+    assert all(result is results[0] for result in results)
+
+
+def test_concurrent_failure_is_shared_by_waiters(swr):
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        raise requests.exceptions.ConnectionError()
+
+    outcomes = []
+    threads = [
+        threading.Thread(target=lambda: outcomes.append(swr.lookup('test', 'k', fetch, default='d')))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert outcomes == [('d', 'error')] * 5
+
+
+def test_unexpected_error_reaches_followers(swr):
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        raise ValueError('payload inválido')
+
+    outcomes = {}
+
+    def run(name):
+        try:
+            outcomes[name] = swr.get('test', 'k', fetch)
+        except ValueError as exc:
+            outcomes[name] = exc
+
+    leader = threading.Thread(target=run, args=('leader',))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=run, args=('follower',))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert isinstance(outcomes['leader'], ValueError)
+    assert outcomes['follower'] is outcomes['leader']
+
+
+def test_get_ttl_environment_override(monkeypatch):
+    monkeypatch.setenv('CACHE_TTL_TEST', '5,2')
+    assert cache.get_ttl('test') == (5.0, 5.0)
+    monkeypatch.setenv('CACHE_TTL_TEST', 'x')
+    assert cache.get_ttl('test') == cache.DEFAULT_TTL
+
+
+def test_memory_backend_evicts_over_max_bytes():
+    backend = cache.MemoryBackend(max_bytes=3000)
+    for key in 'abc':
+        backend.set(key, 'x' * 1000, 0)
+
+    assert backend.get('a') is None
+    assert backend.get('c') is not None
+    assert backend.total_bytes <= 3000
+    assert backend.evictions == 1
@@ -1,74 +1,86 @@
 # frontend/utils.py
+# pandas e o histórico (NumPy/pandas) são importados apenas nas funções que
+# montam DataFrames, para não pesar na primeira renderização da página inicial.
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import requests
+import functools
 import os
-from datetime import datetime, timedelta
-
-API_URL = os.getenv("BACKEND_API_URL", "https://recebe-dados-sonarcloud.onrender.com/api")
-
-@st.cache_data(ttl=300)
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from api_client import api_get, backend_status, get_snapshot
+from cache import swr_cache
+from ingest import NUMBER, TEXT, Columns
+import ratings
+
+# Número máximo de chamadas simultâneas ao backend durante o prefetch de uma página
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "6"))
+# Diretório com snapshots exportados (snapshots.py) oferecidos como pontos de comparação
+SNAPSHOT_ARCHIVE_DIR = os.getenv("SNAPSHOT_ARCHIVE_DIR", "snapshots")
+
+# Tipos de issue (parâmetro `type` do backend -> grupo no payload) e severidades
+ISSUE_TYPES = {'BUG': 'bugs', 'VULNERABILITY': 'vulnerabilities', 'CODE_SMELL': 'codeSmells'}
+ISSUE_SEVERITIES = ['BLOCKER', 'CRITICAL', 'MAJOR', 'MINOR']
+ISSUE_COLUMNS = ['severity', 'component', 'message', 'line', 'effort']
+
+# Listas grandes lidas em streaming direto para colunas (ingest.py): só estes campos são mantidos
+ISSUE_FIELDS = {'severity': TEXT, 'component': TEXT, 'message': TEXT, 'line': NUMBER, 'effort': TEXT}
+# 'byFile' repete as issues agrupadas por arquivo e não é usado pelas páginas
+ISSUES_STREAM = {**{f'issues.{group}': ISSUE_FIELDS for group in ISSUE_TYPES.values()}, 'issues.byFile': None}
+# Com chave e tipo, para casar as issues de dois pontos no tempo (diff.py)
+DIFF_ISSUE_FIELDS = {**ISSUE_FIELDS, 'key': TEXT, 'type': TEXT}
+DIFF_ISSUES_STREAM = {**{f'issues.{group}': DIFF_ISSUE_FIELDS for group in ISSUE_TYPES.values()}, 'issues.byFile': None}
+# Maior página de issues aceita pelo backend
+ISSUE_PAGE_MAX = 500
+COMPLEXITY_STREAM = {'components': {
+    'path': TEXT, 'name': TEXT, 'complexity': NUMBER, 'cognitiveComplexity': NUMBER, 'linesOfCode': NUMBER, 'issues': NUMBER,
+}}
+COVERAGE_STREAM = {'components': {
+    'path': TEXT, 'name': TEXT, 'coverage': NUMBER, 'uncoveredLines': NUMBER, 'linesToCover': NUMBER,
+}}
+
+def _report_backend_error(e):
+    st.error(f"Erro ao conectar com o backend: {e}")
+
+@swr_cache('projects', on_error=_report_backend_error)
 def get_projects():
     """Busca os projetos disponíveis na API."""
-    try:
-        response = requests.get(f"{API_URL}/projects")
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Erro ao conectar com o backend: {e}")
-        return None
+    return api_get("/projects")
 
-@st.cache_data(ttl=300)
+@swr_cache('latest_metrics')
 def get_latest_metrics(project_id):
     """Busca as métricas mais recentes de um projeto."""
     if not project_id:
         return None
-    try:
-        response = requests.get(f"{API_URL}/metrics/latest", params={'project': project_id})
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return None # Retorna None para que a UI possa lidar com isso
-
-@st.cache_data(ttl=300)
+    return api_get("/metrics/latest", params={'project': project_id})
+
+@swr_cache('metrics_history', default=[])
 def get_metrics_history(project_id, hours=168): # 7 dias
     """Busca o histórico de métricas de um projeto."""
     if not project_id:
         return []
-    try:
-        response = requests.get(f"{API_URL}/metrics/history", params={'project': project_id, 'hours': hours})
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return []
+    return api_get("/metrics/history", params={'project': project_id, 'hours': hours})
 
-@st.cache_data(ttl=300)
+@swr_cache('dora_metrics')
 def get_dora_metrics(project_id, days=30):
     """Busca as métricas DORA de um projeto."""
     if not project_id:
         return None
-    try:
-        response = requests.get(f"{API_URL}/dora/metrics", params={'project': project_id, 'days': days})
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
+    return api_get("/dora/metrics", params={'project': project_id, 'days': days})
+
+@swr_cache('dora_deployments')
+def get_dora_deployments(project_id, days=365):
+    """Busca os deployments brutos de um projeto (base das métricas DORA calculadas em dora.py)."""
+    if not project_id:
         return None
+    return api_get("/dora/deployments", params={'project': project_id, 'days': days})
 
 def format_rating(rating):
     """Formata o rating para exibição (A, B, C, D, E)."""
-    rating_map = {1.0: 'A', 2.0: 'B', 3.0: 'C', 4.0: 'D', 5.0: 'E'}
-    try:
-        rating_float = float(rating)
-        return rating_map.get(rating_float, rating)
-    except (ValueError, TypeError):
-        return rating
+    return ratings.rating_letter(rating)
 
 def get_rating_color(rating):
     """Retorna uma cor baseada no rating."""
-    rating_map = {'A': 'green', 'B': 'orange', 'C': 'orange', 'D': 'red', 'E': 'red'}
-    return rating_map.get(format_rating(rating), 'grey')
+    return ratings.rating_color(rating)
 
 def display_sidebar():
     """Exibe a sidebar com seleção de projeto e navegação."""
@@ -103,6 +115,12 @@ def display_sidebar():
 
         project_id = selected_project_id
         st.sidebar.info(f"Analisando: **{project_names[project_id]}**")
+        snapshot = get_snapshot()
+        if snapshot:
+            st.sidebar.warning(f"📦 Snapshot offline de {snapshot.now():%d/%m/%Y %H:%M} (UTC)")
+        outage = backend_outage()
+        if outage:
+            st.sidebar.warning(f"🔌 {outage} Exibindo os dados em cache.")
     else:
         st.sidebar.error("Backend não disponível ou sem projetos.")
 
@@ -111,6 +129,8 @@ def display_sidebar():
     st.sidebar.page_link("app.py", label="Visão Geral", icon="🏠")
     st.sidebar.page_link("pages/managerView.py", label="Visão Gerencial", icon="👨‍💼")
     st.sidebar.page_link("pages/developerView.py", label="Visão do Desenvolvedor", icon="👩‍💻")
+    st.sidebar.page_link("pages/portfolioView.py", label="Visão de Portfólio", icon="🗂️")
+    st.sidebar.page_link("pages/compareView.py", label="Comparação", icon="🔀")
     
     st.sidebar.markdown("---")
     st.sidebar.markdown(
@@ -123,8 +143,22 @@ def display_sidebar():
     )
     return project_id
 
+def backend_outage():
+    """Mensagem sobre o backend fora do ar (circuit breaker aberto), ou None."""
+    import time
+
+    status = backend_status()
+    if status['circuit'] == 'closed':
+        return None
+    seconds = max(0, int((status['retryAt'] or time.time()) - time.time()))
+    return f"Backend indisponível após {status['failures']} falhas seguidas; nova tentativa em {seconds}s."
+
 def render_no_data():
     """Renderiza uma mensagem de 'sem dados'."""
+    outage = backend_outage()
+    if outage:
+        st.warning(f"{outage} Não há dados em cache para esta visualização.", icon="🔌")
+        return
     st.warning("Não foi possível carregar os dados do projeto. Verifique se o backend está rodando e se há dados disponíveis.", icon="⚠️")
 
 def minutes_to_days(minutes):
@@ -139,22 +173,11 @@ def minutes_to_days(minutes):
 
 def format_coverage(coverage_value):
     """Formata valores de cobertura para exibição."""
-    if coverage_value == '*' or coverage_value is None:
-        return '*'
-    try:
-        return f"{float(coverage_value):.1f}%"
-    except (ValueError, TypeError):
-        return '*'
+    return ratings.coverage_text(coverage_value)
 
 def is_numeric_value(value):
     """Verifica se um valor é numérico (não é '*' ou None)."""
-    if value == '*' or value is None:
-        return False
-    try:
-        float(value)
-        return True
-    except (ValueError, TypeError):
-        return False
+    return ratings.is_numeric(value)
 
 def format_lead_time(minutes):
     """Formata lead time em formato legível."""
@@ -172,86 +195,367 @@ def format_lead_time(minutes):
     else:
         days = minutes / 1440
         return f"{days:.1f}d"
-@st.cache_data(ttl=300)
+@swr_cache('new_code_issues')
 def get_new_code_issues(project_id):
     """Busca issues (bugs, vulnerabilities, code smells) em código novo."""
     if not project_id:
         return None
-    try:
-        response = requests.get(
-            f"{API_URL}/sonarcloud/new-code-issues",
-            params={'project': project_id}
-        )
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
+    return api_get("/sonarcloud/new-code-issues", params={'project': project_id}, stream=ISSUES_STREAM)
+
+def _issue_filters(params, severities, files):
+    """Acrescenta aos parâmetros da requisição os filtros de severidade e de arquivos."""
+    if severities:
+        params['severity'] = ','.join(severities)
+    if files:
+        params['files'] = ','.join(files)
+    return params
+
+def _filter_issue_rows(rows, severities, files):
+    """Filtros aplicados localmente quando o backend não pagina (devolve a lista completa)."""
+    if severities:
+        rows = rows.take(rows.isin('severity', severities))
+    if files:
+        rows = rows.take(rows.isin('component', files))
+    return rows
+
+@swr_cache('new_code_issues')
+def get_new_code_issue_counts(project_id, severities=None, files=None):
+    """Quantidade de issues em código novo por tipo, sem baixar as listas.
+
+    `severities` é uma tupla de severidades e `files` uma tupla de caminhos de
+    arquivos (None = todos).
+    """
+    if not project_id:
+        return None
+    params = _issue_filters({'project': project_id, 'page': 1, 'pageSize': 1}, severities, files)
+    payload = api_get("/sonarcloud/new-code-issues", params=params, stream=ISSUES_STREAM)
+
+    by_type = (payload.get('facets') or {}).get('types')
+    if by_type is not None:
+        return {issue_type: by_type.get(issue_type, 0) for issue_type in ISSUE_TYPES}
+
+    # Backend sem paginação: conta a lista completa
+    groups = payload.get('issues') or {}
+    counts = {}
+    for issue_type, group in ISSUE_TYPES.items():
+        rows = groups.get(group) or Columns(ISSUE_FIELDS).finish()
+        counts[issue_type] = len(_filter_issue_rows(rows, severities, files))
+    return counts
+
+@swr_cache('new_code_issues')
+def get_new_code_issues_page(project_id, issue_type, page=1, page_size=100, severities=None, files=None):
+    """Busca uma página de issues em código novo de um tipo (BUG, VULNERABILITY, CODE_SMELL).
+
+    Retorna {'issues': Columns, 'total': n, 'page': p, 'pageSize': s}, onde `total`
+    conta todas as issues que atendem aos filtros (`severities` e `files`, como
+    em get_new_code_issue_counts). Se o backend não paginar, os filtros e o
+    recorte da página são feitos localmente.
+    """
+    if not project_id:
         return None
+    params = _issue_filters(
+        {'project': project_id, 'type': issue_type, 'page': page, 'pageSize': page_size}, severities, files
+    )
+    payload = api_get("/sonarcloud/new-code-issues", params=params, stream=ISSUES_STREAM)
+
+    rows = (payload.get('issues') or {}).get(ISSUE_TYPES[issue_type]) or Columns(ISSUE_FIELDS).finish()
+    if 'paging' in payload:
+        total = payload['paging'].get('total', len(rows))
+    else:
+        rows = _filter_issue_rows(rows, severities, files)
+        total = len(rows)
+        rows = rows.take(slice((page - 1) * page_size, page * page_size))
+    return {'issues': rows, 'total': total, 'page': page, 'pageSize': page_size}
+
+def collect_issue_pages(request):
+    """Todas as issues de código novo (Columns com DIFF_ISSUE_FIELDS), percorrendo as páginas.
+
+    `request(params)` retorna o payload de uma página já com as listas em
+    colunas; backends sem paginação respondem tudo na primeira.
+    """
+    parts, page = [], 1
+    while True:
+        payload = request({'page': page, 'pageSize': ISSUE_PAGE_MAX}) or {}
+        groups = payload.get('issues') or {}
+        parts.extend(groups.get(group) for group in ISSUE_TYPES.values())
+        paging = payload.get('paging')
+        if not paging or page * paging.get('pageSize', ISSUE_PAGE_MAX) >= paging.get('total', 0):
+            return Columns.concat(parts, DIFF_ISSUE_FIELDS)
+        page += 1
+
+@swr_cache('all_new_code_issues')
+def get_all_new_code_issues(project_id):
+    """Todas as issues de código novo do projeto em colunas, com chave e tipo (base da comparação)."""
+    if not project_id:
+        return None
+    return collect_issue_pages(lambda params: api_get(
+        "/sonarcloud/new-code-issues", params={'project': project_id, **params}, stream=DIFF_ISSUES_STREAM
+    ))
+
+def effort_to_minutes(efforts):
+    """Converte esforços do SonarCloud ('5min', '1h 30min', '2d') em minutos (dia = 8 h)."""
+    import pandas as pd
+
+    parts = pd.Series(efforts, dtype=object).astype('string').str.extract(r'(?:(\d+)d)?\s*(?:(\d+)h)?\s*(?:(\d+)min)?')
+    parts = parts.apply(pd.to_numeric).fillna(0)
+    minutes = parts[0] * 8 * 60 + parts[1] * 60 + parts[2]
+    return minutes.where(pd.Series(efforts, dtype=object).notna().to_numpy())
+
+def issues_to_frame(issues):
+    """Monta o DataFrame exibido na tabela de issues (apenas as colunas usadas).
 
-@st.cache_data(ttl=300)
+    Arquivo vira categoria, linha e esforço (em minutos) inteiros de 32 bits.
+    """
+    import pandas as pd
+    from memory import compact_frame
+
+    if isinstance(issues, Columns):
+        df = issues.to_frame(ISSUE_COLUMNS)
+    else:
+        df = pd.DataFrame.from_records(issues, columns=ISSUE_COLUMNS)
+    df['severity'] = pd.Categorical(df['severity'], categories=ISSUE_SEVERITIES, ordered=True)
+    df['effort'] = effort_to_minutes(df['effort'])
+    return compact_frame(df, categories=['component'], integers=['line', 'effort'])
+
+@swr_cache('complexity')
 def get_complexity_data(project_id):
     """Busca complexidade por componente (arquivo)."""
     if not project_id:
         return None
-    try:
-        response = requests.get(
-            f"{API_URL}/sonarcloud/complexity",
-            params={'project': project_id}
-        )
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return None
+    return api_get("/sonarcloud/complexity", params={'project': project_id}, stream=COMPLEXITY_STREAM)
 
-@st.cache_data(ttl=300)
+@swr_cache('coverage')
 def get_coverage_by_file(project_id):
     """Busca cobertura de testes por arquivo."""
     if not project_id:
         return None
-    try:
-        response = requests.get(
-            f"{API_URL}/sonarcloud/coverage-by-file",
-            params={'project': project_id}
-        )
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
+    return api_get("/sonarcloud/coverage-by-file", params={'project': project_id}, stream=COVERAGE_STREAM)
+
+def get_history_frame(project_id, hours=168, rolling_hours=None):
+    """Retorna o histórico de métricas como DataFrame, buscando apenas snapshots novos.
+
+    Com `rolling_hours`, inclui as médias móveis ('<campo>Rolling') das métricas analisadas.
+    """
+    import pandas as pd
+    from history import get_history_store
+
+    if not project_id:
+        return pd.DataFrame()
+    store = get_history_store(project_id)
+    store.refresh(hours)
+    return store.to_frame(hours, rolling_hours)
+
+def get_score_history(project_id, hours=720):
+    """Retorna os scores de qualidade por snapshot das últimas `hours` como DataFrame.
+
+    Os scores são materializados quando o histórico é ingerido
+    (history.SCORE_FIELDS); aqui só há o recorte da janela.
+    """
+    import pandas as pd
+    from history import get_history_store
+
+    if not project_id:
+        return pd.DataFrame()
+    store = get_history_store(project_id)
+    store.refresh(hours)
+    return store.score_frame(hours)
+
+def get_scores_at(project_id, moment):
+    """Scores do último snapshot até `moment` no histórico já carregado: (timestamp, {campo: score}) ou None."""
+    from history import get_history_store
+
+    if not project_id:
         return None
+    return get_history_store(project_id).scores_at(moment)
+
+def get_trends(project_id, hours=168):
+    """Retorna (resumo por métrica, eventos por métrica) das tendências das últimas `hours`."""
+    from history import get_history_store
+
+    if not project_id:
+        return [], {}
+    store = get_history_store(project_id)
+    store.refresh(hours)
+    return store.trends(hours)
+
+def prepare_debt_trend(df_history, trend_events, max_points=500):
+    """(df_trend, df_events) do gráfico de tendência da dívida técnica.
+
+    O histórico é reduzido a `max_points` (LTTB) com a média móvel em
+    'rollingMean'; os eventos de `get_trends` viram pontos em horas.
+    """
+    import pandas as pd
+    from history import downsample
+
+    df_trend = downsample(df_history, 'technicalDebtHours', target=max_points)
+    df_trend = df_trend[['timestamp', 'technicalDebtHours', 'technicalDebtHoursRolling']].rename(
+        columns={'technicalDebtHoursRolling': 'rollingMean'}
+    )
+    events = trend_events.get('technicalDebtMinutes', [])
+    df_events = pd.DataFrame({
+        'timestamp': pd.to_datetime([ts for ts, _, _ in events], unit='ns', utc=True),
+        'technicalDebtHours': [value / 60 for _, _, value in events],
+        'kind': [kind for _, kind, _ in events],
+    })
+    return df_trend, df_events
+
+def prepare_worst_coverage(worst):
+    """DataFrame dos arquivos com pior cobertura, com as linhas cobertas (linesToCover - uncoveredLines)."""
+    import pandas as pd
+
+    df_coverage = pd.DataFrame(worst)
+    df_coverage['coveredLines'] = df_coverage['linesToCover'] - df_coverage['uncoveredLines']
+    return df_coverage
+
+def _archive_point_data(path, project_id):
+    """PointData de um snapshot exportado, lido pelas mesmas rotas e conversões dos fetchers."""
+    from diff import point_data
+    from ingest import columnar
+    from snapshots import load_snapshot
+
+    backend = load_snapshot(path)
+
+    def request(route, params=None, stream=None):
+        status, payload = backend.handle(route, {'project': project_id, **(params or {})})
+        if status >= 400:
+            return None
+        return columnar(payload, stream) if stream else payload
+
+    return point_data(
+        request("/metrics/latest"),
+        request("/sonarcloud/complexity", stream=COMPLEXITY_STREAM),
+        request("/sonarcloud/coverage-by-file", stream=COVERAGE_STREAM),
+        collect_issue_pages(lambda params: request("/sonarcloud/new-code-issues", params, DIFF_ISSUES_STREAM)),
+    )
+
+def get_comparison_points(project_id):
+    """Pontos com dados por arquivo para a comparação: o estado atual e os snapshots exportados do projeto.
+
+    Os snapshots vêm dos subdiretórios de SNAPSHOT_ARCHIVE_DIR, do mais recente
+    ao mais antigo. Os dados de cada ponto só são carregados se o diff não
+    estiver em cache (diff.compare).
+    """
+    from datetime import datetime
+    from diff import Point, point_data
+    from snapshots import list_snapshots
+
+    if not project_id:
+        return []
+    points = []
+    latest = get_latest_metrics(project_id)
+    if latest and latest.get('timestamp'):
+        timestamp = datetime.fromisoformat(latest['timestamp'].replace('Z', '+00:00'))
+        points.append(Point(
+            'live', ('live', latest['timestamp']), "Atual (backend)", timestamp,
+            lambda: point_data(
+                get_latest_metrics(project_id), get_complexity_data(project_id),
+                get_coverage_by_file(project_id), get_all_new_code_issues(project_id),
+            ),
+        ))
+    for snapshot in list_snapshots(SNAPSHOT_ARCHIVE_DIR):
+        if project_id in snapshot['projects']:
+            points.append(Point(
+                'archive', ('archive', snapshot['path'], snapshot['createdAt'].isoformat()),
+                f"Snapshot {snapshot['name']} ({snapshot['createdAt']:%d/%m/%Y %H:%M})", snapshot['createdAt'],
+                functools.partial(_archive_point_data, snapshot['path'], project_id),
+            ))
+    return points
+
+def get_history_point(project_id, moment):
+    """Ponto do histórico já carregado (só métricas agregadas): o último snapshot até `moment`, ou None."""
+    from diff import Point, PointData
+    from history import get_history_store
+
+    if not project_id:
+        return None
+    row = get_history_store(project_id).row_at(moment)
+    if row is None:
+        return None
+    timestamp, values = row
+    return Point(
+        'history', ('history', timestamp.isoformat()), f"Histórico ({timestamp:%d/%m/%Y %H:%M} UTC)", timestamp,
+        lambda: PointData(values),
+    )
+
+# Conjuntos de dados que uma página pode pedir ao prefetch
+DATASETS = {
+    'latest_metrics': get_latest_metrics,
+    'metrics_history': get_metrics_history,
+    'history_frame': get_history_frame,
+    'trends': get_trends,
+    'dora_metrics': get_dora_metrics,
+    'dora_deployments': get_dora_deployments,
+    'new_code_issues': get_new_code_issues,
+    'new_code_issue_counts': get_new_code_issue_counts,
+    'new_code_issues_page': get_new_code_issues_page,
+    'all_new_code_issues': get_all_new_code_issues,
+    'complexity': get_complexity_data,
+    'coverage': get_coverage_by_file,
+}
+
+def _run_parallel(tasks, max_workers):
+    """Executa as funções de `tasks` (chave -> callable) em um pool limitado de threads.
+
+    Falhas viram None no resultado, sem interromper as demais tarefas.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def run(task):
+        # Propaga o contexto do Streamlit para a thread (necessário para st.error/cache)
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return task()
+
+    results = {}
+    workers = max(1, min(max_workers, len(tasks)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch") as executor:
+        futures = {key: executor.submit(run, task) for key, task in tasks.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception:
+                results[key] = None
+    return results
+
+def prefetch(project_id, datasets, params=None):
+    """Busca em paralelo os conjuntos de dados de uma página.
+
+    `datasets` é uma lista de nomes de DATASETS e `params` um dicionário opcional
+    nome -> kwargs extras. Cada busca passa pelo fetcher cacheado correspondente,
+    então o cache é populado normalmente. Falhas viram None no resultado, sem
+    interromper as demais buscas.
+    """
+    params = params or {}
+    tasks = {
+        name: functools.partial(DATASETS[name], project_id, **params.get(name, {}))
+        for name in datasets
+    }
+    return _run_parallel(tasks, PREFETCH_WORKERS)
+
+def prefetch_many(project_ids, datasets, params=None, max_workers=None):
+    """Como `prefetch`, mas para vários projetos com um único pool limitado.
+
+    Retorna {project_id: {dataset: resultado}}.
+    """
+    params = params or {}
+    tasks = {
+        (project_id, name): functools.partial(DATASETS[name], project_id, **params.get(name, {}))
+        for project_id in project_ids
+        for name in datasets
+    }
+    flat = _run_parallel(tasks, max_workers or PREFETCH_WORKERS)
+    results = {project_id: {} for project_id in project_ids}
+    for (project_id, name), value in flat.items():
+        results[project_id][name] = value
+    return results
 
 def rating_to_score(rating):
     """Converte rating (A-E ou 1-5) para escala 0-100."""
-    # Mapear rating para score (A=100, B=75, C=50, D=25, E=0)
-    rating_map = {
-        'A': 100, 'B': 75, 'C': 50, 'D': 25, 'E': 0,
-        '1': 100, '1.0': 100,
-        '2': 75, '2.0': 75,
-        '3': 50, '3.0': 50,
-        '4': 25, '4.0': 25,
-        '5': 0, '5.0': 0
-    }
+    # A=100, B=75, C=50, D=25, E=0; valor neutro (50) se não houver dados
+    return ratings.rating_score(rating)
 
-    if rating is None or rating == '*':
-        return 50  # Valor neutro se não houver dados
-
-    # Converter para string para buscar no mapa
-    rating_str = str(rating)
-
-    # Tentar converter rating numérico para letra
-    try:
-        rating_float = float(rating)
-        if rating_float == 1.0:
-            return 100
-        elif rating_float == 2.0:
-            return 75
-        elif rating_float == 3.0:
-            return 50
-        elif rating_float == 4.0:
-            return 25
-        elif rating_float == 5.0:
-            return 0
-    except (ValueError, TypeError):
-        pass
-
-    return rating_map.get(rating_str, 50)
+# Rótulos das dimensões do radar, na ordem de ratings.QUALITY_DIMENSIONS
+RADAR_DIMENSIONS = ['Confiabilidade', 'Segurança', 'Manutenibilidade', 'Cobertura de Testes', 'Qualidade do Código']
 
 def prepare_radar_data(metrics_data):
     """Prepara dados para o gráfico de radar com 5 dimensões."""
@@ -272,24 +576,19 @@ def prepare_radar_data(metrics_data):
 
     # 4. Test Coverage (já está em porcentagem)
     coverage_value = metrics_data.get('coverage', {}).get('overall', '*')
-    if is_numeric_value(coverage_value):
-        coverage_score = float(coverage_value)
-    else:
-        coverage_score = 0
+    coverage_score = ratings.coverage_score(coverage_value)
 
     # 5. Code Quality (inverso da complexidade normalizada)
     # Vamos usar densidade de duplicação invertida como proxy de qualidade
     duplication = metrics_data.get('duplication', {}).get('density', 0)
-    if is_numeric_value(duplication):
-        duplication_value = float(duplication)
-        # Inverter: 0% duplicação = 100 score, 100% duplicação = 0 score
-        code_quality_score = max(0, 100 - duplication_value)
-    else:
-        code_quality_score = 50
+    # Inverter: 0% duplicação = 100 score, 100% duplicação = 0 score
+    code_quality_score = ratings.duplication_score(duplication)
 
+    scores = [reliability_score, security_score, maintainability_score, coverage_score, code_quality_score]
     return {
-        'dimensions': ['Confiabilidade', 'Segurança', 'Manutenibilidade', 'Cobertura de Testes', 'Qualidade do Código'],
-        'scores': [reliability_score, security_score, maintainability_score, coverage_score, code_quality_score],
+        'dimensions': RADAR_DIMENSIONS,
+        'scores': scores,
+        'index': ratings.quality_index(dict(zip(ratings.QUALITY_DIMENSIONS, scores))),
         'ratings': {
             'reliability': format_rating(reliability_rating),
             'security': format_rating(security_rating),